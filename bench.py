@@ -0,0 +1,421 @@
+'''Micro-benchmarks for the Seeking Alpha MCP server against a local stub of the RapidAPI endpoints.
+
+Usage: python bench.py [NAME ...] [-n REQUESTS]
+'''
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import multiprocessing
+import socket
+import statistics
+import time
+
+STUB_BODY = json.dumps({'data': [{'id': str(i), 'type': 'symbol', 'attributes': {'name': 'AAPL', 'close': 180.0 + i}} for i in range(20)]}).encode()
+
+
+async def _serve_stub(reader, writer, delay):
+    response = (b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                b'Content-Length: ' + str(len(STUB_BODY)).encode() + b'\r\n\r\n' + STUB_BODY)
+    try:
+        while await reader.readuntil(b'\r\n\r\n'):
+            if delay:
+                await asyncio.sleep(delay)
+            writer.write(response)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def _run_stub(port, delay):
+    async def main():
+        server = await asyncio.start_server(lambda r, w: _serve_stub(r, w, delay), '127.0.0.1', port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+    asyncio.run(main())
+
+
+def start_stub_server(delay=0.0):
+    '''Start a keep-alive JSON stub in a separate process; returns (process, url).'''
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    process = multiprocessing.Process(target=_run_stub, args=(port, delay), daemon=True)
+    process.start()
+    for _ in range(100):
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return process, f'http://127.0.0.1:{port}/symbols/get-summary'
+
+
+def report(label, latencies, elapsed):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f'{label:<28} {len(latencies) / elapsed:>9.0f} req/s   p50 {p50:6.2f} ms   p99 {p99:6.2f} ms')
+
+
+def timed(fn, n):
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - started
+
+
+async def timed_concurrently(fn, n, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            t0 = time.perf_counter()
+            await fn()
+            latencies.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    return latencies, time.perf_counter() - started
+
+
+def _transport_only(server):
+    '''Turn off the client-side rate limiter and micro-batching so a bench measures the HTTP path alone.'''
+    server.batcher.window = 0
+    for key in server.key_pool.keys:
+        key.limiter.max_rate = key.limiter.rate = 0
+
+
+def bench_transport(n):
+    '''Fresh connection per call (the old requests.get path) vs the shared keep-alive pool.'''
+    import requests
+    import server
+    _transport_only(server)
+    stub, url = start_stub_server()
+    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': 'bench'}
+    # A distinct symbol per call keeps the response cache and single-flight out of the measurement.
+    symbols = itertools.count()
+
+    async def pooled():
+        return await server._get(url, {'symbols': f'sym{next(symbols)}'}, fresh=True)
+
+    async def run_pooled():
+        server._session = None
+        try:
+            return await timed_concurrently(pooled, n, 1)
+        finally:
+            await server._get_session().close()
+
+    report('requests.get per call', *timed(lambda: requests.get(url, headers=headers, params={'symbols': f'sym{next(symbols)}'}).json(), n))
+    report('shared pooled session', *asyncio.run(run_pooled()))
+    stub.terminate()
+
+
+def bench_concurrency(n, concurrency=200, delay=0.02):
+    '''Blocking tools pushed to a thread pool vs native async tools, with 20 ms of upstream latency.'''
+    import os
+    import requests
+    from requests.adapters import HTTPAdapter
+    os.environ['SA_MAX_CONNECTIONS'] = str(concurrency)
+    import server
+    _transport_only(server)
+    stub, url = start_stub_server(delay)
+    sync_session = requests.Session()
+    sync_session.mount('http://', HTTPAdapter(pool_maxsize=concurrency))
+    symbols = itertools.count()
+
+    async def blocking_tool():
+        return await asyncio.to_thread(lambda: sync_session.get(url).json())
+
+    async def async_tool():
+        return await server._get(url, {'symbols': f'sym{next(symbols)}'}, fresh=True)
+
+    async def run_async():
+        server._session = None
+        try:
+            return await timed_concurrently(async_tool, n, concurrency)
+        finally:
+            await server._get_session().close()
+
+    report('sync tools via to_thread', *asyncio.run(timed_concurrently(blocking_tool, n, concurrency)))
+    report(f'async tools ({concurrency} in flight)', *asyncio.run(run_async()))
+    stub.terminate()
+
+
+def _ten_year_daily_prices():
+    from datetime import date, timedelta
+    bars, day, price = [], date(2014, 1, 2), 100.0
+    while len(bars) < 2520:
+        if day.weekday() < 5:
+            bars.append({'id': day.isoformat(), 'type': 'historical_price',
+                         'attributes': {'as_of_date': day.isoformat(), 'open': price, 'high': price * 1.01,
+                                        'low': price * 0.99, 'close': price * 1.002, 'volume': 1e6 + len(bars)}})
+            price *= 1.0003
+        day += timedelta(days=1)
+    return json.dumps({'data': bars}).encode()
+
+
+def measure(fn, repeat):
+    '''Best wall time over `repeat` runs, plus peak and retained Python heap of one run.'''
+    import tracemalloc
+    best = min(_wall(fn) for _ in range(repeat))
+    tracemalloc.start()
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, peak, retained
+
+
+def _wall(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def bench_columnar(n):
+    '''Dict output vs columnar arrays for a 10-year daily historical prices response.'''
+    import server
+    body = _ten_year_daily_prices()
+    repeat = max(n // 200, 3)
+    for label, fn in (('json.loads dicts', lambda: json.loads(body)),
+                      ('columnar arrays', lambda: server.parse_series(json.loads(body))[''])):
+        best, peak, retained = measure(fn, repeat)
+        print(f'{label:<28} {best * 1000:8.2f} ms   peak {peak / 1e6:6.2f} MB   retained {retained / 1e6:6.2f} MB')
+
+
+def _python_indicators(closes, window=20, rsi_period=14):
+    '''Per-symbol pure Python SMA, EMA and RSI, the way agents computed them before.'''
+    result = []
+    for close in closes:
+        sma = [sum(close[i - window + 1:i + 1]) / window if i >= window - 1 else None for i in range(len(close))]
+        alpha, ema = 2 / (window + 1), [close[0]]
+        for value in close[1:]:
+            ema.append(ema[-1] + alpha * (value - ema[-1]))
+        changes = [b - a for a, b in zip(close, close[1:])]
+        gain = sum(max(c, 0) for c in changes[:rsi_period]) / rsi_period
+        loss = sum(max(-c, 0) for c in changes[:rsi_period]) / rsi_period
+        rsi = [None] * rsi_period + [100 - 100 / (1 + gain / loss) if loss else 100.0 if gain else None]
+        for change in changes[rsi_period:]:
+            gain += (max(change, 0) - gain) / rsi_period
+            loss += (max(-change, 0) - loss) / rsi_period
+            rsi.append(100 - 100 / (1 + gain / loss) if loss else 100.0 if gain else None)
+        result.append((sma, ema, rsi))
+    return result
+
+
+def bench_indicators(n, symbols=500, bars=2520):
+    '''Vectorized indicator engine over a 500-symbol, 10-year daily universe.'''
+    import numpy as np
+    import server
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (symbols, bars)), axis=1))
+    closes = close.tolist()
+    for label, fn in (('python sma/ema/rsi', lambda: _python_indicators(closes)),
+                      ('numpy sma/ema/rsi', lambda: server.compute_indicators(close, ('sma', 'ema', 'rsi'))),
+                      ('numpy all indicators', lambda: server.compute_indicators(close))):
+        best = min(_wall(fn) for _ in range(3))
+        print(f'{label:<28} {best * 1000:8.1f} ms   {symbols / best:8.0f} symbols/s')
+
+
+def _python_implied_volatility(price, spot, strike, t, rate, is_call):
+    '''Per-contract scalar bisection, the way agents solved IV before.'''
+    from statistics import NormalDist
+    cdf = NormalDist().cdf
+    lo, hi = 1e-4, 5.0
+    for _ in range(60):
+        sigma = (lo + hi) / 2
+        d1 = (math.log(spot / strike) + (rate + sigma * sigma / 2) * t) / (sigma * math.sqrt(t))
+        d2 = d1 - sigma * math.sqrt(t)
+        value = (spot * cdf(d1) - strike * math.exp(-rate * t) * cdf(d2) if is_call
+                 else strike * math.exp(-rate * t) * cdf(-d2) - spot * cdf(-d1))
+        lo, hi = (lo, sigma) if value > price else (sigma, hi)
+    return sigma
+
+
+def bench_options(n, expirations=12, strikes=200):
+    '''Per-contract scalar IV vs the vectorized solver over a 12-expiration, 200-strike chain.'''
+    import numpy as np
+    import server
+    t = (np.arange(1, expirations + 1) * 30 / 365)[:, None]
+    strike = np.linspace(50, 150, strikes)[None, :]
+    price, *_ = server._black_scholes(100.0, strike, t, 0.04, 0.0, 0.3, True)
+    rows = [(float(p), float(k), float(tt)) for p, k, tt in zip(price.ravel(), np.broadcast_to(strike, price.shape).ravel(), np.broadcast_to(t, price.shape).ravel())]
+    for label, fn in (('python per-contract IV', lambda: [_python_implied_volatility(p, 100.0, k, tt, 0.04, True) for p, k, tt in rows]),
+                      ('numpy IV', lambda: server.implied_volatility(price, 100.0, strike, t, 0.04, 0.0, True)),
+                      ('numpy IV + greeks', lambda: server.option_greeks(100.0, strike, t, 0.04, 0.0, server.implied_volatility(price, 100.0, strike, t, 0.04, 0.0, True), True))):
+        best = min(_wall(fn) for _ in range(3))
+        print(f'{label:<28} {best * 1000:8.1f} ms   {len(rows) / best:10.0f} contracts/s')
+
+
+def bench_screener(n, symbols=5000):
+    '''Local screen over a 5000-symbol table of metrics and grades, once the table is loaded.'''
+    import random
+    import server
+    rng = random.Random(0)
+    universe = [f's{i}' for i in range(symbols)]
+    server.screener_table._grow(universe)
+    for symbol in universe:
+        server.screener_table.put(('metrics', ('quant_rating', 'marketcap', 'dividend_yield')), symbol,
+                                  {'quant_rating': rng.uniform(1, 5), 'marketcap': rng.uniform(1e8, 1e12), 'dividend_yield': rng.uniform(0, 8)})
+        server.screener_table.put(('grades', ('value_category',)), symbol, {'value_category': rng.randint(1, 13)})
+    body = {'filter': {'quant_rating': {'gte': 3.5}, 'marketcap': {'gte': 1e10}, 'dividend_yield': {'gte': 3},
+                       'value_category': {'in': ['A+', 'A', 'A-', 'B+']}}, 'sort': '-quant_rating', 'per_page': 100}
+
+    async def screen():
+        return await server.screen_locally(body, universe)
+
+    async def vocabulary(url, params, fresh=False):
+        return {'data': [{'id': name} for name in ('quant_rating', 'marketcap', 'dividend_yield', 'value_category')]}
+
+    server._get = vocabulary
+    latencies = []
+    for _ in range(n):
+        started = time.perf_counter()
+        result, _ = asyncio.run(screen())
+        latencies.append(time.perf_counter() - started)
+    print(f'local screen, {symbols} symbols   {statistics.median(latencies) * 1000:8.2f} ms median end to end, '
+          f'{result["meta"]["elapsed_ms"]:.2f} ms filter and sort   {result["meta"]["count"]} matches')
+
+
+def _statement_responses(rows=60, periods=10):
+    '''Synthetic get-financials bodies: sections of display rows with formatted cells, newest period first.'''
+    labels = [f'Dec {year}' for year in range(2024 - periods, 2024)]
+    return {statement: [{'title': 'Section', 'rows': [
+        {'name': f'{statement}_{i}', 'value': f'Line {i}',
+         'cells': [{'name': f'Line {i}', 'value': f'Line {i}'}] + [{'name': label, 'value': f'{(i + 1) * (j + 7) * 1000:,}.0'}
+                                                                   for j, label in reversed(list(enumerate(labels)))]}
+        for i in range(rows)]}] for statement in ('income-statement', 'balance-sheet', 'cash-flow-statement')}
+
+
+def bench_statements(n):
+    '''Parsing the three statements on every question vs reusing the cached matrix.'''
+    import server
+    responses = _statement_responses()
+
+    def parse():
+        matrix = server._statement_matrix(responses)
+        matrix.update(symbol='x', period_type='annual', failed=[])
+        return matrix
+
+    matrix = parse()
+    for label, fn in (('parse + report', lambda: server.statement_report(parse(), ratios=['m=income-statement_1/balance-sheet_2'])),
+                      ('cached matrix + report', lambda: server.statement_report(matrix, ratios=['m=income-statement_1/balance-sheet_2']))):
+        latencies, elapsed = timed(fn, n)
+        report(label, latencies, elapsed)
+
+
+def _transcript_body(size=100_000):
+    speakers = ('Operator', 'Tim Cook', 'Luca Maestri', 'Analyst')
+    paragraphs, i = [], 0
+    while sum(map(len, paragraphs)) < size:
+        if i == 120:
+            paragraphs.append('<p><strong>Question-and-Answer Session</strong></p>')
+        paragraphs.append(f'<p><strong>{speakers[i % 4]}</strong></p><p>Gross margin was {40 + i % 7}.{i % 10}% &amp; services '
+                          f'revenue grew {i % 13}% year over year, with <a href="/symbol/AAPL">AAPL</a> buybacks continuing.</p>')
+        i += 1
+    content = ''.join(paragraphs)
+    return json.dumps({'data': {'id': '4341792', 'type': 'transcript', 'attributes': {'title': 'Q4 call', 'content': content}}}).encode()
+
+
+def bench_content(n):
+    '''Raw HTML content vs extracted text slices of a 100 KB transcript.'''
+    import server
+    body = _transcript_body()
+    data = json.loads(body)
+    repeat = max(n // 200, 3)
+    for label, fn in (('html as is', lambda: server._format_content(data, 'html')),
+                      ('text, whole transcript', lambda: server._format_content(data, 'text')),
+                      ('text, prepared remarks', lambda: server._format_content(data, 'text', 'prepared_remarks')),
+                      ('text, q&a', lambda: server._format_content(data, 'text', 'qa')),
+                      ('text, first 4000 chars', lambda: server._format_content(data, 'text', 'all', 0, 4000))):
+        best, peak, retained = measure(fn, repeat)
+        size = len(json.dumps(fn()))
+        print(f'{label:<28} {best * 1000:8.2f} ms   peak {peak / 1e3:8.1f} KB   response {size / 1e3:6.1f} KB')
+
+
+def bench_projection(n, items=500, fields=100):
+    '''Serializing a whole JSON:API response vs projecting it down to a few fields first.'''
+    import server
+    data = {'data': [{'id': str(i), 'type': 'metric', 'attributes': {f'field_{j}': (None if j % 3 == 0 else j * 1.5) for j in range(fields)},
+                      'relationships': {'ticker': {'data': {'id': str(i), 'type': 'ticker'}}}} for i in range(items)],
+            'included': [{'id': str(i), 'type': 'ticker', 'attributes': {'name': f'T{i}', 'company': f'Company {i}'}} for i in range(items)]}
+    for label, fn in (('whole response', lambda: json.dumps(data)),
+                      ('select 3 fields', lambda: json.dumps(server._project(data, 'data.id,data.attributes.field_1,data.attributes.field_2'))),
+                      ('compact nulls', lambda: json.dumps(server._project(data, None, 'nulls'))),
+                      ('compact flat', lambda: json.dumps(server._project(data, None, 'flat')))):
+        best = min(_wall(fn) for _ in range(max(n // 200, 3)))
+        print(f'{label:<28} {best * 1000:8.2f} ms   {len(fn()) / 1e3:8.1f} KB')
+
+
+def _representative_payloads():
+    '''Synthetic stand-ins shaped like an options chain, a financial statement and screener results.'''
+    options = {'data': {'id': '146', 'type': 'option_chain', 'attributes': {'expirations': {
+        f'2025-{month:02d}-17': {str(strike): {side: {'bid': strike * 0.01, 'ask': strike * 0.011, 'last': strike * 0.0105, 'volume': strike,
+                                                      'open_interest': strike * 3, 'implied_volatility': 0.25, 'delta': 0.5, 'gamma': 0.01,
+                                                      'theta': -0.02, 'vega': 0.1, 'updated_at': '2025-01-02T15:59:59Z'}
+                                               for side in ('call', 'put')} for strike in range(100, 300, 2)}
+        for month in range(1, 13)}}}}
+    financials = [{'title': f'Section {s}', 'rows': [{'name': f'line_{s}_{r}', 'value': f'Line item {r}', 'cells': [
+        {'name': f'{year}-12', 'value': f'{(s * r + year) * 1000:,}', 'raw_value': (s * r + year) * 1000.0, 'class': 'number'}
+        for year in range(2010, 2025)]} for r in range(25)]} for s in range(4)]
+    screener = {'data': [{'id': str(i), 'type': 'ticker', 'attributes': {'name': f'T{i}', 'company': f'Company {i}', 'marketcap': i * 1e9,
+                                                                          'quant_rating': 3.5, 'sector': 'Technology', 'slug': f't{i}'},
+                          'relationships': {'sector': {'data': {'id': '1', 'type': 'sector'}}}} for i in range(2000)],
+                'included': [{'id': '1', 'type': 'sector', 'attributes': {'name': 'Technology'}}], 'meta': {'count': 2000}}
+    payloads = {'options chain': options, 'financials': financials, 'screener results': screener}
+    return {name: json.dumps(payload) for name, payload in payloads.items()}
+
+
+def bench_json(n):
+    '''stdlib decode plus FastMCP's re-encode vs the fast decoder with raw passthrough.
+
+    Set SA_BENCH_PAYLOADS to a directory of captured *.json responses to run over those as well.
+    '''
+    import os
+    import pathlib
+    import pydantic_core
+    import server
+    payloads = _representative_payloads()
+    if os.getenv('SA_BENCH_PAYLOADS'):
+        payloads.update({path.stem: path.read_text() for path in sorted(pathlib.Path(os.getenv('SA_BENCH_PAYLOADS')).glob('*.json'))})
+    decoder = 'orjson' if server.orjson else 'msgspec' if server.msgspec else 'json'
+    repeat = max(n // 100, 5)
+    for name, text in payloads.items():
+        print(f'{name} ({len(text) / 1e3:.0f} KB, fast path: {decoder})')
+        for label, fn in (('json.loads', lambda: json.loads(text)),
+                          ('fast decode', lambda: server._decode(text)),
+                          ('json.loads + re-encode', lambda: pydantic_core.to_json(json.loads(text), fallback=str)),
+                          ('fast decode + passthrough', lambda: server._serialize(server._decode(text)))):
+            best = min(_wall(fn) for _ in range(repeat))
+            print(f'  {label:<26} {best * 1000:8.2f} ms')
+
+
+BENCHMARKS = {
+    'transport': bench_transport,
+    'concurrency': bench_concurrency,
+    'columnar': bench_columnar,
+    'indicators': bench_indicators,
+    'options': bench_options,
+    'screener': bench_screener,
+    'statements': bench_statements,
+    'content': bench_content,
+    'projection': bench_projection,
+    'json': bench_json,
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('names', nargs='*', default=list(BENCHMARKS))
+    parser.add_argument('-n', type=int, default=2000)
+    args = parser.parse_args()
+    for name in args.names:
+        print(f'== {name}')
+        BENCHMARKS[name](args.n)
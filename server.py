@@ -1,104 +1,3020 @@
-import requests
-from datetime import datetime
+import aiohttp
+from datetime import date, datetime, timedelta, timezone
 from typing import Union, Literal, List
 from mcp.server import FastMCP
-from pydantic import Field
+from pydantic import AnyUrl, Field
 from typing import Annotated
 from mcp.server.fastmcp import FastMCP
 from fastmcp import FastMCP, Context
+import io
 import os
+import re
+import json
+import time
+import zlib
+import base64
+import math
+import heapq
+import bisect
+import random
+import asyncio
+import sqlite3
+import itertools
+import contextvars
+import threading
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit
+from html.parser import HTMLParser
 from dotenv import load_dotenv
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 load_dotenv()
 rapid_api_key = os.getenv("RAPID_API_KEY")
 
 __rapidapi_url__ = 'https://rapidapi.com/apidojo/api/seeking-alpha'
 
-mcp = FastMCP('seeking-alpha')
+__rapidapi_host__ = 'seeking-alpha.p.rapidapi.com'
+
+# Responses are decoded with orjson or msgspec when either is installed, and
+# with the standard library otherwise.
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(value) -> str:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+elif msgspec is not None:
+    _json_decoder = msgspec.json.Decoder()
+    _json_encoder = msgspec.json.Encoder(enc_hook=str)
+
+    def _json_loads(text):
+        try:
+            return _json_decoder.decode(text)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from None
+
+    def _json_dumps(value) -> str:
+        return _json_encoder.encode(value).decode()
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(value) -> str:
+        return json.dumps(value, separators=(',', ':'), default=str)
+
+_RAW_PASSTHROUGH = os.getenv('SA_RAW_PASSTHROUGH', '1') not in ('0', 'false', 'no')
+
+class RawJSON(dict):
+    '''A decoded JSON object that keeps the text it was decoded from, so it can be sent on without encoding it again.'''
+    __slots__ = ('raw',)
+
+def _decode(text: str):
+    value = _json_loads(text)
+    if _RAW_PASSTHROUGH and isinstance(value, dict):
+        value = RawJSON(value)
+        value.raw = text
+    return value
+
+def _serialize(value) -> str:
+    '''Tool result serializer: untouched upstream responses go out as the text they came in as.'''
+    if isinstance(value, RawJSON):
+        return value.raw
+    return _json_dumps(value)
+
+mcp = FastMCP('seeking-alpha', tool_serializer=_serialize)
+
+# One keep-alive pool shared by every tool. Tools are coroutines, so a single
+# server process can keep up to SA_MAX_CONNECTIONS upstream calls in flight.
+_session: Union[aiohttp.ClientSession, None] = None
+
+def _get_session() -> aiohttp.ClientSession:
+    '''Return the keep-alive session shared by every tool, creating it on the running event loop.'''
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            headers={'x-rapidapi-host': __rapidapi_host__},
+            connector=aiohttp.TCPConnector(limit=int(os.getenv('SA_MAX_CONNECTIONS', '100')),
+                                           limit_per_host=int(os.getenv('SA_MAX_CONNECTIONS_PER_HOST', '0')),
+                                           keepalive_timeout=float(os.getenv('SA_KEEPALIVE_EXPIRY', '30'))),
+            timeout=aiohttp.ClientTimeout(sock_connect=float(os.getenv('SA_CONNECT_TIMEOUT', '5')),
+                                          sock_read=float(os.getenv('SA_READ_TIMEOUT', '30'))),
+        )
+    return _session
+
+def _query_value(value):
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (list, tuple)):
+        return tuple(_query_value(item) for item in value)
+    return str(value)
+
+def _chart_ttl(params: dict) -> int:
+    return 5 if params.get('period', '1D') == '1D' else 3600
+
+# Freshness policy in seconds per endpoint path; a callable receives the
+# normalized query params. Endpoints not listed here are never cached.
+_CACHE_TTLS = {
+    '/v2/auto-complete': 3600,
+    '/auto-complete': 3600,
+    '/authors/get-details': 86400,
+    '/symbols/get-meta-data': 3600,
+    '/symbols/get-profile': 86400,
+    '/symbols/get-summary': 60,
+    '/symbols/get-financials': 21600,
+    '/symbols/get-fundamentals': 21600,
+    '/symbols/get-peers': 86400,
+    '/symbols/get-historical-prices': 3600,
+    '/symbols/get-dividend-history': 86400,
+    '/symbols/get-splits': 86400,
+    '/symbols/v2/get-momentum': 5,
+    '/symbols/get-valuation': 300,
+    '/symbols/get-metrics': 300,
+    '/symbols/get-option-expirations': 3600,
+    '/symbols/v2/get-options': 30,
+    '/symbols/get-metric-grades': 3600,
+    '/symbols/get-sector-metrics': 3600,
+    '/symbols/get-sec-filings': 900,
+    '/symbols/get-chart': _chart_ttl,
+    '/symbols/v2/get-chart': 3600,
+    '/symbols/get-estimates': 3600,
+    '/symbols/get-holdings': 86400,
+    '/symbols/get-estimated-earning-announces': 3600,
+    '/symbols/get-earnings': 3600,
+    '/symbols/get-analyst-price-target': 3600,
+    '/symbols/get-analyst-recommendations': 3600,
+    '/symbols/get-key-data': 60,
+    '/symbols/get-quant-rating-histories': 3600,
+    '/symbols/get-analyst-ratings': 3600,
+    '/symbols/get-factor-grades': 3600,
+    '/symbols/get-top-holdings': 86400,
+    '/symbols/get-momentum': 5,
+    '/symbols/get-ratings': 3600,
+    '/symbols/get-options': 30,
+    '/analysis/v2/list': 300,
+    '/analysis/v2/get-details': 86400,
+    '/analysis/get-details': 86400,
+    '/analysis/list': 300,
+    '/articles/v2/list-trending': 300,
+    '/articles/list-wall-street-breakfast': 300,
+    '/articles/get-details': 86400,
+    '/articles/list': 300,
+    '/articles/list-trending': 300,
+    '/news/v2/list-by-symbol': 60,
+    '/news/get-details': 86400,
+    '/news/list': 60,
+    '/news/list-trending': 60,
+    '/press-releases/get-details': 86400,
+    '/press-releases/list': 300,
+    '/transcripts/get-details': 86400,
+    '/transcripts/list': 3600,
+    '/comments/get-contents': 60,
+    '/comments/get-sub-comments': 60,
+    '/comments/list': 60,
+    '/screeners/list': 86400,
+    '/screener-filters/list': 86400,
+    '/screeners/detail': 86400,
+}
+
+_SYMBOL_PARAMS = ('symbol', 'symbols', 'ticker_ids', 'id', 'Identifier')
+
+class TTLCache:
+    '''Size-bounded LRU mapping whose entries expire after a per-entry TTL.
+
+    Expired entries stay until evicted so they can be served stale while
+    upstream is failing.
+    '''
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def get_stale(self, key):
+        entry = self._entries.get(key)
+        return None if entry is None else entry[1]
+
+    def set(self, key, value, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {'entries': len(self._entries), 'max_entries': self.max_entries,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+response_cache = TTLCache(int(os.getenv('SA_CACHE_MAX_ENTRIES', '2048')))
+
+class DiskCache:
+    '''SQLite-backed response store shared by every server process pointed at the same directory.
+
+    Bodies are stored as zlib-compressed JSON. Entries without an expiry never
+    go stale; expired entries are kept for stale reads, and the least recently
+    used ones are evicted once the total size exceeds max_bytes.
+    '''
+
+    def __init__(self, directory: str, max_bytes: int):
+        os.makedirs(directory, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, 'responses.sqlite3'), timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body BLOB NOT NULL, size INTEGER NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)')
+        # Running total of body sizes, so a write does not have to sum the whole table.
+        self._db.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        self._db.execute("INSERT OR IGNORE INTO meta SELECT 'bytes', COALESCE(SUM(size), 0) FROM responses")
+
+    def _get(self, key: str, stale: bool):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT body, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+            if row is not None and not stale and row[1] is not None and row[1] < now:
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self.hits += 1
+        return _decode(zlib.decompress(row[0]).decode())
+
+    def _set(self, key: str, value, ttl: Union[float, None]):
+        body = zlib.compress((value.raw if isinstance(value, RawJSON) else _json_dumps(value)).encode())
+        now = time.time()
+        with self._lock:
+            # One write transaction, so processes sharing the file keep the total in step.
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                replaced = self._db.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+                self._db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                                 (key, body, len(body), None if ttl is None else now + ttl, now))
+                freed = replaced[0] if replaced else 0
+                excess = self._db.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0] + len(body) - freed - self.max_bytes
+                while excess > 0:
+                    rows = self._db.execute('SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64').fetchall()
+                    if not rows:
+                        break
+                    for old_key, size in rows:
+                        self._db.execute('DELETE FROM responses WHERE key = ?', (old_key,))
+                        freed += size
+                        excess -= size
+                        if excess <= 0:
+                            break
+                self._db.execute("UPDATE meta SET value = value + ? WHERE name = 'bytes'", (len(body) - freed,))
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+
+    async def get(self, key: str, stale: bool = False):
+        return await asyncio.to_thread(self._get, key, stale)
+
+    async def set(self, key: str, value, ttl: Union[float, None]):
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            size = self._db.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses}
+
+disk_cache = DiskCache(os.getenv('SA_DISK_CACHE_DIR'), int(os.getenv('SA_DISK_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))) if os.getenv('SA_DISK_CACHE_DIR') else None
+_DISK_CACHE_MIN_TTL = float(os.getenv('SA_DISK_CACHE_MIN_TTL', '3600'))
+
+# Published documents do not change once they are out.
+_IMMUTABLE_ENDPOINTS = ('/articles/get-details', '/news/get-details', '/transcripts/get-details',
+                        '/press-releases/get-details', '/analysis/get-details', '/analysis/v2/get-details')
+
+# Closed historical price ranges only change when upstream split-adjusts them, so they are kept long but not forever.
+_HISTORY_DISK_TTL = float(os.getenv('SA_HISTORY_DISK_TTL', str(7 * 86400)))
+
+def _is_immutable(url: str, params: dict) -> bool:
+    return _endpoint(url) in _IMMUTABLE_ENDPOINTS
+
+def _is_closed_history(url: str, params: dict) -> bool:
+    '''A historical prices request whose explicit end date is before today.'''
+    end = params.get('end')
+    return _endpoint(url) == '/symbols/get-historical-prices' and bool(end) and end < datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+def _endpoint(url: str) -> str:
+    return urlsplit(url).path
+
+def _normalize_params(params: dict) -> dict:
+    normalized = {}
+    for k, v in params.items():
+        v = _query_value(v)
+        if k in _SYMBOL_PARAMS and isinstance(v, str):
+            v = ','.join(part.strip() for part in v.lower().split(','))
+        normalized[k] = v
+    return normalized
+
+def _cache_key(url: str, params: dict) -> tuple:
+    return (url, tuple(sorted(params.items())))
+
+def _cache_ttl(url: str, params: dict) -> float:
+    ttl = _CACHE_TTLS.get(_endpoint(url), 0)
+    return ttl(params) if callable(ttl) else ttl
+
+class QuotaExhaustedError(RuntimeError):
+    pass
+
+class RateLimiter:
+    '''Token bucket with a priority queue of waiters and a monthly quota governor.
+
+    The refill rate backs off on 429 responses and recovers on successes, and
+    the remaining quota is tracked from RapidAPI's x-ratelimit-requests-*
+    response headers (or counted locally against monthly_quota).
+    '''
+
+    def __init__(self, rate: float, burst: float, monthly_quota: int, reserve: float):
+        self.max_rate = self.rate = rate
+        self.burst = self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.monthly_quota = monthly_quota
+        self.reserve = reserve
+        self.quota_limit = monthly_quota or None
+        self.quota_remaining = None
+        self.quota_reset_at = None
+        self.month = None
+        self.used = 0
+        self.queued = 0
+        self.throttled = 0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._wakeup = None
+
+    def check_quota(self, priority: int):
+        month = datetime.now(timezone.utc).strftime('%Y-%m')
+        if month != self.month:
+            self.month, self.used = month, 0
+        remaining = self.remaining()
+        if remaining is None:
+            return
+        if remaining <= 0:
+            raise QuotaExhaustedError('RapidAPI request quota is exhausted' + (
+                f'; it resets in {int(self.quota_reset_at - time.time())} seconds' if self.quota_reset_at else ''))
+        if priority > 0 and self.quota_limit and remaining <= self.quota_limit * self.reserve:
+            raise QuotaExhaustedError('RapidAPI request quota is down to the reserve kept for interactive calls')
+
+    def remaining(self) -> Union[int, None]:
+        if self.quota_remaining is not None:
+            return self.quota_remaining
+        if self.monthly_quota:
+            return self.monthly_quota - self.used
+        return None
+
+    async def acquire(self, priority: int = 0):
+        self.check_quota(priority)
+        if self.rate > 0 and (self._waiters or not self._take()):
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._seq), future))
+            self.queued += 1
+            self._schedule()
+            await future
+        self.used += 1
+        if self.quota_remaining is not None:
+            self.quota_remaining -= 1
+
+    def _take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if now < self.paused_until or self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def _dispatch(self):
+        self._wakeup = None
+        while self._waiters:
+            if self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._take():
+                break
+            heapq.heappop(self._waiters)[2].set_result(None)
+        self._schedule()
+
+    def _schedule(self):
+        if self._wakeup is not None or not self._waiters:
+            return
+        now = time.monotonic()
+        delay = max(self.paused_until - now, (1 - self.tokens) / self.rate, 0)
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def observe(self, status: int, headers):
+        if 'x-ratelimit-requests-remaining' in headers:
+            try:
+                self.quota_remaining = int(headers['x-ratelimit-requests-remaining'])
+                self.quota_limit = int(headers.get('x-ratelimit-requests-limit', self.quota_limit or 0)) or None
+                self.quota_reset_at = time.time() + int(headers.get('x-ratelimit-requests-reset', 0))
+            except ValueError:
+                pass
+        if self.rate <= 0:
+            return
+        if status == 429:
+            self.throttled += 1
+            try:
+                retry_after = float(headers.get('retry-after', 1))
+            except ValueError:
+                retry_after = 1.0
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            self.rate = max(self.rate / 2, self.max_rate / 16)
+        elif status < 400:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def stats(self) -> dict:
+        return {'rate_limit': self.max_rate, 'current_rate': self.rate, 'queued': len(self._waiters),
+                'total_queued': self.queued, 'throttled': self.throttled, 'used_this_month': self.used,
+                'quota_limit': self.quota_limit, 'quota_remaining': self.remaining(),
+                'quota_resets_in': int(self.quota_reset_at - time.time()) if self.quota_reset_at else None}
+
+class ApiKey:
+    '''One RapidAPI subscription with its own rate limiter, quota and usage counters.'''
+
+    def __init__(self, key: Union[str, None], weight: float = 1.0, monthly_quota: int = 0):
+        self.key = key
+        self.weight = weight
+        self.limiter = RateLimiter(float(os.getenv('SA_RATE_LIMIT', '0')), float(os.getenv('SA_RATE_BURST', '10')),
+                                   monthly_quota, float(os.getenv('SA_QUOTA_RESERVE', '0.05')))
+        self.ejected_until = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = {}
+
+    @property
+    def label(self) -> str:
+        if not self.key:
+            return '(none)'
+        return self.key[:4] + '...' + self.key[-4:] if len(self.key) > 12 else '...'
+
+    @property
+    def headers(self) -> dict:
+        return {'x-rapidapi-key': self.key} if self.key else {}
+
+    def load(self) -> float:
+        return (self.in_flight + len(self.limiter._waiters)) / self.weight
+
+    def remaining(self) -> float:
+        remaining = self.limiter.remaining()
+        return math.inf if remaining is None else remaining / self.weight
+
+    def stats(self) -> dict:
+        return {'key': self.label, 'weight': self.weight, 'requests': self.requests, 'in_flight': self.in_flight,
+                'errors': dict(self.errors), 'ejected_for': max(int(self.ejected_until - time.monotonic()), 0),
+                **self.limiter.stats()}
+
+class KeyPool:
+    '''Spread upstream requests across RapidAPI keys.
+
+    The policy picks the least loaded key ('least_used') or the key with the
+    most weighted quota left ('remaining_quota'). Keys answering 401/403/429
+    are ejected for a while.
+    '''
+
+    def __init__(self, keys: list, policy: str):
+        self.keys = keys
+        self.policy = policy
+
+    def _order(self, key: ApiKey) -> tuple:
+        if self.policy == 'remaining_quota':
+            return (-key.remaining(), key.load())
+        return (key.load(), -key.remaining())
+
+    async def acquire(self, priority: int = 0, exclude: tuple = ()) -> ApiKey:
+        while True:
+            now = time.monotonic()
+            candidates = sorted((k for k in self.keys if k.ejected_until <= now and k not in exclude), key=self._order)
+            if not candidates:
+                await asyncio.sleep(max(min(k.ejected_until for k in self.keys) - now, 0.05))
+                exclude = ()
+                continue
+            error = None
+            for key in candidates:
+                try:
+                    key.limiter.check_quota(priority)
+                except QuotaExhaustedError as exc:
+                    error = exc
+                    continue
+                await key.limiter.acquire(priority)
+                key.requests += 1
+                return key
+            raise error
+
+    def eject(self, key: ApiKey, seconds: float):
+        key.ejected_until = max(key.ejected_until, time.monotonic() + seconds)
+
+    def has_alternative(self, key: ApiKey) -> bool:
+        now = time.monotonic()
+        return any(k is not key and k.ejected_until <= now for k in self.keys)
+
+    def stats(self) -> dict:
+        return {'policy': self.policy, 'keys': [key.stats() for key in self.keys]}
+
+def _parse_api_keys(value: Union[str, None]) -> list:
+    '''Parse RAPID_API_KEYS entries of the form key[:weight[:monthly_quota]], separated by commas.'''
+    keys = []
+    for entry in (value or '').split(','):
+        parts = entry.strip().split(':')
+        if parts[0]:
+            weight = float(parts[1]) if len(parts) > 1 and parts[1] else 1.0
+            quota = int(parts[2]) if len(parts) > 2 and parts[2] else int(os.getenv('SA_MONTHLY_QUOTA', '0'))
+            keys.append(ApiKey(parts[0], weight, quota))
+    return keys or [ApiKey(rapid_api_key, 1.0, int(os.getenv('SA_MONTHLY_QUOTA', '0')))]
+
+key_pool = KeyPool(_parse_api_keys(os.getenv('RAPID_API_KEYS')), os.getenv('SA_KEY_POLICY', 'least_used'))
+_RATE_LIMIT_RETRIES = int(os.getenv('SA_RATE_LIMIT_RETRIES', '3'))
+_KEY_EJECT_SECONDS = float(os.getenv('SA_KEY_EJECT_SECONDS', '600'))
+
+# Lower values are served first when calls queue for the rate limiter.
+# Bulk and background work should set a positive priority.
+request_priority = contextvars.ContextVar('request_priority', default=0)
+
+class UpstreamError(RuntimeError):
+    def __init__(self, message: str, status: Union[int, None] = None):
+        super().__init__(message)
+        self.status = status
+
+class CircuitOpenError(UpstreamError):
+    pass
+
+class CircuitBreaker:
+    '''Per-endpoint breaker that fails fast after repeated upstream failures.
+
+    After `threshold` consecutive failures the endpoint is open for `cooldown`
+    seconds; then a single trial call is let through, and its outcome closes
+    or re-opens the circuit.
+    '''
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = {}
+        self._open_until = {}
+        self._trial = set()
+        self.rejected = 0
+
+    def before(self, endpoint: str) -> bool:
+        '''Raise CircuitOpenError while the endpoint is open; returns True when this call is the trial.'''
+        open_until = self._open_until.get(endpoint)
+        if open_until is None:
+            return False
+        if time.monotonic() < open_until or endpoint in self._trial:
+            self.rejected += 1
+            raise CircuitOpenError(f'Upstream {endpoint} is failing; circuit open for another {max(open_until - time.monotonic(), 0):.0f} seconds')
+        self._trial.add(endpoint)
+        return True
+
+    def is_open(self, endpoint: str) -> bool:
+        return time.monotonic() < self._open_until.get(endpoint, 0)
+
+    def settle(self, endpoint: str):
+        '''End a trial call that neither succeeded nor failed (429, auth and quota errors, cancellation).'''
+        self._trial.discard(endpoint)
+
+    def success(self, endpoint: str):
+        self._failures.pop(endpoint, None)
+        self._open_until.pop(endpoint, None)
+        self._trial.discard(endpoint)
+
+    def failure(self, endpoint: str):
+        self._failures[endpoint] = failures = self._failures.get(endpoint, 0) + 1
+        if failures >= self.threshold or endpoint in self._trial:
+            self._open_until[endpoint] = time.monotonic() + self.cooldown
+            self._trial.discard(endpoint)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {'open': sorted(endpoint for endpoint, until in self._open_until.items() if until > now or endpoint in self._trial),
+                'failing': {endpoint: failures for endpoint, failures in self._failures.items()}, 'rejected': self.rejected}
+
+circuit_breaker = CircuitBreaker(int(os.getenv('SA_BREAKER_THRESHOLD', '5')), float(os.getenv('SA_BREAKER_COOLDOWN', '30')))
+_RETRIES = int(os.getenv('SA_RETRIES', '3'))
+_RETRY_BACKOFF = float(os.getenv('SA_RETRY_BACKOFF', '0.5'))
+_RETRY_MAX_BACKOFF = float(os.getenv('SA_RETRY_MAX_BACKOFF', '10'))
+_RETRY_STATUSES = (500, 502, 503, 504)
+
+def _retry_delay(attempt: int, retry_after: Union[str, None]) -> float:
+    # Full jitter on a capped exponential backoff, but never sooner than Retry-After.
+    delay = random.uniform(0, min(_RETRY_MAX_BACKOFF, _RETRY_BACKOFF * 2 ** attempt))
+    try:
+        return max(delay, min(float(retry_after), _RETRY_MAX_BACKOFF)) if retry_after else delay
+    except ValueError:
+        return delay
+
+async def _request(method: str, url: str, params: Union[dict, None] = None, data: Union[dict, None] = None) -> tuple:
+    '''Send one logical upstream request, retrying transient failures of idempotent GETs.
+
+    Returns (status, decoded JSON) for successes and client errors; raises
+    UpstreamError once retries are exhausted or the body is not JSON.
+    '''
+    endpoint = _endpoint(url)
+    retries = _RETRIES if method == 'GET' else 0
+    throttles = 0
+    attempt = 0
+    rejected_keys = ()
+    # One breaker check per logical request: retries and 429 re-queues are part of the same trial.
+    trial = circuit_breaker.before(endpoint)
+    try:
+        while True:
+            api_key = await key_pool.acquire(request_priority.get(), rejected_keys)
+            retry_after = None
+            api_key.in_flight += 1
+            try:
+                async with _get_session().request(method, url, params=params, json=data, headers=api_key.headers) as response:
+                    api_key.limiter.observe(response.status, response.headers)
+                    status = response.status
+                    retry_after = response.headers.get('retry-after')
+                    body = await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                api_key.errors['network'] = api_key.errors.get('network', 0) + 1
+                # The breaker counts failed requests, not attempts: only giving up is a failure.
+                if attempt >= retries or trial or circuit_breaker.is_open(endpoint):
+                    circuit_breaker.failure(endpoint)
+                    raise UpstreamError(f'Upstream request to {endpoint} failed: {exc!r}') from exc
+            else:
+                if status >= 400:
+                    api_key.errors[str(status)] = api_key.errors.get(str(status), 0) + 1
+                if status in (401, 403) and key_pool.has_alternative(api_key):
+                    key_pool.eject(api_key, _KEY_EJECT_SECONDS)
+                    rejected_keys += (api_key,)
+                    continue
+                if status == 429:
+                    alternative = key_pool.has_alternative(api_key)
+                    if alternative:
+                        key_pool.eject(api_key, max(_retry_delay(0, retry_after), 1.0))
+                    # Otherwise the key's rate limiter pauses for Retry-After before the next token, or,
+                    # with the limiter off, the retry waits it out here.
+                    if throttles < _RATE_LIMIT_RETRIES:
+                        if not alternative and api_key.limiter.rate <= 0:
+                            await asyncio.sleep(_retry_delay(throttles, retry_after))
+                        throttles += 1
+                        continue
+                    raise UpstreamError(f'Upstream {endpoint} is rate limited (HTTP 429)', status)
+                if status in _RETRY_STATUSES:
+                    if attempt >= retries or trial or circuit_breaker.is_open(endpoint):
+                        circuit_breaker.failure(endpoint)
+                        raise UpstreamError(f'Upstream {endpoint} returned HTTP {status}', status)
+                else:
+                    circuit_breaker.success(endpoint)
+                    try:
+                        return status, _decode(body)
+                    except ValueError:
+                        raise UpstreamError(f'Upstream {endpoint} returned HTTP {status} with a non-JSON body: {body[:200]!r}', status) from None
+            finally:
+                api_key.in_flight -= 1
+            await asyncio.sleep(_retry_delay(attempt, retry_after))
+            attempt += 1
+    finally:
+        if trial:
+            circuit_breaker.settle(endpoint)
+
+async def _fetch(url: str, params: dict) -> tuple:
+    # Tuple values are sent as repeated parameters: comment_ids=1&comment_ids=2.
+    return await _request('GET', url, params=[(k, item) for k, v in params.items() for item in (v if isinstance(v, tuple) else (v,))])
+
+class SingleFlight:
+    '''Share one in-flight call among concurrent callers asking for the same key.'''
+
+    def __init__(self):
+        self._calls = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        self.calls += 1
+        future = asyncio.ensure_future(fn())
+        self._calls[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def stats(self) -> dict:
+        return {'in_flight': len(self._calls), 'calls': self.calls, 'coalesced': self.coalesced}
+
+upstream_calls = SingleFlight()
+
+async def _store(url: str, params: dict, key: tuple, ttl: float, status: int, data):
+    if status < 400:
+        await symbol_index.learn(_ticker_pairs(url, params, data))
+        if _endpoint(url) in _DOCUMENT_TYPES:
+            await document_index.add(url, params, data)
+    if ttl and status < 400:
+        response_cache.set(key, data, ttl)
+        if disk_cache is not None:
+            if _is_immutable(url, params):
+                await disk_cache.set(json.dumps(key), data, None)
+            elif _is_closed_history(url, params):
+                await disk_cache.set(json.dumps(key), data, max(ttl, _HISTORY_DISK_TTL))
+            elif ttl >= _DISK_CACHE_MIN_TTL:
+                await disk_cache.set(json.dumps(key), data, ttl)
+
+async def _fetch_and_store(url: str, params: dict, key: tuple, ttl: float):
+    status, data = await _fetch(url, params)
+    await _store(url, params, key, ttl, status, data)
+    return data
+
+# Endpoints that accept a comma separated list, with the list parameter and
+# the most values merged into one upstream request.
+_BATCHED_ENDPOINTS = {
+    '/symbols/get-summary': ('symbols', 20),
+    '/symbols/get-profile': ('symbols', 20),
+    '/symbols/get-valuation': ('symbols', 20),
+    '/symbols/get-metrics': ('symbols', 20),
+    '/symbols/v2/get-momentum': ('symbols', 20),
+    '/symbols/get-peers': ('symbol', 20),
+    '/symbols/get-holdings': ('symbols', 20),
+    '/symbols/get-earnings': ('ticker_ids', 20),
+    '/symbols/get-analyst-price-target': ('ticker_ids', 20),
+    '/symbols/get-analyst-recommendations': ('ticker_ids', 20),
+}
+
+def _split_batch(data, values: list) -> dict:
+    '''Cut a merged multi-symbol response into one response per requested value.
+
+    Handles JSON:API bodies (data items matched by id, name/slug, or a
+    relationship to an included ticker) and bodies keyed by ticker id. Values
+    that cannot be located map to None.
+    '''
+    wanted = {value.lower(): value for value in values}
+    if not isinstance(data, dict):
+        return {}
+    if isinstance(data.get('data'), list):
+        ids = {value: {value} for value in wanted}
+        for item in data.get('included') or []:
+            attributes = item.get('attributes') or {}
+            for name in (attributes.get('name'), attributes.get('slug')):
+                if isinstance(name, str) and name.lower() in ids:
+                    ids[name.lower()].add(str(item.get('id')).lower())
+        slices = {}
+        for value, aliases in ids.items():
+            items = []
+            for item in data['data']:
+                attributes = item.get('attributes') or {}
+                names = {str(item.get('id')).lower(), str(attributes.get('name')).lower(), str(attributes.get('slug')).lower()}
+                for relationship in (item.get('relationships') or {}).values():
+                    related = relationship.get('data') if isinstance(relationship, dict) else None
+                    if isinstance(related, dict):
+                        names.add(str(related.get('id')).lower())
+                if names & aliases:
+                    items.append(item)
+            slices[wanted[value]] = {**data, 'data': items} if items else None
+        return slices
+    keyed = [k for k, v in data.items() if isinstance(v, dict) and v and {str(i).lower() for i in v} <= set(wanted)]
+    if not keyed:
+        return {}
+    return {original: {k: ({value: v[value]} if value in v else {}) if k in keyed else v for k, v in data.items()}
+            for value, original in wanted.items()}
+
+class MicroBatcher:
+    '''Hold single-value calls for a short window and merge them into one upstream request.'''
+
+    def __init__(self, window: float):
+        self.window = window
+        self._pending = {}
+        self.unsplittable = set()
+        self.batches = 0
+        self.batched_calls = 0
+        self.fallbacks = 0
+
+    def accepts(self, url: str, params: dict) -> bool:
+        endpoint = _endpoint(url)
+        if self.window <= 0 or endpoint not in _BATCHED_ENDPOINTS or endpoint in self.unsplittable:
+            return False
+        value = params.get(_BATCHED_ENDPOINTS[endpoint][0])
+        return value is not None and ',' not in value
+
+    async def fetch(self, url: str, params: dict) -> tuple:
+        param, limit = _BATCHED_ENDPOINTS[_endpoint(url)]
+        batch_key = (url, tuple(sorted((k, v) for k, v in params.items() if k != param)))
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.get(batch_key)
+        if batch is None:
+            batch = self._pending[batch_key] = {'entries': [], 'timer': loop.call_later(self.window, self._flush, batch_key)}
+        batch['entries'].append((params[param].strip(), future))
+        if len(batch['entries']) >= limit:
+            batch['timer'].cancel()
+            self._flush(batch_key)
+        status, data = await future
+        if data is _UNSPLIT:
+            self.fallbacks += 1
+            return await _fetch(url, params)
+        return status, data
+
+    def _flush(self, batch_key):
+        batch = self._pending.pop(batch_key, None)
+        if batch is not None:
+            asyncio.ensure_future(self._run(batch_key, batch['entries']))
+
+    async def _run(self, batch_key, entries):
+        url, rest = batch_key
+        param = _BATCHED_ENDPOINTS[_endpoint(url)][0]
+        values = list(dict.fromkeys(value for value, _ in entries))
+        self.batches += 1
+        self.batched_calls += len(entries)
+        try:
+            status, data = await _fetch(url, {**dict(rest), param: ','.join(values)})
+        except Exception as exc:
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        slices = _split_batch(data, values) if status < 400 and len(values) > 1 else {}
+        if len(values) > 1 and status < 400 and not slices:
+            # A shape _split_batch does not know; a body that merely lacks these values is still splittable.
+            self.unsplittable.add(_endpoint(url))
+        for value, future in entries:
+            if future.done():
+                continue
+            if len(values) == 1:
+                future.set_result((status, data))
+            elif status >= 400:
+                # One bad value can fail the merged request; each caller retries alone and gets its own answer.
+                future.set_result((status, _UNSPLIT))
+            else:
+                piece = slices.get(value)
+                future.set_result((status, _UNSPLIT if piece is None else piece))
+
+    def stats(self) -> dict:
+        return {'window_ms': self.window * 1000, 'batches': self.batches, 'batched_calls': self.batched_calls,
+                'fallbacks': self.fallbacks, 'unsplittable': sorted(self.unsplittable)}
+
+_UNSPLIT = object()
+batcher = MicroBatcher(float(os.getenv('SA_BATCH_WINDOW_MS', '5')) / 1000)
+
+async def _batch_fetch_and_store(url: str, params: dict, key: tuple, ttl: float):
+    status, data = await batcher.fetch(url, params)
+    await _store(url, params, key, ttl, status, data)
+    return data
+
+async def _get(url: str, params: dict, fresh: bool = False) -> dict:
+    params = {k: _query_value(v) for k, v in params.items()}
+    key = _cache_key(url, _normalize_params(params))
+    ttl = _cache_ttl(url, params)
+    if ttl and not fresh:
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached
+        if disk_cache is not None:
+            cached = await disk_cache.get(json.dumps(key))
+            if cached is not None:
+                response_cache.set(key, cached, ttl)
+                if _endpoint(url) in _DOCUMENT_TYPES:
+                    # The disk cache can outlive an in-memory search index.
+                    await document_index.add(url, params, cached)
+                return cached
+    try:
+        if batcher.accepts(url, params):
+            return await upstream_calls.do(key, lambda: _batch_fetch_and_store(url, params, key, ttl))
+        return await upstream_calls.do(key, lambda: _fetch_and_store(url, params, key, ttl))
+    except (UpstreamError, QuotaExhaustedError):
+        if ttl and not fresh:
+            stale = response_cache.get_stale(key)
+            if stale is None and disk_cache is not None:
+                stale = await disk_cache.get(json.dumps(key), stale=True)
+            if stale is not None:
+                return stale
+        raise
+
+async def _post(url: str, data: Union[dict, None]) -> dict:
+    status, body = await _request('POST', url, data=data)
+    return body
+
+_PRUNED = object()
+
+def _select_tree(select: str) -> dict:
+    '''Parse comma separated paths (data.attributes.close, data[*].id, $.included[0].attributes.name) into a tree of keys.'''
+    tree = {}
+    for path in select.split(','):
+        path = path.strip()
+        if path.startswith('$'):
+            path = path[1:].lstrip('.')
+        keys = [key for key in re.split(r'\.|\[([^\]]*)\]', path) if key]
+        if not keys:
+            continue
+        node = tree
+        for key in keys[:-1]:
+            child = node.setdefault(key, {})
+            if child is True:
+                break
+            node = child
+        else:
+            node[keys[-1]] = True
+    return tree
+
+def _select(value, tree):
+    if tree is True:
+        return value
+    if isinstance(value, list):
+        if '*' in tree:
+            tree = tree['*']
+        elif tree and all(key.lstrip('-').isdigit() for key in tree):
+            picked = []
+            for key, subtree in tree.items():
+                if -len(value) <= int(key) < len(value):
+                    item = _select(value[int(key)], subtree)
+                    if item is not _PRUNED:
+                        picked.append(item)
+            return picked
+        items = [_select(item, tree) for item in value]
+        return [item for item in items if item is not _PRUNED]
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            subtree = tree.get(key, tree.get('*'))
+            if subtree is not None:
+                item = _select(item, subtree)
+                if item is not _PRUNED:
+                    result[key] = item
+        return result
+    return _PRUNED
+
+def _drop_nulls(value):
+    if isinstance(value, dict):
+        return {k: _drop_nulls(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [_drop_nulls(v) for v in value if v is not None]
+    return value
+
+def _flatten_jsonapi(data: dict) -> dict:
+    '''Lift attributes next to id and type, and replace references to related items by their included entries.'''
+    included = {(item.get('type'), str(item.get('id'))): item for item in data.get('included') or [] if isinstance(item, dict)}
+
+    def flat(item, resolve):
+        if not isinstance(item, dict) or ('attributes' not in item and 'relationships' not in item):
+            return item
+        result = {'id': item.get('id'), 'type': item.get('type'), **(item.get('attributes') or {})}
+        for name, relationship in (item.get('relationships') or {}).items():
+            related = relationship.get('data') if isinstance(relationship, dict) else relationship
+            if resolve and isinstance(related, list):
+                result[name] = [flat(included.get((ref.get('type'), str(ref.get('id'))), ref), False) if isinstance(ref, dict) else ref
+                                for ref in related]
+            elif resolve and isinstance(related, dict):
+                result[name] = flat(included.get((related.get('type'), str(related.get('id'))), related), False)
+            else:
+                result[name] = related
+        return result
+
+    body = data['data']
+    flattened = [flat(item, True) for item in body] if isinstance(body, list) else flat(body, True)
+    return {**{k: v for k, v in data.items() if k not in ('data', 'included')}, 'data': flattened}
+
+def _project(data, select: Union[str, None] = None, compact: str = 'none'):
+    '''Cut a response down to the selected paths and compact it, building new objects so the cached response stays whole.'''
+    if select:
+        data = _select(data, _select_tree(select))
+        if data is _PRUNED:
+            data = {}
+    if compact == 'flat' and isinstance(data, dict) and isinstance(data.get('data'), (dict, list)):
+        data = _flatten_jsonapi(data)
+    if compact != 'none':
+        data = _drop_nulls(data)
+    return data
+
+class SymbolIndex:
+    '''Persistent symbol <-> ticker_id index, learned from upstream responses that carry both.'''
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS tickers (symbol TEXT PRIMARY KEY, ticker_id TEXT NOT NULL, updated_on TEXT NOT NULL)')
+        self._ids = dict(self._db.execute('SELECT symbol, ticker_id FROM tickers').fetchall())
+        self._symbols = {ticker_id: symbol for symbol, ticker_id in self._ids.items()}
+        self.hits = 0
+        self.misses = 0
+
+    def ticker_id(self, symbol: str) -> Union[str, None]:
+        return self._ids.get(symbol.strip().lower())
+
+    def symbol(self, ticker_id) -> Union[str, None]:
+        return self._symbols.get(str(ticker_id))
+
+    def _add(self, pairs: dict):
+        updated_on = date.today().isoformat()
+        with self._lock:
+            self._db.executemany('INSERT OR REPLACE INTO tickers VALUES (?, ?, ?)',
+                                 [(symbol, ticker_id, updated_on) for symbol, ticker_id in pairs.items()])
+
+    async def learn(self, pairs: dict):
+        changed = {symbol: ticker_id for symbol, ticker_id in pairs.items() if self._ids.get(symbol) != ticker_id}
+        if changed:
+            self._ids.update(changed)
+            self._symbols.update({ticker_id: symbol for symbol, ticker_id in changed.items()})
+            await asyncio.to_thread(self._add, changed)
+
+    def stats(self) -> dict:
+        return {'symbols': len(self._ids), 'hits': self.hits, 'misses': self.misses}
+
+def _ticker_pairs(url: str, params: dict, data) -> dict:
+    '''Find symbol -> ticker_id pairs in an upstream response.
+
+    Meta data and option expirations are answered for the requested symbol;
+    anywhere else tickers show up as JSON:API items (often in included) whose
+    id is the ticker_id, or as items carrying a tickerId attribute.
+    '''
+    pairs = {}
+    if not isinstance(data, dict):
+        return pairs
+    symbol = params.get('symbol')
+    body = data.get('data') if isinstance(data.get('data'), dict) else {}
+    if isinstance(symbol, str) and ',' not in symbol:
+        endpoint = _endpoint(url)
+        if endpoint == '/symbols/get-meta-data':
+            ticker_id = body.get('id')
+        elif endpoint == '/symbols/get-option-expirations':
+            ticker_id = data.get('ticker_id', (body.get('attributes') or {}).get('ticker_id'))
+        else:
+            ticker_id = None
+        if str(ticker_id).isdigit():
+            pairs[symbol.strip().lower()] = str(ticker_id)
+    items = data['data'] if isinstance(data.get('data'), list) else [body]
+    for item in itertools.chain(items, data.get('included') or []):
+        if not isinstance(item, dict):
+            continue
+        attributes = item.get('attributes') or {}
+        item_id = str(item.get('id'))
+        ticker_id = attributes.get('tickerId', item.get('tickerId'))
+        if ticker_id is not None and not item_id.isdigit() and str(ticker_id).isdigit():
+            pairs[item_id.lower()] = str(ticker_id)
+        elif (attributes.get('tagKind') == 'Tags::Ticker' or item.get('type') == 'ticker') and item_id.isdigit() \
+                and isinstance(attributes.get('name'), str):
+            pairs[attributes['name'].lower()] = item_id
+    return pairs
+
+if os.getenv('SA_SYMBOL_INDEX_DIR'):
+    os.makedirs(os.getenv('SA_SYMBOL_INDEX_DIR'), exist_ok=True)
+symbol_index = SymbolIndex(os.path.join(os.getenv('SA_SYMBOL_INDEX_DIR'), 'symbols.sqlite3') if os.getenv('SA_SYMBOL_INDEX_DIR') else ':memory:')
+
+async def resolve_ticker_ids(symbols: list) -> dict:
+    '''Map symbols to ticker_ids from symbol_index, looking the unknown ones up with concurrent meta data calls.'''
+    symbols = list(dict.fromkeys(s.strip().lower() for s in symbols if s.strip()))
+    missing = [symbol for symbol in symbols if symbol_index.ticker_id(symbol) is None]
+    symbol_index.hits += len(symbols) - len(missing)
+    symbol_index.misses += len(missing)
+    if missing:
+        url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-meta-data'
+        responses = await asyncio.gather(*(_get(url, {'symbol': symbol}) for symbol in missing))
+        # Cached responses never reach _store, so learn from every answer here as well.
+        for symbol, data in zip(missing, responses):
+            await symbol_index.learn(_ticker_pairs(url, {'symbol': symbol}, data))
+    return {symbol: symbol_index.ticker_id(symbol) for symbol in symbols}
+
+async def _ticker_ids_param(symbols: str) -> str:
+    ticker_ids = await resolve_ticker_ids(symbols.split(','))
+    unknown = [symbol for symbol, ticker_id in ticker_ids.items() if ticker_id is None]
+    if unknown:
+        raise ValueError(f'Unknown symbols: {", ".join(unknown)}')
+    return ','.join(ticker_ids.values())
+
+def _prefix_keys(item: dict) -> tuple:
+    '''Lowercased keys of an auto-complete item: its name and slug first, then each trailing word run of its name, slug and title.'''
+    primary, secondary = set(), set()
+    for field in ('name', 'slug', 'content', 'title'):
+        value = item.get(field)
+        if isinstance(value, str):
+            words = re.sub(r'<[^>]+>', '', value).lower().split()
+            if field in ('name', 'slug'):
+                primary.add(' '.join(words))
+            secondary.update(' '.join(words[i:]) for i in range(len(words)))
+    return primary, secondary - primary
+
+class PrefixIndex:
+    '''Sorted-array prefix index of auto-complete items, per result group (symbols, people, pages).
+
+    Items are learned from upstream responses and expire ttl seconds after
+    they were last seen (seeded items do not); a prefix lookup is a bisect
+    into the sorted (key, item) pairs of each group. Answers keep the shape
+    of the last upstream response.
+    '''
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._keys = {}
+        self._items = {}
+        self._expires = {}
+        self._shape = {}
+        self.hits = 0
+        self.fallbacks = 0
+
+    def add(self, data, seed: bool = False):
+        if not isinstance(data, dict):
+            return
+        if not seed:
+            self._shape = {k: v for k, v in data.items() if not isinstance(v, list)}
+        expires = math.inf if seed else time.monotonic() + self.ttl
+        for group, items in data.items():
+            if not isinstance(items, list):
+                continue
+            tiers = self._keys.setdefault(group, ([], []))
+            stored = self._items.setdefault(group, {})
+            deadlines = self._expires.setdefault(group, {})
+            added = ([], [])
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                item_id = str(item.get('slug') or item.get('name') or item.get('id')).lower()
+                if item_id not in stored:
+                    for tier, keys in zip(added, _prefix_keys(item)):
+                        tier.extend((key, item_id) for key in keys)
+                stored[item_id] = item
+                deadlines[item_id] = max(deadlines.get(item_id, 0.0), expires)
+            for keys, entries in zip(tiers, added):
+                if len(entries) > len(keys) // 8:
+                    keys.extend(entries)
+                    keys.sort()
+                else:
+                    for entry in entries:
+                        bisect.insort(keys, entry)
+
+    def search(self, query: str, groups, size: int) -> Union[dict, None]:
+        '''size items in each group whose keys start with query, or None when any group has fewer and upstream must answer.'''
+        prefix = ' '.join(query.lower().split())
+        if not prefix or not groups:
+            return None
+        now = time.monotonic()
+        result = dict(self._shape)
+        for group in groups:
+            found = {}
+            deadlines = self._expires.get(group, {})
+            # Name and slug matches come before title matches, and within a
+            # tier keys equal to the prefix sort first.
+            for keys in self._keys.get(group, ()):
+                i = bisect.bisect_left(keys, (prefix,))
+                while i < len(keys) and len(found) < size and keys[i][0].startswith(prefix):
+                    if deadlines[keys[i][1]] > now:
+                        found[keys[i][1]] = None
+                    i += 1
+            if len(found) < size:
+                # Upstream may know more matches than this index has seen.
+                self.fallbacks += 1
+                return None
+            result[group] = [self._items[group][item_id] for item_id in found]
+        self.hits += 1
+        return result
+
+    def groups(self) -> list:
+        return list(self._items)
+
+    def stats(self) -> dict:
+        return {'items': {group: len(items) for group, items in self._items.items()}, 'hits': self.hits, 'fallbacks': self.fallbacks}
+
+def _seed_symbols(path: str) -> dict:
+    '''Read a bulk symbol list, one "symbol,company name" line per symbol, as an auto-complete symbols group.'''
+    symbols = []
+    with open(path) as f:
+        for line in f:
+            symbol, _, company = line.strip().partition(',')
+            if symbol:
+                symbols.append({'id': symbol.lower(), 'type': 'symbol', 'name': symbol.upper(), 'slug': symbol.lower(), 'content': company.strip()})
+    return {'symbols': symbols}
+
+_AUTOCOMPLETE_TTL = float(os.getenv('SA_AUTOCOMPLETE_TTL', '86400'))
+v2_auto_complete_index = PrefixIndex(_AUTOCOMPLETE_TTL)
+auto_complete_index = PrefixIndex(_AUTOCOMPLETE_TTL)
+if os.getenv('SA_AUTOCOMPLETE_SYMBOLS'):
+    v2_auto_complete_index.add(_seed_symbols(os.getenv('SA_AUTOCOMPLETE_SYMBOLS')), seed=True)
+
+# Detail endpoints whose documents go into the full-text index, with the
+# document type each one is filed under.
+_DOCUMENT_TYPES = {
+    '/articles/get-details': 'article',
+    '/news/get-details': 'news',
+    '/transcripts/get-details': 'transcript',
+    '/press-releases/get-details': 'press_release',
+    '/analysis/get-details': 'analysis',
+    '/analysis/v2/get-details': 'analysis',
+}
+
+# Left out of 'any' searches, where they would match nearly every document.
+_STOPWORDS = frozenset('''a about after all also an and any are as at be been but by can did do does for from had has have how i
+if in into is it its last more most not of on or our over said say says so than that the their them then there these they this
+to up was we were what when where which who why will with would you'''.split())
+
+_BLOCK_TAGS = frozenset(('p', 'div', 'br', 'li', 'ul', 'ol', 'tr', 'table', 'blockquote', 'section', 'article',
+                         'h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+_SKIP_TAGS = frozenset(('script', 'style', 'noscript'))
+_QA_HEADING = re.compile(r'(question-and-answer session|questions? (and|&) answers?|q ?& ?a)$', re.I)
+
+class TextExtractor(HTMLParser):
+    '''Incremental HTML to plain text, one block per line, without building a tree.
+
+    Only text of the wanted section is kept (transcripts switch from prepared
+    remarks to the Q&A at the Question-and-Answer Session heading), and of it
+    only the offset/length character window. more is set once wanted text had
+    to be dropped, and finished once the wanted section is over, after which
+    nothing further needs to be fed.
+    '''
+
+    def __init__(self, section: str = 'all', offset: int = 0, length: Union[int, None] = None):
+        super().__init__(convert_charrefs=True)
+        self._section = section
+        self._offset = offset
+        self._length = length
+        self.more = False
+        self.finished = False
+        self._current = 'prepared_remarks'
+        self._block = []
+        self._skip = 0
+        self._seen = 0
+        self._kept = 0
+        self._out = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self._end_block()
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+        elif tag in _BLOCK_TAGS:
+            self._end_block()
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._block.append(data)
+
+    def close(self):
+        super().close()
+        self._end_block()
+
+    def _end_block(self):
+        text = ' '.join(''.join(self._block).split())
+        self._block = []
+        if not text:
+            return
+        if self._current == 'prepared_remarks' and len(text) < 40 and _QA_HEADING.match(text):
+            self._current = 'qa'
+            self.finished = self._section == 'prepared_remarks'
+        if self._section == 'all' or self._current == self._section:
+            self._emit(text + '\n')
+
+    def _emit(self, text: str):
+        start = max(self._offset - self._seen, 0)
+        self._seen += len(text)
+        if start >= len(text):
+            return
+        piece = text[start:]
+        if self._length is not None and self._kept + len(piece) > self._length:
+            self.more = True
+            piece = piece[:self._length - self._kept]
+        self._out.append(piece)
+        self._kept += len(piece)
+
+    def text(self) -> str:
+        return ''.join(self._out)
+
+def extract_text(content: str, section: str = 'all', offset: int = 0, length: Union[int, None] = None,
+                 chunk_size: int = 16384) -> tuple:
+    '''Feed HTML to a TextExtractor chunk by chunk, stopping as soon as the requested text is complete; returns (text, more).'''
+    parser = TextExtractor(section, offset, length)
+    for i in range(0, len(content), chunk_size):
+        parser.feed(content[i:i + chunk_size])
+        if parser.more or parser.finished:
+            break
+    # Flushes text the parser still buffers (a trailing block, or a run cut off mid-chunk).
+    parser.close()
+    return parser.text(), parser.more
+
+def _format_content(data, format: str, section: str = 'all', offset: int = 0, length: Union[int, None] = None):
+    '''Swap the HTML content of a details response for the requested slice of its text, leaving the cached response untouched.'''
+    if format == 'html' or not isinstance(data, dict) or not isinstance(data.get('data'), dict):
+        return data
+    attributes = data['data'].get('attributes') or {}
+    content = attributes.get('content')
+    text, more = extract_text(content if isinstance(content, str) else '', section, offset, length)
+    return {**data, 'data': {**data['data'], 'attributes': {**attributes, 'content': text}},
+            'meta': {**(data.get('meta') or {}), 'content': {'format': 'text', 'section': section, 'offset': offset, 'length': len(text), 'more': more}}}
+
+def _document_symbols(data: dict) -> list:
+    '''Lowercased symbols a detail response is tagged with, from its ticker relationships.'''
+    names = {str(item.get('id')): (item.get('attributes') or {}).get('name') for item in data.get('included') or []
+             if isinstance(item, dict) and ((item.get('attributes') or {}).get('tagKind') == 'Tags::Ticker' or item.get('type') == 'ticker')}
+    symbols = []
+    for name, relationship in ((data.get('data') or {}).get('relationships') or {}).items():
+        related = relationship.get('data') if isinstance(relationship, dict) else None
+        if 'ticker' not in name.lower() or not related:
+            continue
+        for ref in related if isinstance(related, list) else [related]:
+            symbol = names.get(str(ref.get('id'))) or symbol_index.symbol(ref.get('id'))
+            if isinstance(symbol, str) and symbol.lower() not in symbols:
+                symbols.append(symbol.lower())
+    return symbols
+
+class DocumentIndex:
+    '''SQLite FTS5 index of the articles, news, transcripts, press releases and analysis fetched so far.
+
+    Documents are added as they are fetched and ranked with BM25, title
+    matches weighing more than body matches. Without FTS5 in the local SQLite
+    build the index stays empty.
+    '''
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS documents (rowid INTEGER PRIMARY KEY, type TEXT NOT NULL, id TEXT NOT NULL, '
+                         'title TEXT, published REAL, symbols TEXT NOT NULL, UNIQUE (type, id))')
+        self._db.execute('CREATE TABLE IF NOT EXISTS document_symbols (symbol TEXT NOT NULL, document INTEGER NOT NULL, '
+                         'PRIMARY KEY (symbol, document))')
+        try:
+            self._db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(title, body, tokenize='porter unicode61')")
+            self.available = True
+        except sqlite3.OperationalError:
+            self.available = False
+
+    def _add(self, document_type: str, document_id: str, title: str, published, symbols: list, body: str):
+        with self._lock:
+            if self._db.execute('SELECT 1 FROM documents WHERE type = ? AND id = ?', (document_type, document_id)).fetchone():
+                return
+            self._db.execute('BEGIN')
+            rowid = self._db.execute('INSERT INTO documents (type, id, title, published, symbols) VALUES (?, ?, ?, ?, ?)',
+                                     (document_type, document_id, title, published, ','.join(symbols))).lastrowid
+            self._db.executemany('INSERT OR IGNORE INTO document_symbols VALUES (?, ?)', [(symbol, rowid) for symbol in symbols])
+            self._db.execute('INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)', (rowid, title, body))
+            self._db.execute('COMMIT')
+
+    async def add(self, url: str, params: dict, data):
+        if not self.available or not isinstance(data, dict) or not isinstance(data.get('data'), dict):
+            return
+        item = data['data']
+        attributes = item.get('attributes') or {}
+        body = attributes.get('content') or ''
+        if not body and not attributes.get('title'):
+            return
+        await asyncio.to_thread(self._add, _DOCUMENT_TYPES[_endpoint(url)], str(item.get('id') or params.get('id')),
+                                attributes.get('title') or '', _item_timestamp(item), _document_symbols(data),
+                                extract_text(body)[0] if isinstance(body, str) else '')
+
+    def _search(self, match: str, types: list, symbols: list, since, until, size: int) -> list:
+        sql = ("SELECT d.type, d.id, d.title, d.published, d.symbols, snippet(documents_fts, 1, '[', ']', '...', 24), "
+               'bm25(documents_fts, 5.0, 1.0) AS rank FROM documents_fts JOIN documents d ON d.rowid = documents_fts.rowid '
+               'WHERE documents_fts MATCH ?')
+        args = [match]
+        if types:
+            sql += f' AND d.type IN ({",".join("?" * len(types))})'
+            args += types
+        if symbols:
+            sql += f' AND d.rowid IN (SELECT document FROM document_symbols WHERE symbol IN ({",".join("?" * len(symbols))}))'
+            args += symbols
+        if since is not None:
+            sql += ' AND d.published >= ?'
+            args.append(since)
+        if until is not None:
+            sql += ' AND d.published <= ?'
+            args.append(until)
+        with self._lock:
+            return self._db.execute(sql + ' ORDER BY rank LIMIT ?', args + [size]).fetchall()
+
+    async def search(self, query: str, types: list, symbols: list, since=None, until=None, size: int = 10, match: str = 'any') -> list:
+        terms = re.findall(r'\w+', query.lower())
+        if match == 'any':
+            terms = [t for t in terms if t not in _STOPWORDS] or terms
+        if not terms:
+            return []
+        rows = await asyncio.to_thread(self._search, (' OR ' if match == 'any' else ' AND ').join(f'"{t}"' for t in terms),
+                                       types, symbols, since, until, size)
+        return [{'type': t, 'id': i, 'title': title, 'publishOn': published, 'symbols': tickers.split(',') if tickers else [],
+                 'snippet': snippet, 'score': -rank} for t, i, title, published, tickers, snippet, rank in rows]
+
+    def stats(self) -> dict:
+        if not self.available:
+            return {'available': False}
+        with self._lock:
+            counts = dict(self._db.execute('SELECT type, COUNT(*) FROM documents GROUP BY type').fetchall())
+        return {'available': True, 'documents': counts}
+
+if os.getenv('SA_SEARCH_INDEX_DIR'):
+    os.makedirs(os.getenv('SA_SEARCH_INDEX_DIR'), exist_ok=True)
+document_index = DocumentIndex(os.path.join(os.getenv('SA_SEARCH_INDEX_DIR'), 'documents.sqlite3') if os.getenv('SA_SEARCH_INDEX_DIR') else ':memory:')
+
+_BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+_BAR_DATE_FIELDS = ('as_of_date', 'date', 'time', 'timestamp')
+
+class SeriesColumns:
+    '''A time series held as a datetime64[s] timestamp array plus one float64 array per numeric field.'''
+
+    def __init__(self, timestamp, columns: dict):
+        self.timestamp = timestamp
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamp.nbytes + sum(column.nbytes for column in self.columns.values())
+
+    def to_dict(self) -> dict:
+        result = {'timestamp': self.timestamp.astype('int64').tolist()}
+        for name, column in self.columns.items():
+            result[name] = [None if value != value else value for value in column.tolist()]
+        return result
+
+def _json_float(value) -> Union[float, None]:
+    value = float(value)
+    return None if math.isnan(value) or math.isinf(value) else value
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError('numpy is required for this output mode; install it with `pip install numpy`')
+
+def _series_rows(data) -> dict:
+    '''Find the bars of a chart/price response as {series id: [(timestamp string, fields)]}.'''
+    series = {}
+    if not isinstance(data, dict):
+        return series
+    if isinstance(data.get('attributes'), dict):
+        series[''] = [(k, v) for k, v in data['attributes'].items() if isinstance(v, dict)]
+    items = [item for item in data.get('data') or [] if isinstance(item, dict) and isinstance(item.get('attributes'), dict)]
+    if items and any(field in items[0]['attributes'] for field in _BAR_FIELDS):
+        # One bar per item, dated by its attributes or else by its id.
+        date_field = next((f for f in _BAR_DATE_FIELDS if f in items[0]['attributes']), None)
+        series[''] = [(item['attributes'].get(date_field) if date_field else item.get('id'), item['attributes']) for item in items]
+    else:
+        for item in items:
+            rows = [(k, v) for k, v in item['attributes'].items() if isinstance(v, dict)]
+            if rows:
+                series[str(item.get('id', ''))] = rows
+    return {name: rows for name, rows in series.items() if rows}
+
+def _parse_timestamps(values: list):
+    values = [str(v) for v in values]
+    if all(len(v) <= 19 for v in values):
+        # Naive dates and datetimes parse in bulk; anything with an offset goes through datetime.
+        try:
+            return np.array([v.replace(' ', 'T') for v in values], dtype='datetime64[s]')
+        except ValueError:
+            pass
+    parsed = []
+    for v in values:
+        value = datetime.fromisoformat(v.replace('Z', '+00:00'))
+        parsed.append(value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value)
+    return np.array(parsed, dtype='datetime64[s]')
+
+def parse_series(data) -> dict:
+    '''Parse a historical prices or chart response into {series id: SeriesColumns}, oldest bar first.'''
+    _require_numpy()
+    parsed = {}
+    for name, rows in _series_rows(data).items():
+        timestamp = _parse_timestamps([row[0] for row in rows])
+        order = np.argsort(timestamp, kind='stable')
+        # Series are homogeneous, so the first and last bars name every field.
+        numeric = {k for row in (rows[0][1], rows[-1][1]) for k, v in row.items() if isinstance(v, (int, float)) and not isinstance(v, bool)}
+        fields = [f for f in _BAR_FIELDS if f in numeric] + sorted(numeric - set(_BAR_FIELDS))
+        columns = {}
+        for field in fields:
+            values = [row.get(field) for _, row in rows]
+            try:
+                column = np.array(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                column = np.array([v if isinstance(v, (int, float)) else np.nan for v in values], dtype=np.float64)
+            columns[field] = column[order]
+        parsed[name] = SeriesColumns(timestamp[order], columns)
+    return parsed
+
+def _format_series(data, format: str):
+    if format == 'json' or not isinstance(data, dict) or 'errors' in data:
+        return data
+    series = parse_series(data)
+    if format == 'npz':
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **{f'{name or "series"}/{field}': column for name, s in series.items()
+                                       for field, column in {'timestamp': s.timestamp.astype('int64'), **s.columns}.items()})
+        return {'npz_base64': base64.b64encode(buffer.getvalue()).decode()}
+    return {name or 'series': s.to_dict() for name, s in series.items()}
+
+class BarStore:
+    '''Local SQLite store of OHLCV bars per symbol and show_by granularity.
+
+    Alongside the bars it records which date ranges are complete, so a range
+    request only has to fetch the gaps upstream. Each bar remembers the day it
+    was fetched, which is what later splits are applied against.
+    '''
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS bars (symbol TEXT NOT NULL, show_by TEXT NOT NULL, date TEXT NOT NULL, '
+                         'open REAL, high REAL, low REAL, close REAL, volume REAL, fetched_on TEXT NOT NULL, '
+                         'PRIMARY KEY (symbol, show_by, date))')
+        self._db.execute('CREATE TABLE IF NOT EXISTS coverage (symbol TEXT NOT NULL, show_by TEXT NOT NULL, start TEXT NOT NULL, end TEXT NOT NULL)')
+        self._locks = {}
+
+    def lock(self, symbol: str, show_by: str) -> asyncio.Lock:
+        return self._locks.setdefault((symbol, show_by), asyncio.Lock())
+
+    def _coverage(self, symbol: str, show_by: str) -> list:
+        with self._lock:
+            return self._db.execute('SELECT start, end FROM coverage WHERE symbol = ? AND show_by = ? ORDER BY start',
+                                    (symbol, show_by)).fetchall()
+
+    def _add(self, symbol: str, show_by: str, rows: list, covered: Union[tuple, None]):
+        fetched_on = date.today().isoformat()
+        with self._lock:
+            self._db.execute('BEGIN')
+            self._db.executemany('INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                 [(symbol, show_by, *row, fetched_on) for row in rows])
+            if covered is not None:
+                ranges = self._db.execute('SELECT start, end FROM coverage WHERE symbol = ? AND show_by = ?', (symbol, show_by)).fetchall()
+                self._db.execute('DELETE FROM coverage WHERE symbol = ? AND show_by = ?', (symbol, show_by))
+                self._db.executemany('INSERT INTO coverage VALUES (?, ?, ?, ?)',
+                                     [(symbol, show_by, start, end) for start, end in _merge_ranges(ranges + [covered])])
+            self._db.execute('COMMIT')
+
+    def _bars(self, symbol: str, show_by: str, start: str, end: str) -> list:
+        with self._lock:
+            return self._db.execute('SELECT date, open, high, low, close, volume, fetched_on FROM bars '
+                                    'WHERE symbol = ? AND show_by = ? AND date BETWEEN ? AND ? ORDER BY date',
+                                    (symbol, show_by, start, end)).fetchall()
+
+    async def coverage(self, symbol: str, show_by: str) -> list:
+        return await asyncio.to_thread(self._coverage, symbol, show_by)
+
+    async def add(self, symbol: str, show_by: str, rows: list, covered: Union[tuple, None]):
+        await asyncio.to_thread(self._add, symbol, show_by, rows, covered)
+
+    async def bars(self, symbol: str, show_by: str, start: str, end: str) -> list:
+        return await asyncio.to_thread(self._bars, symbol, show_by, start, end)
+
+def _merge_ranges(ranges: list) -> list:
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and date.fromisoformat(start) <= date.fromisoformat(merged[-1][1]) + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def _missing_ranges(start: str, end: str, covered: list) -> list:
+    gaps = []
+    cursor = date.fromisoformat(start)
+    last = date.fromisoformat(end)
+    for covered_start, covered_end in covered:
+        covered_start, covered_end = date.fromisoformat(covered_start), date.fromisoformat(covered_end)
+        if covered_end < cursor:
+            continue
+        if covered_start > last:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor.isoformat(), (covered_start - timedelta(days=1)).isoformat()))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+    if cursor <= last:
+        gaps.append((cursor.isoformat(), last.isoformat()))
+    return gaps
+
+def _align_range(start: str, end: str, show_by: str) -> tuple:
+    '''Widen a range to whole weeks or months so stored bars never cover a partial period.'''
+    first, last = date.fromisoformat(start), date.fromisoformat(end)
+    if show_by == 'week':
+        first -= timedelta(days=first.weekday())
+        last += timedelta(days=6 - last.weekday())
+    elif show_by == 'month':
+        first = first.replace(day=1)
+        last = (last.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return first.isoformat(), last.isoformat()
+
+def _split_ratio(attributes: dict) -> Union[float, None]:
+    for field in ('ratio', 'split_ratio', 'split_factor', 'factor'):
+        value = attributes.get(field)
+        if isinstance(value, (int, float)) and value > 0:
+            return float(value)
+        if isinstance(value, str):
+            parts = [p for p in re.split(r'[:/]|-for-|\s+for\s+', value.strip()) if p]
+            try:
+                return float(parts[0]) / float(parts[1]) if len(parts) == 2 else float(parts[0])
+            except (ValueError, ZeroDivisionError):
+                continue
+    return None
+
+def _parse_splits(data) -> list:
+    '''Return [(effective date, new shares per old share)] from a symbols/get-splits response.'''
+    splits = []
+    items = data.get('data') if isinstance(data, dict) else None
+    for item in items or []:
+        attributes = (item.get('attributes') or {}) if isinstance(item, dict) else {}
+        when = next((attributes[f] for f in ('date', 'effective_date', 'ex_date', 'split_date') if attributes.get(f)), None)
+        ratio = _split_ratio(attributes)
+        if when and ratio:
+            splits.append((str(when)[:10], ratio))
+    return splits
+
+if os.getenv('SA_BAR_STORE_DIR'):
+    os.makedirs(os.getenv('SA_BAR_STORE_DIR'), exist_ok=True)
+bar_store = BarStore(os.path.join(os.getenv('SA_BAR_STORE_DIR'), 'bars.sqlite3') if os.getenv('SA_BAR_STORE_DIR') else ':memory:')
+
+async def load_bars(symbol: str, start: str, end: str, show_by: str = 'day', fresh: bool = False) -> dict:
+    '''Serve split-adjusted bars for a date range from bar_store, fetching only the missing ranges upstream.'''
+    symbol = symbol.strip().lower()
+    url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-historical-prices'
+    # Only periods that have fully closed are marked complete; the current one is refetched next time.
+    today = date.today().isoformat()
+    closed_until = (date.fromisoformat(_align_range(today, today, show_by)[0]) - timedelta(days=1)).isoformat()
+    async with bar_store.lock(symbol, show_by):
+        covered = [] if fresh else await bar_store.coverage(symbol, show_by)
+        fetched, failed = [], []
+        for gap_start, gap_end in _missing_ranges(*_align_range(start, end, show_by), covered):
+            # Always from upstream: a cached response may predate a split, and rows are stamped as fetched today.
+            params = {'symbol': symbol, 'start': gap_start, 'end': gap_end, 'show_by': show_by}
+            status, data = await _fetch(url, params)
+            await _store(url, params, _cache_key(url, _normalize_params(params)), _cache_ttl(url, params), status, data)
+            if status >= 400 or not isinstance(data, dict) or not ('data' in data or 'attributes' in data):
+                # An error body is not an empty range: leave the gap uncovered so the next call retries it.
+                failed.append((gap_start, gap_end))
+                continue
+            rows = [(str(timestamp)[:10], *(attributes.get(f) for f in _BAR_FIELDS))
+                    for series in _series_rows(data).values() for timestamp, attributes in series]
+            covered_end = min(gap_end, closed_until)
+            await bar_store.add(symbol, show_by, rows, (gap_start, covered_end) if gap_start <= covered_end else None)
+            fetched.append((gap_start, gap_end))
+        stored = await bar_store.bars(symbol, show_by, start, end)
+    splits = _parse_splits(await _get('https://seeking-alpha.p.rapidapi.com/symbols/get-splits', {'symbol': symbol})) if stored else []
+    bars = []
+    for day, open_, high, low, close, volume, fetched_on in stored:
+        # Bars stored before a split are in pre-split units; upstream adjusts anything fetched after it.
+        factor = 1.0
+        for split_date, ratio in splits:
+            if day < split_date and fetched_on < split_date:
+                factor *= ratio
+        bars.append({'date': day,
+                     **{f: (v / factor if v is not None else None) for f, v in zip(('open', 'high', 'low', 'close'), (open_, high, low, close))},
+                     'volume': volume * factor if volume is not None else None})
+    return {'symbol': symbol, 'show_by': show_by, 'bars': bars, 'meta': {'fetched_ranges': fetched, 'failed_ranges': failed}}
+
+_INDICATORS = ('sma', 'ema', 'rsi', 'macd', 'bollinger', 'volatility', 'drawdown', 'returns')
+
+def _rolling_sum(x, window: int):
+    '''Sum and count of non-NaN values over a trailing window, along the last axis.'''
+    valid = ~np.isnan(x)
+    sums = np.cumsum(np.where(valid, x, 0.0), axis=-1)
+    counts = np.cumsum(valid, axis=-1)
+    sums[..., window:] = sums[..., window:] - sums[..., :-window]
+    counts[..., window:] = counts[..., window:] - counts[..., :-window]
+    return sums, counts
+
+def _rolling_mean(x, window: int):
+    sums, counts = _rolling_sum(x, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts >= window, sums / counts, np.nan)
+
+def _rolling_std(x, window: int):
+    sums, counts = _rolling_sum(x, window)
+    squares, _ = _rolling_sum(x * x, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (squares - sums * sums / counts) / (counts - 1)
+    return np.where(counts >= window, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+def _ewm(x, alpha: float):
+    '''Exponentially weighted mean along the last axis, vectorized across rows; NaNs carry the previous value.'''
+    # Walk time steps over contiguous (time, symbols) rows so each step is one vector operation.
+    steps = np.ascontiguousarray(np.moveaxis(x, -1, 0))
+    out = np.empty_like(steps)
+    missing = np.isnan(steps)
+    first = np.where(missing.all(axis=0), len(steps), (~missing).argmax(axis=0))
+    leading = np.arange(len(steps)).reshape((-1,) + (1,) * (steps.ndim - 1)) < first
+    if not (missing & ~leading).any():
+        # Only leading gaps: back-fill them with the first value, which leaves the average unchanged.
+        steps = np.where(leading, np.take_along_axis(steps, np.minimum(first, len(steps) - 1)[np.newaxis], axis=0), steps)
+        current = steps[0].copy()
+        for t in range(len(steps)):
+            current += alpha * (steps[t] - current)
+            out[t] = current
+        out[leading] = np.nan
+    else:
+        current = np.full(steps.shape[1:], np.nan)
+        for t in range(len(steps)):
+            value = steps[t]
+            current = np.where(np.isnan(current), value, np.where(np.isnan(value), current, current + alpha * (value - current)))
+            out[t] = current
+    return np.moveaxis(out, 0, -1)
+
+def _wilder(x, period: int):
+    '''Wilder's smoothing: seeded with the mean of the first full window, then an EWM with alpha 1/period.'''
+    seed = _rolling_mean(x, period)
+    ready = ~np.isnan(seed)
+    first = np.where(ready.any(axis=-1), ready.argmax(axis=-1), x.shape[-1])[..., np.newaxis]
+    steps = np.arange(x.shape[-1])
+    return _ewm(np.where(steps < first, np.nan, np.where(steps == first, seed, x)), 1.0 / period)
+
+def _rsi(close, period: int):
+    change = np.diff(close, axis=-1, prepend=np.nan)
+    gain = _wilder(np.where(np.isnan(change), np.nan, np.maximum(change, 0.0)), period)
+    loss = _wilder(np.where(np.isnan(change), np.nan, np.maximum(-change, 0.0)), period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+    # No losses is 100; no movement at all leaves RSI undefined.
+    return np.where(loss == 0, np.where(gain == 0, np.nan, 100.0), rsi)
+
+def compute_indicators(close, names=_INDICATORS, window: int = 20, fast: int = 12, slow: int = 26, signal: int = 9,
+                       rsi_period: int = 14, bollinger_k: float = 2.0, periods_per_year: int = 252) -> dict:
+    '''Compute technical indicators for a (symbols x time) float64 close matrix in one vectorized pass.
+
+    Returns {output name: array of the same shape}.
+    '''
+    _require_numpy()
+    close = np.asarray(close, dtype=np.float64)
+    out = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = close / np.roll(close, 1, axis=-1) - 1.0
+    returns[..., 0] = np.nan
+    if 'sma' in names:
+        out['sma'] = _rolling_mean(close, window)
+    if 'ema' in names:
+        out['ema'] = _ewm(close, 2.0 / (window + 1))
+    if 'rsi' in names:
+        out['rsi'] = _rsi(close, rsi_period)
+    if 'macd' in names:
+        macd = _ewm(close, 2.0 / (fast + 1)) - _ewm(close, 2.0 / (slow + 1))
+        out['macd'] = macd
+        out['macd_signal'] = _ewm(macd, 2.0 / (signal + 1))
+        out['macd_histogram'] = macd - out['macd_signal']
+    if 'bollinger' in names:
+        middle = _rolling_mean(close, window)
+        band = bollinger_k * _rolling_std(close, window)
+        out['bollinger_middle'], out['bollinger_upper'], out['bollinger_lower'] = middle, middle + band, middle - band
+    if 'volatility' in names:
+        out['volatility'] = _rolling_std(np.log1p(returns), window) * math.sqrt(periods_per_year)
+    if 'drawdown' in names:
+        peak = np.fmax.accumulate(np.where(np.isnan(close), -np.inf, close), axis=-1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out['drawdown'] = np.where(np.isnan(close), np.nan, close / peak - 1.0)
+    if 'returns' in names:
+        out['returns'] = returns
+        with np.errstate(invalid='ignore'):
+            out['cumulative_return'] = np.exp(np.nancumsum(np.log1p(returns), axis=-1)) - 1.0
+    return out
+
+indicator_cache = TTLCache(int(os.getenv('SA_INDICATOR_CACHE_MAX_ENTRIES', '1024')))
+
+_STRIKE_KEYS = ('strike', 'strike_price', 'strikePrice')
+_UNDERLYING_KEYS = ('underlying_price', 'underlyingPrice', 'stock_price', 'stockPrice')
+_OPTION_FIELDS = {
+    'bid': ('bid',),
+    'ask': ('ask',),
+    'last': ('last', 'last_price', 'lastPrice'),
+    'volume': ('volume',),
+    'open_interest': ('open_interest', 'openInterest'),
+}
+_GREEKS = ('iv', 'delta', 'gamma', 'theta', 'vega', 'rho')
+_SIDE_KEYS = {'call': 'call', 'calls': 'call', 'put': 'put', 'puts': 'put'}
+
+def _number(value) -> Union[float, None]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+def _option_side(contract: dict) -> Union[str, None]:
+    for key in ('option_type', 'optionType', 'put_call', 'putCall', 'right', 'side', 'type'):
+        value = contract.get(key)
+        if isinstance(value, str) and value.lower() in ('c', 'call', 'p', 'put'):
+            return 'call' if value[0].lower() == 'c' else 'put'
+    match = re.search(r'\d{6}([CP])\d{8}$', str(contract.get('symbol') or contract.get('option_symbol') or ''))
+    return {'C': 'call', 'P': 'put'}[match.group(1)] if match else None
+
+def _option_contracts(data):
+    '''Yield (side, strike, fields) for every option contract in a get-options response.
+
+    Contracts are recognised by a bid, ask or last price; side and strike come
+    from the contract itself or from the calls/puts and strike keys above it.
+    '''
+    stack = [(data, None, None)]
+    while stack:
+        node, side, strike = stack.pop()
+        if isinstance(node, list):
+            stack.extend((item, side, strike) for item in node)
+            continue
+        if not isinstance(node, dict):
+            continue
+        fields = node['attributes'] if isinstance(node.get('attributes'), dict) else node
+        node_strike = next((_number(fields[k]) for k in _STRIKE_KEYS if k in fields), None) or strike
+        node_side = _option_side(fields) or side
+        if node_side and node_strike is not None and any(k in fields for k in ('bid', 'ask', 'last', 'last_price', 'lastPrice')):
+            yield node_side, node_strike, fields
+            continue
+        for key, value in fields.items():
+            if isinstance(value, (dict, list)):
+                stack.append((value, _SIDE_KEYS.get(str(key).lower(), node_side), _number(key) if _number(key) is not None else node_strike))
+
+def _underlying_price(data) -> Union[float, None]:
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key in _UNDERLYING_KEYS:
+                if _number(node.get(key)):
+                    return _number(node[key])
+            stack.extend(v for v in node.values() if isinstance(v, dict))
+    return None
+
+def _iso_dates(data) -> list:
+    '''Every yyyy-MM-dd date mentioned anywhere in a response, sorted.'''
+    dates, stack = set(), [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, str) and re.match(r'\d{4}-\d{2}-\d{2}', node):
+            dates.add(node[:10])
+    return sorted(dates)
+
+_EXPIRATION_KEYS = ('expiration_date', 'expirationDate', 'expiration', 'expiration_dates', 'expirationDates', 'expirations')
+
+def _option_expirations(data) -> list:
+    '''Expiration dates of a get-option-expirations response, sorted.
+
+    Only expiration fields count (or bare date lists, or ids of expiration
+    items), so as-of dates and other metadata are not taken for expirations.
+    '''
+    dates, stack = set(), [data]
+
+    def add(value):
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, str) and re.match(r'\d{4}-\d{2}-\d{2}', item):
+                dates.add(item[:10])
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            add([item for item in node if isinstance(item, str)])
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
+        elif isinstance(node, dict):
+            for key in _EXPIRATION_KEYS:
+                if key in node:
+                    add(node[key])
+            if 'expiration' in str(node.get('type', '')).lower():
+                add(node.get('id'))
+            stack.extend(node[key] for key in ('data', 'attributes') if isinstance(node.get(key), (dict, list)))
+            stack.extend(node[key] for key in _EXPIRATION_KEYS if isinstance(node.get(key), (dict, list)))
+    return sorted(dates)
+
+def _norm_cdf(x):
+    # Abramowitz and Stegun 7.1.26, accurate to 1.5e-7.
+    z = np.abs(x) / math.sqrt(2)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    erf = 1.0 - ((((1.061405429 * t - 1.453152027) * t + 1.421413741) * t - 0.284496736) * t + 0.254829592) * t * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+def _norm_pdf(x):
+    return np.exp(-0.5 * x * x) / math.sqrt(2 * math.pi)
+
+def _black_scholes(spot, strike, t, rate, dividend_yield, sigma, is_call) -> tuple:
+    sqrt_t = np.sqrt(t)
+    d1 = (np.log(spot / strike) + (rate - dividend_yield + 0.5 * sigma * sigma) * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    spot_discounted = spot * np.exp(-dividend_yield * t)
+    strike_discounted = strike * np.exp(-rate * t)
+    sign = np.where(is_call, 1.0, -1.0)
+    price = sign * (spot_discounted * _norm_cdf(sign * d1) - strike_discounted * _norm_cdf(sign * d2))
+    return price, d1, d2, spot_discounted, strike_discounted
+
+def implied_volatility(price, spot, strike, t, rate: float, dividend_yield: float, is_call, iterations: int = 40):
+    '''Vectorized Black-Scholes implied volatility: Newton steps kept inside a shrinking bisection bracket.
+
+    Prices outside the no-arbitrage bounds give NaN.
+    '''
+    price, strike, t, is_call = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (price, strike, t, is_call)))
+    is_call = is_call.astype(bool)
+    spot_discounted = spot * np.exp(-dividend_yield * t)
+    strike_discounted = strike * np.exp(-rate * t)
+    lower = np.maximum(np.where(is_call, spot_discounted - strike_discounted, strike_discounted - spot_discounted), 0.0)
+    upper = np.where(is_call, spot_discounted, strike_discounted)
+    with np.errstate(invalid='ignore'):
+        valid = np.isfinite(price) & (price > lower) & (price < upper) & (t > 0)
+    lo, hi = np.full(price.shape, 1e-4), np.full(price.shape, 5.0)
+    sigma = np.full(price.shape, 0.3)
+    with np.errstate(all='ignore'):
+        for _ in range(iterations):
+            value, d1, _, spot_discounted, _ = _black_scholes(spot, strike, t, rate, dividend_yield, sigma, is_call)
+            diff = np.where(valid, value - price, 0.0)
+            if np.all(np.abs(diff) < 1e-8):
+                break
+            hi = np.where(diff > 0, sigma, hi)
+            lo = np.where(diff <= 0, sigma, lo)
+            vega = spot_discounted * _norm_pdf(d1) * np.sqrt(t)
+            step = sigma - diff / vega
+            sigma = np.where((vega > 1e-12) & (step > lo) & (step < hi), step, 0.5 * (lo + hi))
+    return np.where(valid, sigma, np.nan)
+
+def option_greeks(spot, strike, t, rate: float, dividend_yield: float, sigma, is_call) -> dict:
+    '''Black-Scholes delta, gamma, theta (per day), vega and rho (per 1% move) for arrays of contracts.'''
+    with np.errstate(all='ignore'):
+        _, d1, d2, spot_discounted, strike_discounted = _black_scholes(spot, strike, t, rate, dividend_yield, sigma, is_call)
+        sqrt_t = np.sqrt(t)
+        sign = np.where(is_call, 1.0, -1.0)
+        pdf = _norm_pdf(d1)
+        theta = (-spot_discounted * pdf * sigma / (2 * sqrt_t) - sign * rate * strike_discounted * _norm_cdf(sign * d2)
+                 + sign * dividend_yield * spot_discounted * _norm_cdf(sign * d1))
+        return {
+            'delta': sign * np.exp(-dividend_yield * t) * _norm_cdf(sign * d1),
+            'gamma': np.exp(-dividend_yield * t) * pdf / (spot * sigma * sqrt_t),
+            'theta': theta / 365,
+            'vega': spot_discounted * pdf * sqrt_t / 100,
+            'rho': sign * strike * t * np.exp(-rate * t) * _norm_cdf(sign * d2) / 100,
+        }
+
+def _chain_arrays(chains: dict, spot: float, rate: float, dividend_yield: float) -> dict:
+    '''Lay contracts of {expiration: response} out on an expiration x strike grid per side, then add IV and Greeks.'''
+    expirations = sorted(chains)
+    contracts = {expiration: list(_option_contracts(data)) for expiration, data in chains.items()}
+    strikes = sorted({strike for found in contracts.values() for _, strike, _ in found})
+    row = {expiration: i for i, expiration in enumerate(expirations)}
+    column = {strike: j for j, strike in enumerate(strikes)}
+    shape = (len(expirations), len(strikes))
+    sides = {side: {field: np.full(shape, np.nan) for field in _OPTION_FIELDS} for side in ('call', 'put')}
+    for expiration, found in contracts.items():
+        for side, strike, fields in found:
+            for field, keys in _OPTION_FIELDS.items():
+                value = next((_number(fields[k]) for k in keys if k in fields), None)
+                if value is not None:
+                    sides[side][field][row[expiration], column[strike]] = value
+    today = date.today()
+    days = np.array([(date.fromisoformat(expiration) - today).days for expiration in expirations], dtype=float)
+    t = (np.maximum(days, 1.0) / 365.0)[:, None]
+    strike_grid = np.asarray(strikes, dtype=float)[None, :]
+    for side, arrays in sides.items():
+        bid, ask = arrays['bid'], arrays['ask']
+        with np.errstate(invalid='ignore'):
+            price = np.where((bid > 0) & (ask > 0), 0.5 * (bid + ask), arrays['last'])
+        is_call = side == 'call'
+        arrays['iv'] = implied_volatility(price, spot, strike_grid, t, rate, dividend_yield, is_call)
+        arrays.update(option_greeks(spot, strike_grid, t, rate, dividend_yield, arrays['iv'], is_call))
+    return {'expirations': expirations, 'days': [int(d) for d in days], 'strikes': strikes,
+            **{side: {field: [[_json_float(v) for v in values] for values in array] for field, array in arrays.items()}
+               for side, arrays in sides.items()}}
+
+_STATEMENT_TYPES = ('income-statement', 'balance-sheet', 'cash-flow-statement')
+# name: (numerator keys, denominator keys); the first line item present is used.
+_STATEMENT_RATIOS = {
+    'gross_margin': (('gross_profit',), ('total_revenue', 'revenues')),
+    'operating_margin': (('operating_income',), ('total_revenue', 'revenues')),
+    'net_margin': (('net_income',), ('total_revenue', 'revenues')),
+    'current_ratio': (('total_current_assets',), ('total_current_liabilities',)),
+    'debt_to_equity': (('total_debt',), ('total_equity', 'total_common_equity')),
+    'return_on_equity': (('net_income',), ('total_equity', 'total_common_equity')),
+    'return_on_assets': (('net_income',), ('total_assets',)),
+    'asset_turnover': (('total_revenue', 'revenues'), ('total_assets',)),
+    'cash_conversion': (('cash_from_ops', 'cash_from_operations'), ('net_income',)),
+}
+_PERIOD_FORMATS = ('%b %Y', '%Y-%m-%d', '%m/%d/%Y', '%b %d, %Y', 'FY%Y', '%Y')
+_SCALES = {'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+
+def _display_number(value) -> float:
+    '''Parse a display cell such as "1,234.5", "(12.3)", "4.5%" or "1.2B"; NaN for "-", "NM" and the like.'''
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, str):
+        return math.nan
+    text = value.strip().replace(',', '').replace('$', '')
+    negative = text.startswith('(') and text.endswith(')')
+    text = text.strip('()').rstrip('%').strip()
+    scale = _SCALES.get(text[-1:].upper(), 1) if text[-1:].isalpha() else 1
+    try:
+        number = float(text[:-1] if scale != 1 else text) * scale
+    except ValueError:
+        return math.nan
+    return -number if negative else number
+
+def _period_date(label: str) -> Union[date, None]:
+    for fmt in _PERIOD_FORMATS:
+        try:
+            return datetime.strptime(label.strip(), fmt).date()
+        except ValueError:
+            pass
+    return None
+
+def _statement_rows(data):
+    '''Yield (key, label, [(period, value)]) for every row with cells in a get-financials response, in order.'''
+    if isinstance(data, list):
+        for item in data:
+            yield from _statement_rows(item)
+    elif isinstance(data, dict):
+        if isinstance(data.get('cells'), list):
+            label = str(data.get('value') or data.get('title') or data.get('name') or '')
+            key = str(data.get('name') or re.sub(r'\W+', '_', label.lower()).strip('_'))
+            cells = []
+            for cell in data['cells']:
+                if not isinstance(cell, dict):
+                    continue
+                period = cell.get('name') or cell.get('period') or cell.get('date')
+                if not period or period == label:
+                    continue
+                raw = cell.get('raw_value')
+                cells.append((str(period), _display_number(raw if raw is not None else cell.get('value'))))
+            if key and cells:
+                yield key, label, cells
+            return
+        for value in data.values():
+            if isinstance(value, (dict, list)):
+                yield from _statement_rows(value)
+
+def _statement_matrix(responses: dict) -> dict:
+    '''Merge {statement_type: response} into a period x line item float matrix, periods in date order.
+
+    A line item reported by several statements (net income, say) keeps the
+    first one in _STATEMENT_TYPES order.
+    '''
+    items, rows, periods = [], [], {}
+    for statement in _STATEMENT_TYPES:
+        for key, label, cells in _statement_rows(responses.get(statement)):
+            if any(item['key'] == key for item in items):
+                continue
+            items.append({'key': key, 'label': label, 'statement': statement})
+            rows.append(dict(cells))
+            for period, _ in cells:
+                periods.setdefault(period, len(periods))
+    order = sorted(periods, key=lambda p: (_period_date(p) is None, _period_date(p) or date.min, periods[p]))
+    values = np.full((len(order), len(items)), np.nan)
+    for j, row in enumerate(rows):
+        for i, period in enumerate(order):
+            if period in row:
+                values[i, j] = row[period]
+    return {'periods': order, 'items': items, 'columns': {item['key']: j for j, item in enumerate(items)}, 'values': values,
+            'dated': np.array([_period_date(p) is not None for p in order], dtype=bool)}
+
+statement_cache = TTLCache(int(os.getenv('SA_STATEMENT_CACHE_MAX_ENTRIES', '256')))
+
+async def load_statements(symbol: str, period_type: str = 'annual', target_currency: Union[str, None] = None, fresh: bool = False) -> dict:
+    '''Fetch the three statements concurrently and return their parsed matrix, cached per symbol, period type and currency.'''
+    _require_numpy()
+    symbol = symbol.strip().lower()
+    key = (symbol, period_type, target_currency)
+    cached = None if fresh else statement_cache.get(key)
+    if cached is not None:
+        return cached
+    url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-financials'
+    params = [{k: v for k, v in {'symbol': symbol, 'period_type': period_type, 'statement_type': statement,
+                                  'target_currency': target_currency}.items() if v is not None} for statement in _STATEMENT_TYPES]
+    responses = await asyncio.gather(*(_get(url, p, fresh=fresh) for p in params), return_exceptions=True)
+    failed = [{'statement_type': s, 'error': str(r) or type(r).__name__} for s, r in zip(_STATEMENT_TYPES, responses) if isinstance(r, BaseException)]
+    if len(failed) == len(_STATEMENT_TYPES):
+        raise responses[0]
+    matrix = _statement_matrix({s: r for s, r in zip(_STATEMENT_TYPES, responses) if not isinstance(r, BaseException)})
+    matrix.update(symbol=symbol, period_type=period_type, failed=failed)
+    if not failed:
+        statement_cache.set(key, matrix, _cache_ttl(url, params[0]))
+    return matrix
+
+def _pct_change(values, lag: int, dated):
+    '''Vectorized relative change against the row `lag` dated periods earlier, over |previous| so sign flips read right.
+
+    Undated periods such as TTM get NaN.
+    '''
+    change = np.full(values.shape, np.nan)
+    rows = np.flatnonzero(dated)
+    if lag < len(rows):
+        current, previous = values[rows[lag:]], values[rows[:-lag]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change[rows[lag:]] = np.where(previous != 0, (current - previous) / np.abs(previous), np.nan)
+    return change
+
+def statement_report(matrix: dict, items: Union[list, None] = None, ratios: Union[list, None] = None) -> dict:
+    '''Line item values, YoY (and QoQ for quarterly) changes and ratios of a statement matrix, one list per period.'''
+    columns, values = matrix['columns'], matrix['values']
+    unknown = [key for key in items or () if key not in columns]
+    if unknown:
+        raise ValueError(f'Unknown line items: {", ".join(unknown)}')
+    keys = items or list(columns)
+    selected = values[:, [columns[key] for key in keys]]
+    lags = {'qoq': 1, 'yoy': 4} if matrix['period_type'] == 'quarterly' else {'yoy': 1} if matrix['period_type'] == 'annual' else {}
+    as_lists = lambda array, names: {name: [_json_float(v) for v in array[:, j]] for j, name in enumerate(names)}
+    computed, unavailable = {}, []
+    for spec in ratios or list(_STATEMENT_RATIOS):
+        name, _, expression = spec.partition('=')
+        if expression:
+            numerator, _, denominator = expression.partition('/')
+            missing = [k for k in (numerator.strip(), denominator.strip()) if k not in columns]
+            if missing:
+                raise ValueError(f'Unknown line items: {", ".join(missing)}')
+            pair = (numerator.strip(), denominator.strip())
+        else:
+            if name not in _STATEMENT_RATIOS:
+                raise ValueError(f'Unknown ratio: {name}; use name=numerator/denominator for a custom one')
+            pair = tuple(next((k for k in keys_ if k in columns), None) for keys_ in _STATEMENT_RATIOS[name])
+            if None in pair:
+                unavailable.append(name)
+                continue
+        computed[name.strip()] = pair
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio_values = np.stack([values[:, columns[n]] / values[:, columns[d]] for n, d in computed.values()], axis=1) \
+            if computed else np.empty((len(values), 0))
+    ratio_values[~np.isfinite(ratio_values)] = np.nan
+    return {
+        'symbol': matrix['symbol'],
+        'period_type': matrix['period_type'],
+        'periods': matrix['periods'],
+        'line_items': [matrix['items'][columns[key]] for key in keys],
+        'values': as_lists(selected, keys),
+        'changes': {name: as_lists(_pct_change(selected, lag, matrix['dated']), keys) for name, lag in lags.items()},
+        'ratios': as_lists(ratio_values, list(computed)),
+        'meta': {'failed': matrix['failed'], 'unavailable_ratios': unavailable},
+    }
+
+option_chain_cache = TTLCache(int(os.getenv('SA_OPTION_CACHE_MAX_ENTRIES', '256')))
+_OPTION_CHAIN_TTL = float(os.getenv('SA_OPTION_CHAIN_TTL', '30'))
+
+async def load_option_chain(symbol: str, expirations: Union[list, None] = None, min_days: Union[int, None] = None,
+                            max_days: Union[int, None] = None, spot: Union[float, None] = None, rate: float = 0.04,
+                            dividend_yield: float = 0.0, fresh: bool = False) -> dict:
+    '''Fetch the chains of many expirations concurrently and return them as expiration x strike arrays with IV and Greeks.'''
+    _require_numpy()
+    symbol = symbol.strip().lower()
+    listed = _option_expirations(await _get('https://seeking-alpha.p.rapidapi.com/symbols/get-option-expirations', {'symbol': symbol}, fresh=fresh))
+    ticker_id = (await resolve_ticker_ids([symbol]))[symbol]
+    if ticker_id is None:
+        raise ValueError(f'Unknown symbols: {symbol}')
+    today = date.today()
+    wanted = [e for e in listed if (not expirations or e in expirations)
+              and (min_days is None or (date.fromisoformat(e) - today).days >= min_days)
+              and (max_days is None or (date.fromisoformat(e) - today).days <= max_days)]
+    key = (ticker_id, tuple(wanted), spot, rate, dividend_yield)
+    cached = None if fresh else option_chain_cache.get(key)
+    if cached is not None:
+        return cached
+    url = 'https://seeking-alpha.p.rapidapi.com/symbols/v2/get-options'
+    responses = await asyncio.gather(*(_get(url, {'ticker_id': ticker_id, 'expiration_date': e}, fresh=fresh) for e in wanted),
+                                     return_exceptions=True)
+    chains = {e: data for e, data in zip(wanted, responses) if not isinstance(data, BaseException)}
+    failed = [{'expiration': e, 'error': str(data) or type(data).__name__} for e, data in zip(wanted, responses) if isinstance(data, BaseException)]
+    if spot is None:
+        spot = next((price for price in map(_underlying_price, chains.values()) if price), None)
+    if spot is None:
+        bars = (await load_bars(symbol, (today - timedelta(days=10)).isoformat(), today.isoformat()))['bars']
+        spot = next((bar['close'] for bar in reversed(bars) if bar['close']), None)
+    if spot is None:
+        raise ValueError(f'No underlying price for {symbol}; pass spot')
+    result = {'symbol': symbol, 'ticker_id': ticker_id, 'spot': spot, 'rate': rate, 'dividend_yield': dividend_yield,
+              **_chain_arrays(chains, spot, rate, dividend_yield), 'meta': {'failed': failed}}
+    option_chain_cache.set(key, result, _OPTION_CHAIN_TTL)
+    return result
+
+# How each list endpoint pages: 'number' is a 1-based page index, 'until'
+# follows meta/page/minmaxPublishOn/min of the previous page, and 'from_id'
+# is the id of the last top-level comment of the previous page.
+_PAGINATION = {
+    'v2_list': ('/analysis/v2/list', 'number'),
+    'analysis_list': ('/analysis/list', 'until'),
+    'articles_list': ('/articles/list', 'until'),
+    'v2_list_by_symbol': ('/news/v2/list-by-symbol', 'number'),
+    'news_list': ('/news/list', 'until'),
+    'press_releases_list': ('/press-releases/list', 'until'),
+    'transcripts_list': ('/transcripts/list', 'until'),
+    'comments_list': ('/comments/list', 'from_id'),
+    'symbols_get_quant_rating_histories': ('/symbols/get-quant-rating-histories', 'number'),
+}
+_MAX_PAGES = int(os.getenv('SA_MAX_PAGES', '50'))
+
+def _item_timestamp(item) -> Union[float, None]:
+    attributes = (item.get('attributes') or {}) if isinstance(item, dict) else {}
+    for field in ('publishOn', 'asDate', 'createdOn', 'date'):
+        value = attributes.get(field)
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                continue
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed.timestamp()
+    return None
+
+def _next_cursor(scheme: str, page: dict, cursor):
+    if scheme == 'number':
+        return (cursor or 1) + 1
+    if scheme == 'until':
+        try:
+            return page['meta']['page']['minmaxPublishOn']['min']
+        except (KeyError, TypeError):
+            return None
+    top_level = [item for item in page.get('data') or [] if (item.get('attributes') or {}).get('parentId') is None]
+    return top_level[-1].get('id') if top_level else None
+
+async def _iter_pages(url: str, params: dict, scheme: str, cursor=None, fresh: bool = False):
+    '''Yield successive pages of a list endpoint, fetching the next page while the current one is consumed.'''
+    async def fetch(cursor):
+        return await _get(url, {**params, scheme: cursor} if cursor is not None else params, fresh=fresh)
+
+    pending = asyncio.ensure_future(fetch(cursor))
+    try:
+        for _ in range(_MAX_PAGES):
+            page = await pending
+            pending = None
+            if not isinstance(page, dict) or not page.get('data'):
+                return
+            next_cursor = _next_cursor(scheme, page, cursor)
+            if next_cursor is not None and next_cursor != cursor:
+                pending = asyncio.ensure_future(fetch(next_cursor))
+            yield page
+            if pending is None:
+                return
+            cursor = next_cursor
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+async def _collect_pages(url: str, params: dict, scheme: str, max_items: int, since: Union[float, None] = None,
+                         until: Union[float, None] = None, fresh: bool = False) -> dict:
+    '''Gather up to max_items items newer than since (and not newer than until) across pages.'''
+    if max_items <= 0:
+        return {'data': [], 'included': [], 'meta': {'pages': 0, 'complete': False}}
+    items, included, seen_items, seen = [], [], set(), set()
+    pages = 0
+    complete = True
+    cursor = until if scheme == 'until' else None
+    async for page in _iter_pages(url, params, scheme, cursor, fresh):
+        pages += 1
+        crossed = False
+        for item in page['data']:
+            timestamp = _item_timestamp(item)
+            if until is not None and timestamp is not None and timestamp > until:
+                continue
+            if since is not None and timestamp is not None and timestamp < since:
+                crossed = True
+                continue
+            if (item.get('type'), item.get('id')) in seen_items:
+                continue
+            seen_items.add((item.get('type'), item.get('id')))
+            items.append(item)
+            if len(items) >= max_items:
+                break
+        for item in page.get('included') or []:
+            if (item.get('type'), item.get('id')) not in seen:
+                seen.add((item.get('type'), item.get('id')))
+                included.append(item)
+        if len(items) >= max_items:
+            complete = False
+            break
+        if crossed:
+            break
+    else:
+        complete = pages < _MAX_PAGES
+    return {'data': items, 'included': included, 'meta': {'pages': pages, 'complete': complete}}
+
+# Endpoints a universe snapshot draws from, by tool name, with the path and
+# the symbol parameter of each.
+_SNAPSHOT_ENDPOINTS = {
+    'symbols_get_meta_data': ('/symbols/get-meta-data', 'symbol'),
+    'symbols_get_summary': ('/symbols/get-summary', 'symbols'),
+    'symbols_get_profile': ('/symbols/get-profile', 'symbols'),
+    'symbols_get_metrics': ('/symbols/get-metrics', 'symbols'),
+    'symbols_get_valuation': ('/symbols/get-valuation', 'symbols'),
+    'v2_get_momentum': ('/symbols/v2/get-momentum', 'symbols'),
+    'symbols_get_factor_grades': ('/symbols/get-factor-grades', 'symbol'),
+}
+_SNAPSHOT_CONCURRENCY = int(os.getenv('SA_SNAPSHOT_CONCURRENCY', '8'))
+# Bulk calls wait behind interactive ones (priority 0) for rate limiter tokens.
+_BULK_PRIORITY = 10
+
+def _plan_snapshot(symbols: list, endpoints: tuple, fields: dict, fresh: bool = False) -> tuple:
+    '''Split a snapshot into cached per-symbol responses and the fewest upstream calls covering the rest.
+
+    Returns (cached, calls): cached maps (endpoint, symbol) to a response, and
+    calls lists (endpoint, url, params, symbols) with symbols chunked to the
+    batch limit of the endpoint.
+    '''
+    cached, calls = {}, []
+    for endpoint in endpoints:
+        path, param = _SNAPSHOT_ENDPOINTS[endpoint]
+        url = 'https://seeking-alpha.p.rapidapi.com' + path
+        rest = {'fields': fields[endpoint]} if fields.get(endpoint) else {}
+        limit = _BATCHED_ENDPOINTS[path][1] if path in _BATCHED_ENDPOINTS and path not in batcher.unsplittable else 1
+        missing = []
+        for symbol in symbols:
+            hit = None if fresh else response_cache.get(_cache_key(url, _normalize_params({**rest, param: symbol})))
+            if hit is not None:
+                cached[(endpoint, symbol)] = hit
+            else:
+                missing.append(symbol)
+        for i in range(0, len(missing), limit):
+            chunk = missing[i:i + limit]
+            calls.append((endpoint, url, {**rest, param: ','.join(chunk)}, chunk))
+    return cached, calls
+
+async def _fetch_snapshot_call(url: str, params: dict, symbols: list, fresh: bool = False) -> dict:
+    '''Run one planned snapshot call and return its response per symbol, caching each slice on its own.'''
+    if len(symbols) == 1:
+        return {symbols[0]: await _get(url, params, fresh=fresh)}
+    param = _BATCHED_ENDPOINTS[_endpoint(url)][0]
+    key = _cache_key(url, _normalize_params(params))
+    status, data = await _fetch(url, params)
+    await _store(url, params, key, _cache_ttl(url, params), status, data)
+    slices = _split_batch(data, symbols) if status < 400 else {}
+    if not any(piece is not None for piece in slices.values()):
+        if status < 400 and not slices:
+            # Only a successful body of a shape _split_batch does not know turns merging off for good;
+            # an error or a response that found none of the symbols just falls back this once.
+            batcher.unsplittable.add(_endpoint(url))
+        responses = await asyncio.gather(*(_get(url, {**params, param: symbol}, fresh=fresh) for symbol in symbols))
+        return dict(zip(symbols, responses))
+    for symbol, piece in slices.items():
+        if piece is not None:
+            single = {**params, param: symbol}
+            await _store(url, single, _cache_key(url, _normalize_params(single)), _cache_ttl(url, single), 200, piece)
+    return {symbol: slices.get(symbol) for symbol in symbols}
+
+# Grades come back as 1 (A+) to 13 (F).
+_GRADE_LETTERS = ('A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-', 'F')
+_FILTER_OPS = {'gte', 'lte', 'gt', 'lt', 'eq', 'in', 'exclude'}
+_SCREEN_KEYS = {'filter', 'sort', 'page', 'per_page', 'type'}
+
+def _metric_fields(data, value_key: str = 'value') -> dict:
+    '''Map metric field names to values in a get-metrics or get-metric-grades response of one symbol.'''
+    if not isinstance(data, dict) or not isinstance(data.get('data'), list):
+        return {}
+    included = {(item.get('type'), str(item.get('id'))): item.get('attributes') or {}
+                for item in data.get('included') or [] if isinstance(item, dict)}
+    values = {}
+    for item in data['data']:
+        attributes = item.get('attributes') or {}
+        related = ((item.get('relationships') or {}).get('metric_type') or {}).get('data') or {}
+        field = (included.get((related.get('type'), str(related.get('id')))) or {}).get('field') or attributes.get('field')
+        if field and value_key in attributes:
+            values[field] = attributes[value_key]
+    return values
+
+def _is_grade_filter(condition: dict) -> bool:
+    values = condition.get('in')
+    return isinstance(values, list) and bool(values) and all(v in _GRADE_LETTERS for v in values)
+
+class ScreenerTable:
+    '''Columnar table of metric values and grades for a universe of symbols.
+
+    Each (kind, field) column is a float array with NaN for missing values,
+    plus an object array of text values for fields that have any, and the
+    time each row was loaded so stale rows are refreshed in bulk.
+    '''
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self.symbols = []
+        self._rows = {}
+        self.columns = {}
+        self.labels = {}
+        self.updated = {}
+        self.lock = asyncio.Lock()
+        self.local = 0
+        self.upstream = 0
+        self.calls = 0
+
+    def _grow(self, symbols: list):
+        new = [s for s in dict.fromkeys(symbols) if s not in self._rows]
+        if not new:
+            return
+        for symbol in new:
+            self._rows[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        for arrays, fill in ((self.columns, np.nan), (self.updated, 0.0), (self.labels, None)):
+            for key, array in arrays.items():
+                arrays[key] = np.concatenate([array, np.full(len(new), fill, dtype=array.dtype)])
+
+    def _column(self, key: tuple):
+        if key not in self.columns:
+            self.columns[key] = np.full(len(self.symbols), np.nan)
+            self.updated[key] = np.zeros(len(self.symbols))
+        return self.columns[key]
+
+    def stale(self, key: tuple, symbols: list) -> list:
+        self._grow(symbols)
+        self._column(key)
+        cutoff = time.time() - self.max_age
+        return [s for s in symbols if self.updated[key][self._rows[s]] < cutoff]
+
+    def put(self, key: tuple, symbol: str, values: dict):
+        '''Store one symbol's response for the fields of key, marking the row loaded even when a value is missing.'''
+        kind, fields = key
+        row = self._rows[symbol]
+        for field in fields:
+            column = self._column((kind, field))
+            value = values.get(field)
+            number = _number(value)
+            column[row] = np.nan if number is None else number
+            if number is None and isinstance(value, str):
+                self.labels.setdefault((kind, field), np.full(len(self.symbols), None, dtype=object))[row] = value
+            self.updated[(kind, field)][row] = time.time()
+
+    def rows(self, symbols: list):
+        return np.fromiter((self._rows[s] for s in symbols), dtype=np.intp, count=len(symbols))
+
+    def loaded(self, key: tuple, rows) -> bool:
+        labels = self.labels.get(key)
+        return bool(np.isfinite(self.columns[key][rows]).any() or (labels is not None and any(v is not None for v in labels[rows])))
+
+    def mask(self, field: str, condition: dict, rows):
+        '''Boolean mask of rows passing one screener filter condition.'''
+        grade = _is_grade_filter(condition)
+        key = ('grades' if grade else 'metrics', field)
+        values = self.columns[key][rows]
+        mask = np.ones(len(rows), dtype=bool)
+        with np.errstate(invalid='ignore'):
+            for op, operand in condition.items():
+                if op in ('gte', 'lte', 'gt', 'lt', 'eq') and operand is not None:
+                    mask &= {'gte': np.greater_equal, 'lte': np.less_equal, 'gt': np.greater,
+                             'lt': np.less, 'eq': np.equal}[op](values, float(operand))
+                elif op == 'in' and grade:
+                    mask &= np.isin(values, [_GRADE_LETTERS.index(v) + 1 for v in operand])
+                elif op == 'in':
+                    labels = self.labels.get(key)
+                    numbers = [float(v) for v in operand if _number(v) is not None]
+                    found = np.isin(values, numbers)
+                    if labels is not None:
+                        found |= np.isin(labels[rows], [v for v in operand if isinstance(v, str)])
+                    mask &= found
+        return ~mask if condition.get('exclude') else mask
+
+    def value(self, key: tuple, row: int):
+        number = self.columns[key][row]
+        if key[0] == 'grades' and np.isfinite(number) and 1 <= number <= len(_GRADE_LETTERS):
+            return _GRADE_LETTERS[int(number) - 1]
+        labels = self.labels.get(key)
+        return labels[row] if labels is not None and labels[row] is not None else _json_float(number)
+
+    def stats(self) -> dict:
+        return {'symbols': len(self.symbols), 'columns': len(self.columns), 'local': self.local,
+                'upstream': self.upstream, 'calls': self.calls}
+
+screener_table = ScreenerTable(float(os.getenv('SA_SCREENER_MAX_AGE', '900')))
+
+async def load_screener_fields(symbols: list, metrics: list, grades: list, fresh: bool = False) -> list:
+    '''Refresh stale rows of metric and grade columns in bulk; returns the failed calls.
+
+    Metrics go through the batched snapshot plan, grades one symbol per call,
+    all behind interactive calls for rate limiter tokens.
+    '''
+    _require_numpy()
+    failures = []
+    semaphore = asyncio.Semaphore(_SNAPSHOT_CONCURRENCY)
+    metrics, grades = tuple(sorted(set(metrics))), tuple(sorted(set(grades)))
+
+    async def run_metrics(url, params, chunk):
+        async with semaphore:
+            try:
+                responses = await _fetch_snapshot_call(url, params, chunk, fresh)
+            except Exception as exc:
+                failures.append({'endpoint': 'symbols_get_metrics', 'symbols': chunk, 'error': str(exc) or type(exc).__name__})
+                return
+        screener_table.calls += 1
+        for symbol, response in responses.items():
+            screener_table.put(('metrics', metrics), symbol, _metric_fields(response))
+
+    async def run_grades(symbol):
+        async with semaphore:
+            try:
+                response = await _get('https://seeking-alpha.p.rapidapi.com/symbols/get-metric-grades',
+                                      {'symbol': symbol, 'fields': ','.join(grades), 'algos': 'main_quant'}, fresh=fresh)
+            except Exception as exc:
+                failures.append({'endpoint': 'symbols_get_metric_grades', 'symbols': [symbol], 'error': str(exc) or type(exc).__name__})
+                return
+        screener_table.calls += 1
+        screener_table.put(('grades', grades), symbol, _metric_fields(response, 'grade'))
+
+    token = request_priority.set(_BULK_PRIORITY)
+    try:
+        async with screener_table.lock:
+            stale = {field: screener_table.stale(('metrics', field), symbols) for field in metrics}
+            metrics = tuple(field for field in metrics if stale[field])
+            stale = sorted({s for field in metrics for s in stale[field]})
+            cached, calls = _plan_snapshot(stale, ('symbols_get_metrics',), {'symbols_get_metrics': ','.join(metrics)}, fresh)
+            for (_, symbol), response in cached.items():
+                screener_table.put(('metrics', metrics), symbol, _metric_fields(response))
+            stale = {field: screener_table.stale(('grades', field), symbols) for field in grades}
+            grades = tuple(field for field in grades if stale[field])
+            stale_grades = sorted({s for field in grades for s in stale[field]})
+            await asyncio.gather(*(run_metrics(url, params, chunk) for _, url, params, chunk in calls),
+                                 *(run_grades(symbol) for symbol in stale_grades))
+    finally:
+        request_priority.reset(token)
+    return failures
+
+def _filter_names(data) -> set:
+    '''Names of the filters in a screener-filters/list response.'''
+    names, stack = set(), [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            names.update(node[k] for k in ('id', 'field', 'name', 'key') if isinstance(node.get(k), str))
+            stack.extend(v for v in node.values() if isinstance(v, (dict, list)))
+    return names
+
+async def screen_locally(data: dict, symbols: Union[list, None] = None, fresh: bool = False) -> tuple:
+    '''Evaluate a screeners/get-results body over the local table.
+
+    Returns (result, None), or (None, reason) when the screen needs upstream.
+    '''
+    filters = data.get('filter') or {}
+    if set(data) - _SCREEN_KEYS:
+        return None, f'unsupported keys: {", ".join(sorted(set(data) - _SCREEN_KEYS))}'
+    if not isinstance(filters, dict) or any(not isinstance(c, dict) or set(c) - _FILTER_OPS for c in filters.values()):
+        return None, 'unsupported filter operators'
+    try:
+        vocabulary = _filter_names(await _get('https://seeking-alpha.p.rapidapi.com/screener-filters/list', {}))
+    except Exception:
+        vocabulary = set()
+    if vocabulary and set(filters) - vocabulary:
+        return None, f'unknown filters: {", ".join(sorted(set(filters) - vocabulary))}'
+    universe = list(dict.fromkeys(s.strip().lower() for s in symbols if s.strip())) if symbols else list(screener_table.symbols)
+    if not universe:
+        return None, 'no local universe'
+    sort = data.get('sort') or ('-quant_rating' if ('metrics', 'quant_rating') in screener_table.columns else None)
+    sort_field = sort.lstrip('-') if sort else None
+    metrics = [f for f, c in filters.items() if not _is_grade_filter(c)] + ([sort_field] if sort_field else [])
+    grades = [f for f, c in filters.items() if _is_grade_filter(c)]
+    failures = await load_screener_fields(universe, metrics, grades, fresh)
+    started = time.perf_counter()
+    rows = screener_table.rows(universe)
+    keys = [('grades' if _is_grade_filter(c) else 'metrics', f) for f, c in filters.items()] + ([('metrics', sort_field)] if sort_field else [])
+    missing = [field for kind, field in keys if not screener_table.loaded((kind, field), rows)]
+    if missing:
+        return None, f'no local values for: {", ".join(missing)}'
+    mask = np.ones(len(rows), dtype=bool)
+    for field, condition in filters.items():
+        mask &= screener_table.mask(field, condition, rows)
+    matched = rows[mask]
+    if sort_field:
+        values = screener_table.columns[('metrics', sort_field)][matched]
+        order = np.argsort(np.where(np.isnan(values), np.inf, -values if sort.startswith('-') else values), kind='stable')
+        matched = matched[order]
+    per_page = int(data.get('per_page') or 100)
+    page = max(int(data.get('page') or 1), 1)
+    window = matched[(page - 1) * per_page:page * per_page]
+    records = [{'symbol': screener_table.symbols[row], 'rank': (page - 1) * per_page + i + 1,
+                **{field: screener_table.value((kind, field), row) for kind, field in keys}}
+               for i, row in enumerate(window)]
+    screener_table.local += 1
+    return {'data': records, 'failures': failures,
+            'meta': {'source': 'local', 'count': int(len(matched)), 'universe': len(universe), 'page': page,
+                     'per_page': per_page, 'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)}}, None
+
+# feed: (path, symbol parameter, extra parameters, base poll interval in seconds, track updates of known items).
+# Trending news is market wide and polled once under the symbol ''.
+_WATCHLIST_FEEDS = {
+    'news': ('/news/v2/list-by-symbol', 'id', {'size': 40}, 300, False),
+    'press_releases': ('/press-releases/list', 'id', {'size': 40}, 600, False),
+    'earnings': ('/symbols/get-estimated-earning-announces', 'symbol', {}, 3600, True),
+    'trending': ('/news/list-trending', None, {}, 120, False),
+}
+_WATCHLIST_SCALE = float(os.getenv('SA_WATCHLIST_INTERVAL_SCALE', '1'))
+_WATCHLIST_BUFFER = int(os.getenv('SA_WATCHLIST_BUFFER', '5000'))
+_WATCHLIST_SEEN = 500
+try:
+    from zoneinfo import ZoneInfo
+    _MARKET_TZ = ZoneInfo('America/New_York')
+except Exception:
+    _MARKET_TZ = timezone(timedelta(hours=-5))
+
+def _market_factor(now: float) -> float:
+    '''Poll interval multiplier: 1 in regular US trading hours, 2 pre and post market, 6 overnight and on weekends.'''
+    local = datetime.fromtimestamp(now, _MARKET_TZ)
+    if local.weekday() >= 5:
+        return 6.0
+    minutes = local.hour * 60 + local.minute
+    if 9 * 60 + 30 <= minutes < 16 * 60:
+        return 1.0
+    return 2.0 if 4 * 60 <= minutes < 20 * 60 else 6.0
+
+def _feed_items(data, symbol: str) -> list:
+    '''The items of a feed response, each with an id; a body without a data list is one item keyed by symbol.'''
+    if isinstance(data, dict) and isinstance(data.get('data'), list):
+        return [item for item in data['data'] if isinstance(item, dict) and item.get('id') is not None]
+    return [{'id': symbol or 'feed', 'attributes': data}] if data else []
+
+class WatchlistFeed:
+    '''Change feed over watched (feed, symbol) sources.
+
+    Each source keeps its high-water mark (latest publish time) and recently
+    seen item ids, persisted so a restart does not replay or lose items. One
+    background task polls due sources on an adaptive schedule and appends new
+    items to a numbered event log that subscriptions read from their cursor,
+    and pushes them to subscribed sessions as MCP log notifications.
+    '''
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS watch_sources (feed TEXT, symbol TEXT, hwm REAL, seen TEXT, PRIMARY KEY (feed, symbol))')
+        self.sources = {}
+        self.subscriptions = {}
+        self.events = deque(maxlen=_WATCHLIST_BUFFER)
+        self.seq = 0
+        self.polls = 0
+        self.errors = 0
+        self._task = None
+        self._wakeup = asyncio.Event()
+
+    def _source(self, feed: str, symbol: str) -> dict:
+        key = (feed, symbol)
+        if key not in self.sources:
+            with self._lock:
+                row = self._db.execute('SELECT hwm, seen FROM watch_sources WHERE feed = ? AND symbol = ?', key).fetchone()
+            self.sources[key] = {
+                'hwm': row[0] if row else None,
+                'seen': OrderedDict(json.loads(row[1])) if row else None,
+                'interval': _WATCHLIST_FEEDS[feed][3] * _WATCHLIST_SCALE,
+                'next_poll': time.time() + random.uniform(0, 5),
+                'quiet': 0,
+                'subscribers': 0,
+                'next_earnings': None,
+                'error': None,
+            }
+        return self.sources[key]
+
+    def _save(self, key: tuple, source: dict):
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO watch_sources VALUES (?, ?, ?, ?)',
+                             (*key, source['hwm'], json.dumps(list(source['seen'].items()))))
+
+    def subscribe(self, symbols: list, feeds: list, session=None) -> str:
+        keys = {(feed, '' if _WATCHLIST_FEEDS[feed][1] is None else symbol) for feed in feeds for symbol in symbols or ['']}
+        subscription = base64.urlsafe_b64encode(os.urandom(9)).decode()
+        for key in keys:
+            self._source(*key)['subscribers'] += 1
+        self.subscriptions[subscription] = {'sources': keys, 'session': session, 'cursor': self.seq, 'created': time.time()}
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+        return subscription
+
+    def unsubscribe(self, subscription: str) -> bool:
+        entry = self.subscriptions.pop(subscription, None)
+        if entry is None:
+            return False
+        for key in entry['sources']:
+            self.sources[key]['subscribers'] -= 1
+        return True
+
+    def read(self, subscription: str, cursor: Union[int, None], size: int) -> dict:
+        entry = self.subscriptions.get(subscription)
+        if entry is None:
+            raise ValueError(f'Unknown subscription: {subscription}')
+        cursor = entry['cursor'] if cursor is None else cursor
+        gap = bool(self.events) and self.events[0]['seq'] > cursor + 1
+        events = [e for e in self.events if e['seq'] > cursor and (e['feed'], e['symbol']) in entry['sources']]
+        page = events[:size]
+        next_cursor = page[-1]['seq'] if len(events) > size else self.seq
+        entry['cursor'] = max(entry['cursor'], next_cursor)
+        due = min((self.sources[key]['next_poll'] for key in entry['sources']), default=time.time())
+        return {'events': page, 'cursor': next_cursor, 'more': len(events) > size, 'gap': gap,
+                'next_poll_in': round(max(due - time.time(), 0), 1)}
+
+    def _schedule(self, key: tuple, source: dict, found: bool, now: float):
+        feed, symbol = key
+        source['quiet'] = 0 if found else min(source['quiet'] + 1, 4)
+        factor = _market_factor(now) * 1.5 ** source['quiet']
+        earnings = self.sources.get(('earnings', symbol), {}).get('next_earnings')
+        if feed in ('news', 'press_releases') and earnings and abs((date.fromisoformat(earnings) - date.today()).days) <= 1:
+            factor *= 0.25
+        source['interval'] = _WATCHLIST_FEEDS[feed][3] * _WATCHLIST_SCALE * factor
+        source['next_poll'] = now + source['interval'] * random.uniform(0.9, 1.1)
+
+    async def _poll(self, key: tuple) -> list:
+        '''Fetch one source and return its new (and, for tracked feeds, changed) items as events.'''
+        feed, symbol = key
+        path, param, extra, _, track = _WATCHLIST_FEEDS[feed]
+        source = self.sources[key]
+        params = {**extra, **({param: symbol} if param else {})}
+        if feed == 'news' and source['hwm'] is not None:
+            params['since'] = int(source['hwm'])
+        data = await _get('https://seeking-alpha.p.rapidapi.com' + path, params, fresh=True)
+        self.polls += 1
+        baseline = source['seen'] is None
+        seen = source['seen'] if not baseline else OrderedDict()
+        events = []
+        for item in _feed_items(data, symbol):
+            item_id = str(item['id'])
+            fingerprint = zlib.crc32(_json_dumps(item.get('attributes')).encode()) if track else 0
+            if item_id in seen and seen[item_id] == fingerprint:
+                continue
+            if not baseline:
+                events.append({'feed': feed, 'symbol': symbol, 'change': 'updated' if item_id in seen else 'new', 'item': item})
+            seen[item_id] = fingerprint
+            seen.move_to_end(item_id)
+            timestamp = _item_timestamp(item)
+            if timestamp is not None and (source['hwm'] is None or timestamp > source['hwm']):
+                source['hwm'] = timestamp
+        while len(seen) > _WATCHLIST_SEEN:
+            seen.popitem(last=False)
+        source['seen'] = seen
+        if feed == 'earnings':
+            upcoming = [d for d in _iso_dates(data) if d >= date.today().isoformat()]
+            source['next_earnings'] = upcoming[0] if upcoming else None
+        if events or baseline:
+            await asyncio.to_thread(self._save, key, source)
+        return events
+
+    async def _notify(self, events: list):
+        for subscription, entry in list(self.subscriptions.items()):
+            session = entry['session']
+            mine = [e for e in events if (e['feed'], e['symbol']) in entry['sources']]
+            if session is None or not mine:
+                continue
+            try:
+                await session.send_log_message(level='info', logger='watchlist',
+                                               data={'subscription': subscription, 'cursor': mine[-1]['seq'], 'events': mine})
+                await session.send_resource_updated(AnyUrl(f'seeking-alpha://watchlist/{subscription}'))
+            except Exception:
+                entry['session'] = None
+
+    async def _run(self):
+        semaphore = asyncio.Semaphore(_SNAPSHOT_CONCURRENCY)
+
+        async def poll(key):
+            async with semaphore:
+                source = self.sources[key]
+                try:
+                    events = await self._poll(key)
+                    source['error'] = None
+                except Exception as exc:
+                    self.errors += 1
+                    source['error'] = str(exc) or type(exc).__name__
+                    events = []
+                self._schedule(key, source, bool(events), time.time())
+                return events
+
+        request_priority.set(_BULK_PRIORITY)
+        while self.subscriptions:
+            now = time.time()
+            due = [key for key, source in self.sources.items() if source['subscribers'] > 0 and source['next_poll'] <= now]
+            if due:
+                events = []
+                for found in await asyncio.gather(*(poll(key) for key in due)):
+                    for event in found:
+                        self.seq += 1
+                        event['seq'] = self.seq
+                        events.append(event)
+                self.events.extend(events)
+                await self._notify(events)
+            wake = min((s['next_poll'] for s in self.sources.values() if s['subscribers'] > 0), default=now + 60)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(wake - time.time(), 1.0))
+            except asyncio.TimeoutError:
+                pass
+
+    def status(self, subscription: str) -> dict:
+        entry = self.subscriptions.get(subscription)
+        if entry is None:
+            raise ValueError(f'Unknown subscription: {subscription}')
+        now = time.time()
+        return {'subscription': subscription, 'cursor': entry['cursor'], 'latest': self.seq, 'notify': entry['session'] is not None,
+                'sources': [{'feed': feed, 'symbol': symbol, 'hwm': self.sources[(feed, symbol)]['hwm'],
+                             'interval': round(self.sources[(feed, symbol)]['interval'], 1),
+                             'next_poll_in': round(max(self.sources[(feed, symbol)]['next_poll'] - now, 0), 1),
+                             'error': self.sources[(feed, symbol)]['error']} for feed, symbol in sorted(entry['sources'])]}
+
+    def stats(self) -> dict:
+        return {'subscriptions': len(self.subscriptions), 'sources': sum(1 for s in self.sources.values() if s['subscribers'] > 0),
+                'events': self.seq, 'polls': self.polls, 'errors': self.errors}
+
+if os.getenv('SA_WATCHLIST_DIR'):
+    os.makedirs(os.getenv('SA_WATCHLIST_DIR'), exist_ok=True)
+watchlist = WatchlistFeed(os.path.join(os.getenv('SA_WATCHLIST_DIR'), 'watchlist.sqlite3') if os.getenv('SA_WATCHLIST_DIR') else ':memory:')
+
+_THREAD_CONCURRENCY = int(os.getenv('SA_THREAD_CONCURRENCY', '8'))
+_CONTENT_BATCH = int(os.getenv('SA_COMMENT_CONTENT_BATCH', '20'))
+_REPLY_COUNT_KEYS = ('repliesCount', 'childrenCount', 'commentsCount', 'subCommentsCount')
+
+def _comment_node(item: dict, users: dict) -> dict:
+    attributes = item.get('attributes') or {}
+    user = ((item.get('relationships') or {}).get('user') or {}).get('data') or {}
+    author = users.get(str(user.get('id'))) or {}
+    return {
+        'id': str(item['id']),
+        'parent_id': str(attributes['parentId']) if attributes.get('parentId') is not None else None,
+        'author': author.get('nick') or author.get('name') or attributes.get('userNick'),
+        'created': attributes.get('createdOn'),
+        'likes': attributes.get('likesCount', attributes.get('likes')),
+        'content': attributes.get('content') or attributes.get('body'),
+        'reply_count': next((attributes[k] for k in _REPLY_COUNT_KEYS if isinstance(attributes.get(k), int)), None),
+    }
+
+def _comment_items(data) -> tuple:
+    '''(comment items, {user id: attributes}) of a comments response.'''
+    if not isinstance(data, dict):
+        return [], {}
+    users = {str(item.get('id')): item.get('attributes') or {} for item in data.get('included') or []
+             if isinstance(item, dict) and item.get('type') == 'user'}
+    return [item for item in data.get('data') or [] if isinstance(item, dict) and item.get('id') is not None], users
+
+async def load_comment_thread(id: int, max_depth: int = 10, max_comments: int = 1000, sort: Union[str, None] = None,
+                              format: str = 'text', fresh: bool = False) -> dict:
+    '''Walk a whole comment thread: pages of top-level comments, then sub-comments level by level and
+    contents in batches of ids, all with bounded concurrency, cut at max_depth and max_comments.
+    '''
+    base = 'https://seeking-alpha.p.rapidapi.com/comments/'
+    nodes, depth, failures = {}, {}, []
+    calls = {'list': 0, 'sub_comments': 0, 'contents': 0}
+    semaphore = asyncio.Semaphore(_THREAD_CONCURRENCY)
+
+    def add(data) -> list:
+        items, users = _comment_items(data)
+        added = []
+        for item in items:
+            node = _comment_node(item, users)
+            if node['id'] in nodes or len(nodes) >= max_comments:
+                continue
+            level = depth.get(node['parent_id'], 0) + 1
+            if level > max_depth:
+                continue
+            nodes[node['id']] = node
+            depth[node['id']] = level
+            added.append(node)
+        return added
+
+    async def call(kind: str, path: str, params: dict):
+        async with semaphore:
+            try:
+                data = await _get(base + path, params, fresh=fresh)
+            except Exception as exc:
+                failures.append({'endpoint': path, 'params': params, 'error': str(exc) or type(exc).__name__})
+                return None
+        calls[kind] += 1
+        return data
+
+    token = request_priority.set(_BULK_PRIORITY)
+    try:
+        params = {k: v for k, v in {'id': id, 'parent_count': 20, 'sort': sort}.items() if v is not None}
+        level = []
+        async for page in _iter_pages(base + 'list', params, 'from_id', fresh=fresh):
+            calls['list'] += 1
+            level += add(page)
+            if len(nodes) >= max_comments:
+                break
+        while level and len(nodes) < max_comments:
+            children = {}
+            for node in nodes.values():
+                if node['parent_id'] is not None:
+                    children[node['parent_id']] = children.get(node['parent_id'], 0) + 1
+            # Without a reply count every comment is asked for its replies.
+            parents = [node['id'] for node in level if depth[node['id']] < max_depth
+                       and (node['reply_count'] is None or node['reply_count'] > children.get(node['id'], 0))]
+            responses = await asyncio.gather(*(call('sub_comments', 'get-sub-comments', {k: v for k, v in {'id': parent, 'sort': sort}.items() if v is not None})
+                                               for parent in parents))
+            level = [node for data in responses for node in add(data)]
+        missing = [node['id'] for node in nodes.values() if node['content'] is None]
+        batches = [tuple(missing[i:i + _CONTENT_BATCH]) for i in range(0, len(missing), _CONTENT_BATCH)]
+        for data in await asyncio.gather(*(call('contents', 'get-contents', {'id': id, 'comment_ids': batch}) for batch in batches)):
+            for item in _comment_items(data)[0]:
+                attributes = item.get('attributes') or {}
+                node = nodes.get(str(item['id']))
+                if node is not None and node['content'] is None:
+                    node['content'] = attributes.get('content') or attributes.get('body')
+    finally:
+        request_priority.reset(token)
+    roots = []
+    for node in nodes.values():
+        if format == 'text' and isinstance(node['content'], str):
+            node['content'] = extract_text(node['content'])[0].strip()
+        parent = nodes.get(node['parent_id'])
+        (parent.setdefault('replies', []) if parent is not None else roots).append(node)
+        del node['parent_id'], node['reply_count']
+    return {'id': id, 'comments': roots, 'failures': failures,
+            'meta': {'comments': len(nodes), 'truncated': len(nodes) >= max_comments, 'calls': calls}}
 
 @mcp.tool()
-def v2_auto_complete(query: Annotated[str, Field(description='Any word or phrase that you are familiar with')],
-                     type: Annotated[Union[str, None], Field(description='One of the following : people|symbols|pages. Separated by comma for multiple options')] = None,
-                     size: Annotated[Union[int, float, None], Field(description='The number items per response (10 is maximum) Default: 5')] = None) -> dict: 
+async def v2_auto_complete(query: Annotated[str, Field(description='Any word or phrase that you are familiar with')],
+                           type: Annotated[Union[str, None], Field(description='One of the following : people|symbols|pages. Separated by comma for multiple options')] = None,
+                           size: Annotated[Union[int, float, None], Field(description='The number items per response (10 is maximum) Default: 5')] = None,
+                           fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get suggested symbols, authors, etc... by provided word or phrase'''
     url = 'https://seeking-alpha.p.rapidapi.com/v2/auto-complete'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'query': query,
         'type': type,
         'size': size,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    if not fresh:
+        local = v2_auto_complete_index.search(query, [t.strip() for t in type.split(',')] if type else ('symbols', 'people', 'pages'), int(size or 5))
+        if local is not None:
+            return local
+    data = await _get(url, payload, fresh=fresh)
+    v2_auto_complete_index.add(data)
+    return data
 
 @mcp.tool()
-def auto_complete(term: Annotated[str, Field(description='Any word or phrase that you are familiar with')]) -> dict: 
+async def auto_complete(term: Annotated[str, Field(description='Any word or phrase that you are familiar with')],
+                        fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get suggested symbols, authors, etc... by provided word or phrase'''
     url = 'https://seeking-alpha.p.rapidapi.com/auto-complete'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'term': term,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    if not fresh:
+        local = auto_complete_index.search(term, auto_complete_index.groups(), 5)
+        if local is not None:
+            return local
+    data = await _get(url, payload, fresh=fresh)
+    auto_complete_index.add(data)
+    return data
 
 @mcp.tool()
-def authors_get_details(slug: Annotated[str, Field(description='The value of people/slug json object returned in .../auto-complete endpoint')]) -> dict: 
+async def authors_get_details(slug: Annotated[str, Field(description='The value of people/slug json object returned in .../auto-complete endpoint')],
+                              select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                              compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                              fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get author details'''
     url = 'https://seeking-alpha.p.rapidapi.com/authors/get-details'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'slug': slug,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_meta_data(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')]) -> dict: 
+async def symbols_get_meta_data(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get meta data of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-meta-data'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_profile(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')]) -> dict: 
+async def symbols_get_profile(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                              select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                              compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                              fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get profile information of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-profile'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbols': symbols,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_summary(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')]) -> dict: 
+async def symbols_get_summary(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                              select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                              compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                              fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get summary information of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-summary'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbols': symbols,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_financials(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                           target_currency: Annotated[Union[str, None], Field(description='The currency code')] = None,
-                           period_type: Annotated[Union[str, None], Field(description='One of the following : annual|quarterly|ttm')] = None,
-                           statement_type: Annotated[Union[str, None], Field(description='One of the following : income-statement|balance-sheet|cash-flow-statement')] = None) -> dict: 
+async def symbols_get_financials(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                 target_currency: Annotated[Union[str, None], Field(description='The currency code')] = None,
+                                 period_type: Annotated[Union[str, None], Field(description='One of the following : annual|quarterly|ttm')] = None,
+                                 statement_type: Annotated[Union[str, None], Field(description='One of the following : income-statement|balance-sheet|cash-flow-statement')] = None,
+                                 select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                 compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                 fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get financials for specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-financials'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
         'target_currency': target_currency,
@@ -106,17 +3022,18 @@ def symbols_get_financials(symbol: Annotated[str, Field(description='Symbol to q
         'statement_type': statement_type,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_fundamentals(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                             limit: Annotated[Union[str, None], Field(description='')] = None,
-                             period_type: Annotated[Union[str, None], Field(description='One of the following : quarterly|annual')] = None,
-                             field: Annotated[Union[str, None], Field(description='One of the following : revenues|other_revenues_summary_subtotal|total_revenue|cost_revenue|gross_profit|selling_general_admin_expenses_total|rd_expenses|other_operating_exp_total|operating_income|interest_expense_total|interest_and_investment_income|net_interest_exp_standard|currency_exchange_gains_loss|other_non_operating_income|ebt_incl_unusual_items|income_tax_expense|earnings_from_cont_ops|net_income_to_company|net_income|ni_to_common_incl_extra_items|ni_to_common_excl_extra_items|revenue_per_share|eps|basic_eps_excl_extra_items|weighted_average_basic_shares_outstanding|diluted_eps|diluted_eps_excl_extra_itmes|weighted_average_diluted_shares_outstanding|normalized_basic_eps|normalized_diluted_eps|div_rate|payout_ratio|ebitda|ebita|ebit_op_in|ebitdar|effective_tax_rate|normalized_net_income|interest_on_long_term_debt|r_d_exp|foreign_sales')] = None) -> dict: 
+async def symbols_get_fundamentals(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                   limit: Annotated[Union[str, None], Field(description='')] = None,
+                                   period_type: Annotated[Union[str, None], Field(description='One of the following : quarterly|annual')] = None,
+                                   field: Annotated[Union[str, None], Field(description='One of the following : revenues|other_revenues_summary_subtotal|total_revenue|cost_revenue|gross_profit|selling_general_admin_expenses_total|rd_expenses|other_operating_exp_total|operating_income|interest_expense_total|interest_and_investment_income|net_interest_exp_standard|currency_exchange_gains_loss|other_non_operating_income|ebt_incl_unusual_items|income_tax_expense|earnings_from_cont_ops|net_income_to_company|net_income|ni_to_common_incl_extra_items|ni_to_common_excl_extra_items|revenue_per_share|eps|basic_eps_excl_extra_items|weighted_average_basic_shares_outstanding|diluted_eps|diluted_eps_excl_extra_itmes|weighted_average_diluted_shares_outstanding|normalized_basic_eps|normalized_diluted_eps|div_rate|payout_ratio|ebitda|ebita|ebit_op_in|ebitdar|effective_tax_rate|normalized_net_income|interest_on_long_term_debt|r_d_exp|foreign_sales')] = None,
+                                   select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                   compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                   fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get fundamentals for specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-fundamentals'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
         'limit': limit,
@@ -124,30 +3041,33 @@ def symbols_get_fundamentals(symbol: Annotated[str, Field(description='Symbol to
         'field': field,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_peers(symbol: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')]) -> dict: 
+async def symbols_get_peers(symbol: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                            select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                            compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                            fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get peers of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-peers'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_historical_prices(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                                  start: Annotated[str, Field(description='The date to get historical prices from. The format is yyyy-MM-dd . Ex : 2022-02-01')],
-                                  end: Annotated[str, Field(description='The date to get historical prices to. The format is yyyy-MM-dd . Ex : 2023-03-09')],
-                                  show_by: Annotated[Union[str, None], Field(description='One of the following : day|week|month')] = None,
-                                  sort: Annotated[Union[str, None], Field(description='')] = None) -> dict: 
+async def symbols_get_historical_prices(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                        start: Annotated[str, Field(description='The date to get historical prices from. The format is yyyy-MM-dd . Ex : 2022-02-01')],
+                                        end: Annotated[str, Field(description='The date to get historical prices to. The format is yyyy-MM-dd . Ex : 2023-03-09')],
+                                        show_by: Annotated[Union[str, None], Field(description='One of the following : day|week|month')] = None,
+                                        sort: Annotated[Union[str, None], Field(description='')] = None,
+                                        format: Annotated[Literal['json', 'columnar', 'npz'], Field(description='json : the upstream response as is | columnar : one array per field (timestamp in epoch seconds, open, high, low, close, volume...) | npz : base64 encoded compressed NumPy archive of the same arrays')] = 'json',
+                                        select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                        compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                        fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get historical prices'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-historical-prices'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
         'start': start,
@@ -156,141 +3076,151 @@ def symbols_get_historical_prices(symbol: Annotated[str, Field(description='Symb
         'sort': sort,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(_format_series(await _get(url, payload, fresh=fresh), format), select, compact)
 
 @mcp.tool()
-def symbols_get_dividend_history(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                                 years: Annotated[Union[str, None], Field(description='')] = None,
-                                 group_by: Annotated[Union[str, None], Field(description='One of the following : year|month')] = None) -> dict: 
+async def symbols_get_dividend_history(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                       years: Annotated[Union[str, None], Field(description='')] = None,
+                                       group_by: Annotated[Union[str, None], Field(description='One of the following : year|month')] = None,
+                                       select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                       compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                       fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get dividend history of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-dividend-history'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
         'years': years,
         'group_by': group_by,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_splits(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')]) -> dict: 
+async def symbols_get_splits(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                             select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                             compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                             fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get splits'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-splits'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def v2_get_momentum(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
-                    fields: Annotated[Union[str, None], Field(description='One of the following : movAvg10d|movAvg50d|movAvg100d|movAvg200d|pClose10d|pClose50d|pClose100d|pClose200d|pWeekVolShares|low52|high52|chgp5d|chgp1m|chgp3m|chgp6m|chgp9m|chgpYtd|chgp1y|chgp3y|chgt3y|chgp5y|chgt5y|chgp10y|chgt10y|chgt1m|chgtYtd|chgt1y Separated by comma for multiple options. Ex : chgp3m,chgp6m,chgp9m,chgp1y,low52,high52,movAvg10d')] = None) -> dict: 
+async def v2_get_momentum(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                          fields: Annotated[Union[str, None], Field(description='One of the following : movAvg10d|movAvg50d|movAvg100d|movAvg200d|pClose10d|pClose50d|pClose100d|pClose200d|pWeekVolShares|low52|high52|chgp5d|chgp1m|chgp3m|chgp6m|chgp9m|chgpYtd|chgp1y|chgp3y|chgt3y|chgp5y|chgt5y|chgp10y|chgt10y|chgt1m|chgtYtd|chgt1y Separated by comma for multiple options. Ex : chgp3m,chgp6m,chgp9m,chgp1y,low52,high52,movAvg10d')] = None,
+                          select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                          compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                          fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get momentum of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/v2/get-momentum'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbols': symbols,
         'fields': fields,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_valuation(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')]) -> dict: 
+async def symbols_get_valuation(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                                select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get valuation of specific symbols'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-valuation'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbols': symbols,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_metrics(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
-                        fields: Annotated[Union[str, None], Field(description='One of the following : altman_z_score|analysts_down_avg_5y|analysts_down_percent_avg_5y|analysts_up_avg_5y|analysts_up_percent_avg_5y|assets_turnover|authors_rating_pro|beta24|capex_change|capex_change_avg_5y|capex_to_sales|cash_from_operations_as_reported|cf_op_change_display|cf_op_change_display_avg_5y|coefficient_of_variation_90d|common_equity_10y|common_equity_3y|common_equity_5y|common_equity_yoy|degree_of_operating_leverage_ttm|diluted_eps_growth|diluted_eps_growth_avg_5y|dilutedEps10y|dilutedEps3y|dilutedEps5y|dilutedEpsGrowth|div_grow_rate10|div_grow_rate3|div_grow_rate5|div_growth_category|div_pay_date|div_rate_fwd|div_rate_ttm|div_yield_4y_avg_5y|div_yield_category_avg_5y|div_yield_fwd|div_yield_fwd_avg_5y|dividend_growth|dividend_lt_fwd_growth|dividend_per_share_change_dislpay|dividend_per_share_change_dislpay_avg_5y|dividend_yield|dividend_yield_avg_5y|dps_yoy|dps_yoy_avg_5y|earn_yield_gaap_fy1_avg_5y|earnings_yield_avg_5y|earningsGrowth|earningsGrowth10y|earningsGrowth3|earningsGrowth5y|ebit_change_display|ebit_change_display_avg_5y|ebit_margin|ebitda_10y|ebitda_3y|ebitda_5y|ebitda_change_display|ebitda_change_display_avg_5y|ebitda_margin|ebitda_yoy|ebitda_yoy_avg_5y|ebitdaYoy|eps_change_display|eps_change_display_avg_5y|eps_gaap_annual_growth_yoy|eps_gaap_annual_growth_yoy_avg_5y|eps_gaap_growth_3y_annual_fwd|eps_gaap_growth_3y_annual_fwd_avg_5y|eps_ltg|eps_ltg_avg_5y|eps_revisions_category|ev_12m_sales_ratio|ev_12m_sales_ratio_avg_5y|ev_ebit|ev_ebit_avg_5y|ev_ebit_fy1|ev_ebit_fy1_avg_5y|ev_ebitda|ev_ebitda_avg_5y|ev_ebitda_fy1|ev_ebitda_fy1_avg_5y|ev_sales_fy1|ev_sales_fy1_avg_5y|fcf_per_share_change_display|fcf_per_share_change_display_avg_5y|fcf_yield_avg_5y|fcf_yield_fy1_avg_5y|gross_loans_10y|gross_loans_3y|gross_loans_5y|gross_loans_yoy|gross_margin|growth_category|impliedmarketcap|last_div_date|last_price_vs_sma_10d|last_price_vs_sma_200d|last_price_vs_sma_50d|levered_fcf_margin|levered_free_cash_flow_yoy|levered_free_cash_flow_yoy_avg_5y|leveredFreeCashFlow10y|leveredFreeCashFlow3y|leveredFreeCashFlow5y|leveredFreeCashFlowYoy|log_of_unadjusted_stock_price|marketcap|marketcap_display|momentum_category|net_eps|net_inc_per_employee|net_income|net_interest_income_10y|net_interest_income_3y|net_interest_income_5y|net_interest_income_yoy|net_margin|netIncome10y|netIncome3y|netIncome5y|netIncomeYoy|normalizedNetIncome10y|normalizedNetIncome3y|normalizedNetIncome5y|normalizedNetIncomeYoy|op_cf_yoy|op_cf_yoy_avg_5y|oper_income_fy1_market_cap_avg_5y|oper_income_market_cap_avg_5y|operating_income_ebit_yoy|operating_income_ebit_yoy_avg_5y|operatingIncomeEbit10y|operatingIncomeEbit3y|operatingIncomeEbit5y|operatingIncomeEbitYoy|payout_ratio|pb_fy1_ratio|pb_fy1_ratio_avg_5y|pb_ratio|pb_ratio_avg_5y|pe_gaap_fy1|pe_gaap_fy1_avg_5y|pe_nongaap|pe_nongaap_avg_5y|pe_nongaap_fy1|pe_nongaap_fy1_avg_5y|pe_ratio|pe_ratio_avg_5y|peg_gaap|peg_gaap_avg_5y|peg_nongaap_fy1|peg_nongaap_fy1_avg_5y|price_cf_ratio|price_cf_ratio_avg_5y|price_cf_ratio_fy1|price_cf_ratio_fy1_avg_5y|price_high_52w|price_low_52w|profitability_category|ps_ratio|ps_ratio_avg_5y|ps_ratio_fy1|ps_ratio_fy1_avg_5y|quant_rating|return_on_avg_tot_assets|return_on_net_tangible_assets|return_on_total_capital|revenue_change_display|revenue_change_display_avg_5y|revenue_growth|revenue_growth_avg_5y|revenue_growth3|revenue_growth5|revenueGrowth10|roe|roe_change_display|roe_change_display_avg_5y|roe_yoy|roe_yoy_avg_5y|rtn_on_common_equity|sell_side_rating|shares|short_interest_percent_of_float|sma_10d|sma_200d|sma_50d|tangible_book_per_share|tangibleBookValue10y|tangibleBookValue3y|tangibleBookValue5y|tangibleBookValueYoy|tev|total_cash|total_debt|total_revenue|totalAssets10y|totalAssets3y|totalAssets5y|totalAssetsYoy|value_category|working_cap_change|working_cap_change_avg_5y|yld_on_cost_1y_avg_5y|yld_on_cost_3y_avg_5y|yld_on_cost_5y_avg_5y . Separated by comma for multiple options. Ex : quant_rating,authors_rating_pro,sell_side_rating,marketcap,dividend_yield,etc...')] = None) -> dict: 
+async def symbols_get_metrics(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                              fields: Annotated[Union[str, None], Field(description='One of the following : altman_z_score|analysts_down_avg_5y|analysts_down_percent_avg_5y|analysts_up_avg_5y|analysts_up_percent_avg_5y|assets_turnover|authors_rating_pro|beta24|capex_change|capex_change_avg_5y|capex_to_sales|cash_from_operations_as_reported|cf_op_change_display|cf_op_change_display_avg_5y|coefficient_of_variation_90d|common_equity_10y|common_equity_3y|common_equity_5y|common_equity_yoy|degree_of_operating_leverage_ttm|diluted_eps_growth|diluted_eps_growth_avg_5y|dilutedEps10y|dilutedEps3y|dilutedEps5y|dilutedEpsGrowth|div_grow_rate10|div_grow_rate3|div_grow_rate5|div_growth_category|div_pay_date|div_rate_fwd|div_rate_ttm|div_yield_4y_avg_5y|div_yield_category_avg_5y|div_yield_fwd|div_yield_fwd_avg_5y|dividend_growth|dividend_lt_fwd_growth|dividend_per_share_change_dislpay|dividend_per_share_change_dislpay_avg_5y|dividend_yield|dividend_yield_avg_5y|dps_yoy|dps_yoy_avg_5y|earn_yield_gaap_fy1_avg_5y|earnings_yield_avg_5y|earningsGrowth|earningsGrowth10y|earningsGrowth3|earningsGrowth5y|ebit_change_display|ebit_change_display_avg_5y|ebit_margin|ebitda_10y|ebitda_3y|ebitda_5y|ebitda_change_display|ebitda_change_display_avg_5y|ebitda_margin|ebitda_yoy|ebitda_yoy_avg_5y|ebitdaYoy|eps_change_display|eps_change_display_avg_5y|eps_gaap_annual_growth_yoy|eps_gaap_annual_growth_yoy_avg_5y|eps_gaap_growth_3y_annual_fwd|eps_gaap_growth_3y_annual_fwd_avg_5y|eps_ltg|eps_ltg_avg_5y|eps_revisions_category|ev_12m_sales_ratio|ev_12m_sales_ratio_avg_5y|ev_ebit|ev_ebit_avg_5y|ev_ebit_fy1|ev_ebit_fy1_avg_5y|ev_ebitda|ev_ebitda_avg_5y|ev_ebitda_fy1|ev_ebitda_fy1_avg_5y|ev_sales_fy1|ev_sales_fy1_avg_5y|fcf_per_share_change_display|fcf_per_share_change_display_avg_5y|fcf_yield_avg_5y|fcf_yield_fy1_avg_5y|gross_loans_10y|gross_loans_3y|gross_loans_5y|gross_loans_yoy|gross_margin|growth_category|impliedmarketcap|last_div_date|last_price_vs_sma_10d|last_price_vs_sma_200d|last_price_vs_sma_50d|levered_fcf_margin|levered_free_cash_flow_yoy|levered_free_cash_flow_yoy_avg_5y|leveredFreeCashFlow10y|leveredFreeCashFlow3y|leveredFreeCashFlow5y|leveredFreeCashFlowYoy|log_of_unadjusted_stock_price|marketcap|marketcap_display|momentum_category|net_eps|net_inc_per_employee|net_income|net_interest_income_10y|net_interest_income_3y|net_interest_income_5y|net_interest_income_yoy|net_margin|netIncome10y|netIncome3y|netIncome5y|netIncomeYoy|normalizedNetIncome10y|normalizedNetIncome3y|normalizedNetIncome5y|normalizedNetIncomeYoy|op_cf_yoy|op_cf_yoy_avg_5y|oper_income_fy1_market_cap_avg_5y|oper_income_market_cap_avg_5y|operating_income_ebit_yoy|operating_income_ebit_yoy_avg_5y|operatingIncomeEbit10y|operatingIncomeEbit3y|operatingIncomeEbit5y|operatingIncomeEbitYoy|payout_ratio|pb_fy1_ratio|pb_fy1_ratio_avg_5y|pb_ratio|pb_ratio_avg_5y|pe_gaap_fy1|pe_gaap_fy1_avg_5y|pe_nongaap|pe_nongaap_avg_5y|pe_nongaap_fy1|pe_nongaap_fy1_avg_5y|pe_ratio|pe_ratio_avg_5y|peg_gaap|peg_gaap_avg_5y|peg_nongaap_fy1|peg_nongaap_fy1_avg_5y|price_cf_ratio|price_cf_ratio_avg_5y|price_cf_ratio_fy1|price_cf_ratio_fy1_avg_5y|price_high_52w|price_low_52w|profitability_category|ps_ratio|ps_ratio_avg_5y|ps_ratio_fy1|ps_ratio_fy1_avg_5y|quant_rating|return_on_avg_tot_assets|return_on_net_tangible_assets|return_on_total_capital|revenue_change_display|revenue_change_display_avg_5y|revenue_growth|revenue_growth_avg_5y|revenue_growth3|revenue_growth5|revenueGrowth10|roe|roe_change_display|roe_change_display_avg_5y|roe_yoy|roe_yoy_avg_5y|rtn_on_common_equity|sell_side_rating|shares|short_interest_percent_of_float|sma_10d|sma_200d|sma_50d|tangible_book_per_share|tangibleBookValue10y|tangibleBookValue3y|tangibleBookValue5y|tangibleBookValueYoy|tev|total_cash|total_debt|total_revenue|totalAssets10y|totalAssets3y|totalAssets5y|totalAssetsYoy|value_category|working_cap_change|working_cap_change_avg_5y|yld_on_cost_1y_avg_5y|yld_on_cost_3y_avg_5y|yld_on_cost_5y_avg_5y . Separated by comma for multiple options. Ex : quant_rating,authors_rating_pro,sell_side_rating,marketcap,dividend_yield,etc...')] = None,
+                              select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                              compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                              fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get metrics of specific symbols'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-metrics'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbols': symbols,
         'fields': fields,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_option_expirations(symbol: Annotated[str, Field(description='Symbol to query for data.')]) -> dict: 
+async def symbols_get_option_expirations(symbol: Annotated[str, Field(description='Symbol to query for data.')],
+                                         select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                         compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                         fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get option expirations to use with .../symbols/get-options endpoint'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-option-expirations'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def v2_get_options(ticker_id: Annotated[str, Field(description='The value of ticker_id returned in .../symbols/get-option-expirations')],
-                   expiration_date: Annotated[Union[str, None], Field(description='The format is yyyy-MM-dd (2024-11-15), and the valid dates returned in .../symbols/get-option-expirations endpoint')] = None) -> dict: 
+async def v2_get_options(ticker_id: Annotated[str, Field(description='The value of ticker_id returned in .../symbols/get-option-expirations')],
+                         expiration_date: Annotated[Union[str, None], Field(description='The format is yyyy-MM-dd (2024-11-15), and the valid dates returned in .../symbols/get-option-expirations endpoint')] = None,
+                         select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                         compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                         fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get optional prices'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/v2/get-options'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'ticker_id': ticker_id,
         'expiration_date': expiration_date,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_metric_grades(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                              fields: Annotated[Union[str, None], Field(description='One of the following, separated by comma for multiple options : altman_z_score|analysts_down_avg_5y|analysts_down_percent_avg_5y|analysts_up_avg_5y|analysts_up_percent_avg_5y|assets_turnover|authors_rating_pro|beta24|capex_change|capex_change_avg_5y|capex_to_sales|cash_from_operations_as_reported|cf_op_change_display|cf_op_change_display_avg_5y|common_equity_10y|common_equity_3y|common_equity_5y|common_equity_yoy|diluted_eps_growth|diluted_eps_growth_avg_5y|dilutedEps10y|dilutedEps3y|dilutedEps5y|dilutedEpsGrowth|div_grow_rate3|div_grow_rate5|div_pay_date|div_rate_fwd|div_rate_ttm|div_yield_fwd|dividend_growth|dividend_per_share_change_dislpay|dividend_per_share_change_dislpay_avg_5y|dividend_yield|dps_yoy|dps_yoy_avg_5y|earningsGrowth|earningsGrowth10y|earningsGrowth3|earningsGrowth5y|ebit_change_display|ebit_change_display_avg_5y|ebit_margin|ebitda_10y|ebitda_3y|ebitda_5y|ebitda_change_display|ebitda_change_display_avg_5y|ebitda_margin|ebitda_yoy|ebitda_yoy_avg_5y|ebitdaYoy|eps_change_display|eps_change_display_avg_5y|eps_ltg|eps_ltg_avg_5y|eps_revisions_category|ev_12m_sales_ratio|ev_ebitda|fcf_per_share_change_display|fcf_per_share_change_display_avg_5y|gross_loans_10y|gross_loans_3y|gross_loans_5y|gross_loans_yoy|gross_margin|growth_category|impliedmarketcap|last_div_date|last_price_vs_sma_10d|last_price_vs_sma_200d|last_price_vs_sma_50d|levered_fcf_margin|levered_free_cash_flow_yoy|levered_free_cash_flow_yoy_avg_5y|leveredFreeCashFlow10y|leveredFreeCashFlow3y|leveredFreeCashFlow5y|leveredFreeCashFlowYoy|marketcap|marketcap_display|momentum_category|net_eps|net_inc_per_employee|net_income|net_interest_income_10y|net_interest_income_3y|net_interest_income_5y|net_interest_income_yoy|net_margin|netIncome10y|netIncome3y|netIncome5y|netIncomeYoy|normalizedNetIncome10y|normalizedNetIncome3y|normalizedNetIncome5y|normalizedNetIncomeYoy|op_cf_yoy|op_cf_yoy_avg_5y|operating_income_ebit_yoy|operating_income_ebit_yoy_avg_5y|operatingIncomeEbit10y|operatingIncomeEbit3y|operatingIncomeEbit5y|operatingIncomeEbitYoy|payout_ratio|pb_ratio|pe_nongaap_fy1|pe_ratio|price_cf_ratio|price_high_52w|price_low_52w|profitability_category|quant_rating|return_on_avg_tot_assets|return_on_total_capital|revenue_change_display|revenue_change_display_avg_5y|revenue_growth|revenue_growth_avg_5y|revenue_growth3|revenue_growth5|revenueGrowth10|roe|roe_change_display|roe_change_display_avg_5y|roe_yoy|roe_yoy_avg_5y|rtn_on_common_equity|sell_side_rating|shares|short_interest_percent_of_float|sma_10d|sma_200d|sma_50d|tangible_book_per_share|tangibleBookValue10y|tangibleBookValue3y|tangibleBookValue5y|tangibleBookValueYoy|tev|total_cash|total_debt|total_revenue|totalAssets10y|totalAssets3y|totalAssets5y|totalAssetsYoy|value_category|working_cap_change|working_cap_change_avg_5y')] = None,
-                              algos: Annotated[Union[str, None], Field(description='One of the following, separated by comma for multiple options : main_quant,dividends')] = None) -> dict: 
+async def symbols_get_metric_grades(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                    fields: Annotated[Union[str, None], Field(description='One of the following, separated by comma for multiple options : altman_z_score|analysts_down_avg_5y|analysts_down_percent_avg_5y|analysts_up_avg_5y|analysts_up_percent_avg_5y|assets_turnover|authors_rating_pro|beta24|capex_change|capex_change_avg_5y|capex_to_sales|cash_from_operations_as_reported|cf_op_change_display|cf_op_change_display_avg_5y|common_equity_10y|common_equity_3y|common_equity_5y|common_equity_yoy|diluted_eps_growth|diluted_eps_growth_avg_5y|dilutedEps10y|dilutedEps3y|dilutedEps5y|dilutedEpsGrowth|div_grow_rate3|div_grow_rate5|div_pay_date|div_rate_fwd|div_rate_ttm|div_yield_fwd|dividend_growth|dividend_per_share_change_dislpay|dividend_per_share_change_dislpay_avg_5y|dividend_yield|dps_yoy|dps_yoy_avg_5y|earningsGrowth|earningsGrowth10y|earningsGrowth3|earningsGrowth5y|ebit_change_display|ebit_change_display_avg_5y|ebit_margin|ebitda_10y|ebitda_3y|ebitda_5y|ebitda_change_display|ebitda_change_display_avg_5y|ebitda_margin|ebitda_yoy|ebitda_yoy_avg_5y|ebitdaYoy|eps_change_display|eps_change_display_avg_5y|eps_ltg|eps_ltg_avg_5y|eps_revisions_category|ev_12m_sales_ratio|ev_ebitda|fcf_per_share_change_display|fcf_per_share_change_display_avg_5y|gross_loans_10y|gross_loans_3y|gross_loans_5y|gross_loans_yoy|gross_margin|growth_category|impliedmarketcap|last_div_date|last_price_vs_sma_10d|last_price_vs_sma_200d|last_price_vs_sma_50d|levered_fcf_margin|levered_free_cash_flow_yoy|levered_free_cash_flow_yoy_avg_5y|leveredFreeCashFlow10y|leveredFreeCashFlow3y|leveredFreeCashFlow5y|leveredFreeCashFlowYoy|marketcap|marketcap_display|momentum_category|net_eps|net_inc_per_employee|net_income|net_interest_income_10y|net_interest_income_3y|net_interest_income_5y|net_interest_income_yoy|net_margin|netIncome10y|netIncome3y|netIncome5y|netIncomeYoy|normalizedNetIncome10y|normalizedNetIncome3y|normalizedNetIncome5y|normalizedNetIncomeYoy|op_cf_yoy|op_cf_yoy_avg_5y|operating_income_ebit_yoy|operating_income_ebit_yoy_avg_5y|operatingIncomeEbit10y|operatingIncomeEbit3y|operatingIncomeEbit5y|operatingIncomeEbitYoy|payout_ratio|pb_ratio|pe_nongaap_fy1|pe_ratio|price_cf_ratio|price_high_52w|price_low_52w|profitability_category|quant_rating|return_on_avg_tot_assets|return_on_total_capital|revenue_change_display|revenue_change_display_avg_5y|revenue_growth|revenue_growth_avg_5y|revenue_growth3|revenue_growth5|revenueGrowth10|roe|roe_change_display|roe_change_display_avg_5y|roe_yoy|roe_yoy_avg_5y|rtn_on_common_equity|sell_side_rating|shares|short_interest_percent_of_float|sma_10d|sma_200d|sma_50d|tangible_book_per_share|tangibleBookValue10y|tangibleBookValue3y|tangibleBookValue5y|tangibleBookValueYoy|tev|total_cash|total_debt|total_revenue|totalAssets10y|totalAssets3y|totalAssets5y|totalAssetsYoy|value_category|working_cap_change|working_cap_change_avg_5y')] = None,
+                                    algos: Annotated[Union[str, None], Field(description='One of the following, separated by comma for multiple options : main_quant,dividends')] = None,
+                                    select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                    compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                    fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get Profitability, Growth, etc... grade'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-metric-grades'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
         'fields': fields,
         'algos': algos,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_sector_metrics(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                               fields: Annotated[Union[str, None], Field(description='One of the following, separated by comma for multiple options : altman_z_score|analysts_down_avg_5y|analysts_down_percent_avg_5y|analysts_up_avg_5y|analysts_up_percent_avg_5y|assets_turnover|authors_rating_pro|beta24|capex_change|capex_change_avg_5y|capex_to_sales|cash_from_operations_as_reported|cf_op_change_display|cf_op_change_display_avg_5y|coefficient_of_variation_90d|common_equity_10y|common_equity_3y|common_equity_5y|common_equity_yoy|degree_of_operating_leverage_ttm|diluted_eps_growth|diluted_eps_growth_avg_5y|dilutedEps10y|dilutedEps3y|dilutedEps5y|dilutedEpsGrowth|div_grow_rate10|div_grow_rate3|div_grow_rate5|div_growth_category|div_pay_date|div_rate_fwd|div_rate_ttm|div_yield_4y_avg_5y|div_yield_category_avg_5y|div_yield_fwd|div_yield_fwd_avg_5y|dividend_growth|dividend_lt_fwd_growth|dividend_per_share_change_dislpay|dividend_per_share_change_dislpay_avg_5y|dividend_yield|dividend_yield_avg_5y|dps_yoy|dps_yoy_avg_5y|earn_yield_gaap_fy1_avg_5y|earnings_yield_avg_5y|earningsGrowth|earningsGrowth10y|earningsGrowth3|earningsGrowth5y|ebit_change_display|ebit_change_display_avg_5y|ebit_margin|ebitda_10y|ebitda_3y|ebitda_5y|ebitda_change_display|ebitda_change_display_avg_5y|ebitda_margin|ebitda_yoy|ebitda_yoy_avg_5y|ebitdaYoy|eps_change_display|eps_change_display_avg_5y|eps_gaap_annual_growth_yoy|eps_gaap_annual_growth_yoy_avg_5y|eps_gaap_growth_3y_annual_fwd|eps_gaap_growth_3y_annual_fwd_avg_5y|eps_ltg|eps_ltg_avg_5y|eps_revisions_category|ev_12m_sales_ratio|ev_12m_sales_ratio_avg_5y|ev_ebit|ev_ebit_avg_5y|ev_ebit_fy1|ev_ebit_fy1_avg_5y|ev_ebitda|ev_ebitda_avg_5y|ev_ebitda_fy1|ev_ebitda_fy1_avg_5y|ev_sales_fy1|ev_sales_fy1_avg_5y|fcf_per_share_change_display|fcf_per_share_change_display_avg_5y|fcf_yield_avg_5y|fcf_yield_fy1_avg_5y|gross_loans_10y|gross_loans_3y|gross_loans_5y|gross_loans_yoy|gross_margin|growth_category|impliedmarketcap|last_div_date|last_price_vs_sma_10d|last_price_vs_sma_200d|last_price_vs_sma_50d|levered_fcf_margin|levered_free_cash_flow_yoy|levered_free_cash_flow_yoy_avg_5y|leveredFreeCashFlow10y|leveredFreeCashFlow3y|leveredFreeCashFlow5y|leveredFreeCashFlowYoy|log_of_unadjusted_stock_price|marketcap|marketcap_display|momentum_category|net_eps|net_inc_per_employee|net_income|net_interest_income_10y|net_interest_income_3y|net_interest_income_5y|net_interest_income_yoy|net_margin|netIncome10y|netIncome3y|netIncome5y|netIncomeYoy|normalizedNetIncome10y|normalizedNetIncome3y|normalizedNetIncome5y|normalizedNetIncomeYoy|op_cf_yoy|op_cf_yoy_avg_5y|oper_income_fy1_market_cap_avg_5y|oper_income_market_cap_avg_5y|operating_income_ebit_yoy|operating_income_ebit_yoy_avg_5y|operatingIncomeEbit10y|operatingIncomeEbit3y|operatingIncomeEbit5y|operatingIncomeEbitYoy|payout_ratio|pb_fy1_ratio|pb_fy1_ratio_avg_5y|pb_ratio|pb_ratio_avg_5y|pe_gaap_fy1|pe_gaap_fy1_avg_5y|pe_nongaap|pe_nongaap_avg_5y|pe_nongaap_fy1|pe_nongaap_fy1_avg_5y|pe_ratio|pe_ratio_avg_5y|peg_gaap|peg_gaap_avg_5y|peg_nongaap_fy1|peg_nongaap_fy1_avg_5y|price_cf_ratio|price_cf_ratio_avg_5y|price_cf_ratio_fy1|price_cf_ratio_fy1_avg_5y|price_high_52w|price_low_52w|profitability_category|ps_ratio|ps_ratio_avg_5y|ps_ratio_fy1|ps_ratio_fy1_avg_5y|quant_rating|return_on_avg_tot_assets|return_on_net_tangible_assets|return_on_total_capital|revenue_change_display|revenue_change_display_avg_5y|revenue_growth|revenue_growth_avg_5y|revenue_growth3|revenue_growth5|revenueGrowth10|roe|roe_change_display|roe_change_display_avg_5y|roe_yoy|roe_yoy_avg_5y|rtn_on_common_equity|sell_side_rating|shares|short_interest_percent_of_float|sma_10d|sma_200d|sma_50d|tangible_book_per_share|tangibleBookValue10y|tangibleBookValue3y|tangibleBookValue5y|tangibleBookValueYoy|tev|total_cash|total_debt|total_revenue|totalAssets10y|totalAssets3y|totalAssets5y|totalAssetsYoy|value_category|working_cap_change|working_cap_change_avg_5y|yld_on_cost_1y_avg_5y|yld_on_cost_3y_avg_5y|yld_on_cost_5y_avg_5y Separated by comma for multiple options. Ex : quant_rating,authors_rating_pro,sell_side_rating,marketcap,dividend_yield,etc...')] = None) -> dict: 
+async def symbols_get_sector_metrics(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                     fields: Annotated[Union[str, None], Field(description='One of the following, separated by comma for multiple options : altman_z_score|analysts_down_avg_5y|analysts_down_percent_avg_5y|analysts_up_avg_5y|analysts_up_percent_avg_5y|assets_turnover|authors_rating_pro|beta24|capex_change|capex_change_avg_5y|capex_to_sales|cash_from_operations_as_reported|cf_op_change_display|cf_op_change_display_avg_5y|coefficient_of_variation_90d|common_equity_10y|common_equity_3y|common_equity_5y|common_equity_yoy|degree_of_operating_leverage_ttm|diluted_eps_growth|diluted_eps_growth_avg_5y|dilutedEps10y|dilutedEps3y|dilutedEps5y|dilutedEpsGrowth|div_grow_rate10|div_grow_rate3|div_grow_rate5|div_growth_category|div_pay_date|div_rate_fwd|div_rate_ttm|div_yield_4y_avg_5y|div_yield_category_avg_5y|div_yield_fwd|div_yield_fwd_avg_5y|dividend_growth|dividend_lt_fwd_growth|dividend_per_share_change_dislpay|dividend_per_share_change_dislpay_avg_5y|dividend_yield|dividend_yield_avg_5y|dps_yoy|dps_yoy_avg_5y|earn_yield_gaap_fy1_avg_5y|earnings_yield_avg_5y|earningsGrowth|earningsGrowth10y|earningsGrowth3|earningsGrowth5y|ebit_change_display|ebit_change_display_avg_5y|ebit_margin|ebitda_10y|ebitda_3y|ebitda_5y|ebitda_change_display|ebitda_change_display_avg_5y|ebitda_margin|ebitda_yoy|ebitda_yoy_avg_5y|ebitdaYoy|eps_change_display|eps_change_display_avg_5y|eps_gaap_annual_growth_yoy|eps_gaap_annual_growth_yoy_avg_5y|eps_gaap_growth_3y_annual_fwd|eps_gaap_growth_3y_annual_fwd_avg_5y|eps_ltg|eps_ltg_avg_5y|eps_revisions_category|ev_12m_sales_ratio|ev_12m_sales_ratio_avg_5y|ev_ebit|ev_ebit_avg_5y|ev_ebit_fy1|ev_ebit_fy1_avg_5y|ev_ebitda|ev_ebitda_avg_5y|ev_ebitda_fy1|ev_ebitda_fy1_avg_5y|ev_sales_fy1|ev_sales_fy1_avg_5y|fcf_per_share_change_display|fcf_per_share_change_display_avg_5y|fcf_yield_avg_5y|fcf_yield_fy1_avg_5y|gross_loans_10y|gross_loans_3y|gross_loans_5y|gross_loans_yoy|gross_margin|growth_category|impliedmarketcap|last_div_date|last_price_vs_sma_10d|last_price_vs_sma_200d|last_price_vs_sma_50d|levered_fcf_margin|levered_free_cash_flow_yoy|levered_free_cash_flow_yoy_avg_5y|leveredFreeCashFlow10y|leveredFreeCashFlow3y|leveredFreeCashFlow5y|leveredFreeCashFlowYoy|log_of_unadjusted_stock_price|marketcap|marketcap_display|momentum_category|net_eps|net_inc_per_employee|net_income|net_interest_income_10y|net_interest_income_3y|net_interest_income_5y|net_interest_income_yoy|net_margin|netIncome10y|netIncome3y|netIncome5y|netIncomeYoy|normalizedNetIncome10y|normalizedNetIncome3y|normalizedNetIncome5y|normalizedNetIncomeYoy|op_cf_yoy|op_cf_yoy_avg_5y|oper_income_fy1_market_cap_avg_5y|oper_income_market_cap_avg_5y|operating_income_ebit_yoy|operating_income_ebit_yoy_avg_5y|operatingIncomeEbit10y|operatingIncomeEbit3y|operatingIncomeEbit5y|operatingIncomeEbitYoy|payout_ratio|pb_fy1_ratio|pb_fy1_ratio_avg_5y|pb_ratio|pb_ratio_avg_5y|pe_gaap_fy1|pe_gaap_fy1_avg_5y|pe_nongaap|pe_nongaap_avg_5y|pe_nongaap_fy1|pe_nongaap_fy1_avg_5y|pe_ratio|pe_ratio_avg_5y|peg_gaap|peg_gaap_avg_5y|peg_nongaap_fy1|peg_nongaap_fy1_avg_5y|price_cf_ratio|price_cf_ratio_avg_5y|price_cf_ratio_fy1|price_cf_ratio_fy1_avg_5y|price_high_52w|price_low_52w|profitability_category|ps_ratio|ps_ratio_avg_5y|ps_ratio_fy1|ps_ratio_fy1_avg_5y|quant_rating|return_on_avg_tot_assets|return_on_net_tangible_assets|return_on_total_capital|revenue_change_display|revenue_change_display_avg_5y|revenue_growth|revenue_growth_avg_5y|revenue_growth3|revenue_growth5|revenueGrowth10|roe|roe_change_display|roe_change_display_avg_5y|roe_yoy|roe_yoy_avg_5y|rtn_on_common_equity|sell_side_rating|shares|short_interest_percent_of_float|sma_10d|sma_200d|sma_50d|tangible_book_per_share|tangibleBookValue10y|tangibleBookValue3y|tangibleBookValue5y|tangibleBookValueYoy|tev|total_cash|total_debt|total_revenue|totalAssets10y|totalAssets3y|totalAssets5y|totalAssetsYoy|value_category|working_cap_change|working_cap_change_avg_5y|yld_on_cost_1y_avg_5y|yld_on_cost_3y_avg_5y|yld_on_cost_5y_avg_5y Separated by comma for multiple options. Ex : quant_rating,authors_rating_pro,sell_side_rating,marketcap,dividend_yield,etc...')] = None,
+                                     select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                     compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                     fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get Profitability, Growth, etc... metrics'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-sector-metrics'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
         'fields': fields,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_sec_filings(symbol: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
-                            filing_category: Annotated[Union[str, None], Field(description='One of the followings : all|financials|news|proxies|tenders|ownership|other')] = None,
-                            number: Annotated[Union[int, float, None], Field(description='The page index for paging purpose Default: 1')] = None,
-                            size: Annotated[Union[int, float, None], Field(description='The number of items per response for paging purpose Default: 20')] = None) -> dict: 
+async def symbols_get_sec_filings(symbol: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                                  filing_category: Annotated[Union[str, None], Field(description='One of the followings : all|financials|news|proxies|tenders|ownership|other')] = None,
+                                  number: Annotated[Union[int, float, None], Field(description='The page index for paging purpose Default: 1')] = None,
+                                  size: Annotated[Union[int, float, None], Field(description='The number of items per response for paging purpose Default: 20')] = None,
+                                  select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                  compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                  fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get sec filings of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-sec-filings'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
         'filing_category': filing_category,
@@ -298,31 +3228,35 @@ def symbols_get_sec_filings(symbol: Annotated[str, Field(description='Symbol to
         'size': size,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_chart(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                      period: Annotated[Union[str, None], Field(description='One of the following : 1D|5D|1M|6M|YTD|1Y|3Y|5Y|10Y|MAX')] = None) -> dict: 
+async def symbols_get_chart(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                            period: Annotated[Union[str, None], Field(description='One of the following : 1D|5D|1M|6M|YTD|1Y|3Y|5Y|10Y|MAX')] = None,
+                            format: Annotated[Literal['json', 'columnar', 'npz'], Field(description='json : the upstream response as is | columnar : one array per field (timestamp in epoch seconds, open, high, low, close, volume...) | npz : base64 encoded compressed NumPy archive of the same arrays')] = 'json',
+                            select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                            compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                            fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get data to draw chart for specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-chart'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
         'period': period,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(_format_series(await _get(url, payload, fresh=fresh), format), select, compact)
 
 @mcp.tool()
-def v2_get_chart(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
-                 start: Annotated[Union[str, datetime], Field(description='Starting date to query for data, the format is yyyy-MM-dd')],
-                 end: Annotated[Union[str, datetime], Field(description='Ending date to query for data, the format is yyyy-MM-dd')],
-                 metrics: Annotated[Union[str, None], Field(description='One of the following : total_revenue|ebitda_yoy|net_income|diluted_eps_growth|pe_ratio|pb_ratio|price_cf_ratio|ps_ratio|price_tang_book|ev_ebit|ev_12m_sales_ratio|enterprise_value|ev_ebitda|market_cap|gross_margin|net_margin|operating_income_ebit_yoy|normalized_net_income|tangible_book|total_assets|levered_free_cash_flow_yoy|diluted_weighted_average_shares_outstanding|ebit_margin|normalized_net_income_margin|ebitda_margin|levered_fcf_margin|return_on_equity|return_on_avg_tot_assets|return_on_total_capital|assets_turnover|net_interest_income|gross_loans|total_common_equity|sga_margin|ebt_margin|net_interest_income_per_total_revenue')] = None) -> dict: 
+async def v2_get_chart(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                       start: Annotated[Union[str, datetime], Field(description='Starting date to query for data, the format is yyyy-MM-dd')],
+                       end: Annotated[Union[str, datetime], Field(description='Ending date to query for data, the format is yyyy-MM-dd')],
+                       metrics: Annotated[Union[str, None], Field(description='One of the following : total_revenue|ebitda_yoy|net_income|diluted_eps_growth|pe_ratio|pb_ratio|price_cf_ratio|ps_ratio|price_tang_book|ev_ebit|ev_12m_sales_ratio|enterprise_value|ev_ebitda|market_cap|gross_margin|net_margin|operating_income_ebit_yoy|normalized_net_income|tangible_book|total_assets|levered_free_cash_flow_yoy|diluted_weighted_average_shares_outstanding|ebit_margin|normalized_net_income_margin|ebitda_margin|levered_fcf_margin|return_on_equity|return_on_avg_tot_assets|return_on_total_capital|assets_turnover|net_interest_income|gross_loans|total_common_equity|sga_margin|ebt_margin|net_interest_income_per_total_revenue')] = None,
+                       format: Annotated[Literal['json', 'columnar', 'npz'], Field(description='json : the upstream response as is | columnar : one array per field (timestamp in epoch seconds, open, high, low, close, volume...) | npz : base64 encoded compressed NumPy archive of the same arrays')] = 'json',
+                       select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                       compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                       fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''This endpoint reproduces public data and features in Charting tab.'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/v2/get-chart'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbols': symbols,
         'start': start,
@@ -330,60 +3264,64 @@ def v2_get_chart(symbols: Annotated[str, Field(description='Symbol to query for
         'metrics': metrics,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(_format_series(await _get(url, payload, fresh=fresh), format), select, compact)
 
 @mcp.tool()
-def symbols_get_estimates(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                          data_type: Annotated[Union[str, None], Field(description='One of the following : eps|revenues')] = None,
-                          period_type: Annotated[Union[str, None], Field(description='One of the following : quarterly|annual')] = None) -> dict: 
+async def symbols_get_estimates(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                data_type: Annotated[Union[str, None], Field(description='One of the following : eps|revenues')] = None,
+                                period_type: Annotated[Union[str, None], Field(description='One of the following : quarterly|annual')] = None,
+                                select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get estimated EPS/revenue of specific symbol by annual or quarterly'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-estimates'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
         'data_type': data_type,
         'period_type': period_type,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_holdings(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')]) -> dict: 
+async def symbols_get_holdings(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                               select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                               compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                               fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get information in Holdings tab of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-holdings'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbols': symbols,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_estimated_earning_announces(symbol: Annotated[str, Field(description='Symbol to query for data. Ex : AAPL')]) -> dict: 
+async def symbols_get_estimated_earning_announces(symbol: Annotated[str, Field(description='Symbol to query for data. Ex : AAPL')],
+                                                  select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                                  compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                                  fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get estimated earning announces of a symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-estimated-earning-announces'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_earnings(ticker_ids: Annotated[str, Field(description='The value of id fields returned in .../symbols/get-meta-data endpoint. Separating by comma to query multiple tickers at once, ex : 1742,146')],
-                         period_type: Annotated[Union[str, None], Field(description='One of the followings : quarterly|annual')] = None,
-                         relative_periods: Annotated[Union[str, None], Field(description='Valid range -23,...,-2,-1,0,1,2,..,23')] = None,
-                         estimates_data_items: Annotated[Union[str, None], Field(description='One of the followings : eps_gaap_actual,eps_gaap_consensus_mean,eps_normalized_actual,eps_normalized_consensus_mean,revenue_actual,revenue_consensus_mean,eps_primary,revenue_consensus_low,revenue_consensus_high,revenue_num_of_estimates . Separated by comma for multiple options')] = None,
-                         revisions_data_items: Annotated[Union[str, None], Field(description='One of the followings : eps_normalized_actual,eps_normalized_consensus_mean,revenue_consensus_mean . Separated by comma for multiple options')] = None,
-                         group_by_month: Annotated[Union[bool, None], Field(description='true|false')] = None,
-                         return_window: Annotated[Union[int, float, None], Field(description='Default: 0')] = None) -> dict: 
+async def symbols_get_earnings(ticker_ids: Annotated[str, Field(description='The value of id fields returned in .../symbols/get-meta-data endpoint. Separating by comma to query multiple tickers at once, ex : 1742,146')],
+                               period_type: Annotated[Union[str, None], Field(description='One of the followings : quarterly|annual')] = None,
+                               relative_periods: Annotated[Union[str, None], Field(description='Valid range -23,...,-2,-1,0,1,2,..,23')] = None,
+                               estimates_data_items: Annotated[Union[str, None], Field(description='One of the followings : eps_gaap_actual,eps_gaap_consensus_mean,eps_normalized_actual,eps_normalized_consensus_mean,revenue_actual,revenue_consensus_mean,eps_primary,revenue_consensus_low,revenue_consensus_high,revenue_num_of_estimates . Separated by comma for multiple options')] = None,
+                               revisions_data_items: Annotated[Union[str, None], Field(description='One of the followings : eps_normalized_actual,eps_normalized_consensus_mean,revenue_consensus_mean . Separated by comma for multiple options')] = None,
+                               group_by_month: Annotated[Union[bool, None], Field(description='true|false')] = None,
+                               return_window: Annotated[Union[int, float, None], Field(description='Default: 0')] = None,
+                               select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                               compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                               fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get information in Earnings tab of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-earnings'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'ticker_ids': ticker_ids,
         'period_type': period_type,
@@ -394,135 +3332,145 @@ def symbols_get_earnings(ticker_ids: Annotated[str, Field(description='The value
         'return_window': return_window,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_analyst_price_target(ticker_ids: Annotated[str, Field(description='The value of id field returned in .../symbols/get-meta-data')],
-                                     return_window: Annotated[Union[int, float, None], Field(description='The return window Default: 1')] = None,
-                                     group_by_month: Annotated[Union[bool, None], Field(description='Whether or not the data is grouped by month')] = None) -> dict: 
+async def symbols_get_analyst_price_target(ticker_ids: Annotated[str, Field(description='The value of id field returned in .../symbols/get-meta-data')],
+                                           return_window: Annotated[Union[int, float, None], Field(description='The return window Default: 1')] = None,
+                                           group_by_month: Annotated[Union[bool, None], Field(description='Whether or not the data is grouped by month')] = None,
+                                           select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                           compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                           fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get Wall Street analyst price target for specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-analyst-price-target'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'ticker_ids': ticker_ids,
         'return_window': return_window,
         'group_by_month': group_by_month,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_analyst_recommendations(ticker_ids: Annotated[str, Field(description='The value of id field returned in .../symbols/get-meta-data')],
-                                        return_window: Annotated[Union[int, float, None], Field(description='The return window Default: 3')] = None,
-                                        group_by_month: Annotated[Union[bool, None], Field(description='Whether or not the data is grouped by month')] = None) -> dict: 
+async def symbols_get_analyst_recommendations(ticker_ids: Annotated[str, Field(description='The value of id field returned in .../symbols/get-meta-data')],
+                                              return_window: Annotated[Union[int, float, None], Field(description='The return window Default: 3')] = None,
+                                              group_by_month: Annotated[Union[bool, None], Field(description='Whether or not the data is grouped by month')] = None,
+                                              select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                              compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                              fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get Wall Street analyst recommendations for specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-analyst-recommendations'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'ticker_ids': ticker_ids,
         'return_window': return_window,
         'group_by_month': group_by_month,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_key_data(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')]) -> dict: 
+async def symbols_get_key_data(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                               select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                               compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                               fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get key data of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-key-data'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_quant_rating_histories(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                                       number: Annotated[Union[int, float, None], Field(description='For paging purpose Default: 1')] = None) -> dict: 
+async def symbols_get_quant_rating_histories(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                             number: Annotated[Union[int, float, None], Field(description='For paging purpose Default: 1')] = None,
+                                             select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                             compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                             fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get quant rating histories for specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-quant-rating-histories'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
         'number': number,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_analyst_ratings(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')]) -> dict: 
+async def symbols_get_analyst_ratings(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                      select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                      compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                      fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get Wall Street analyst ratings for specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-analyst-ratings'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_factor_grades(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')]) -> dict: 
+async def symbols_get_factor_grades(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                    select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                    compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                    fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get factor grades for specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-factor-grades'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_top_holdings(symbol: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')]) -> dict: 
+async def symbols_get_top_holdings(symbol: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                                   select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                   compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                   fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get top holdings of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-top-holdings'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_momentum(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')]) -> dict: 
+async def symbols_get_momentum(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                               select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                               compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                               fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get momentum of specific symbol * This endpoint is deprecated, you need to use .../symbols/v2/get-momentum endpoint instead.'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-momentum'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbols': symbols,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_ratings(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')]) -> dict: 
+async def symbols_get_ratings(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                              select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                              compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                              fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get ratings data for specific symbol * This endpoint is replaced by .../symbols/get-factor-grades and .../symbols/get-quant-rating-histories'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-ratings'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'symbol': symbol,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def symbols_get_options(Identifier: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                        Month: Annotated[Union[int, float], Field(description='Default: 3')],
-                        Year: Annotated[Union[int, float], Field(description='Default: 2023')],
-                        IdentifierType: Annotated[Union[str, None], Field(description='')] = None) -> dict: 
+async def symbols_get_options(Identifier: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                              Month: Annotated[Union[int, float], Field(description='Default: 3')],
+                              Year: Annotated[Union[int, float], Field(description='Default: 2023')],
+                              IdentifierType: Annotated[Union[str, None], Field(description='')] = None,
+                              select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                              compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                              fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get optional prices'''
     url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-options'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'Identifier': Identifier,
         'Month': Month,
@@ -530,18 +3478,19 @@ def symbols_get_options(Identifier: Annotated[str, Field(description='Symbol to
         'IdentifierType': IdentifierType,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def v2_list(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-            until: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'since' parameter to filter data by date range Default: 0")] = None,
-            since: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'until' parameter to filter data by date range Default: 0")] = None,
-            size: Annotated[Union[int, float, None], Field(description='The number of items per response (max 40) Default: 20')] = None,
-            number: Annotated[Union[int, float, None], Field(description='Page index for paging purpose Default: 1')] = None) -> dict: 
+async def v2_list(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                  until: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'since' parameter to filter data by date range Default: 0")] = None,
+                  since: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'until' parameter to filter data by date range Default: 0")] = None,
+                  size: Annotated[Union[int, float, None], Field(description='The number of items per response (max 40) Default: 20')] = None,
+                  number: Annotated[Union[int, float, None], Field(description='Page index for paging purpose Default: 1')] = None,
+                  select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                  compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                  fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''List analysis of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/analysis/v2/list'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
         'until': until,
@@ -550,125 +3499,136 @@ def v2_list(id: Annotated[str, Field(description='Symbol to query for data, only
         'number': number,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def v2_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../analysis/list endpoint Default: 4341786')]) -> dict: 
+async def v2_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../analysis/list endpoint Default: 4341786')],
+                         select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                         compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                         fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get analysis detail by id'''
     url = 'https://seeking-alpha.p.rapidapi.com/analysis/v2/get-details'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def analysis_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../analysis/list endpoint Default: 4341786')]) -> dict: 
+async def analysis_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../analysis/list endpoint Default: 4341786')],
+                               select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                               compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                               fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get analysis detail by id * This endpoint is deprecating. Use .../analysis/v2/get-details instead'''
     url = 'https://seeking-alpha.p.rapidapi.com/analysis/get-details'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def analysis_list(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                  until: Annotated[Union[int, float, None], Field(description='The value of meta/page/minmaxPublishOn/min json object returned right in this endpoint to load next page Default: 0')] = None,
-                  size: Annotated[Union[int, float, None], Field(description='The number of items per response Default: 20')] = None) -> dict: 
+async def analysis_list(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                        until: Annotated[Union[int, float, None], Field(description='The value of meta/page/minmaxPublishOn/min json object returned right in this endpoint to load next page Default: 0')] = None,
+                        size: Annotated[Union[int, float, None], Field(description='The number of items per response Default: 20')] = None,
+                        select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                        compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                        fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''List analysis of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/analysis/list'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
         'until': until,
         'size': size,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def v2_list_trending(until: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'since' parameter to filter data by date range Default: 0")] = None,
-                     since: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'until' parameter to filter data by date range Default: 0")] = None,
-                     size: Annotated[Union[int, float, None], Field(description='The number of items per response (max 40) Default: 20')] = None) -> dict: 
+async def v2_list_trending(until: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'since' parameter to filter data by date range Default: 0")] = None,
+                           since: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'until' parameter to filter data by date range Default: 0")] = None,
+                           size: Annotated[Union[int, float, None], Field(description='The number of items per response (max 40) Default: 20')] = None,
+                           select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                           compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                           fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''List trending articles'''
     url = 'https://seeking-alpha.p.rapidapi.com/articles/v2/list-trending'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'until': until,
         'since': since,
         'size': size,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def articles_list_wall_street_breakfast() -> dict: 
+async def articles_list_wall_street_breakfast(fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False,
+                                              select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                              compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none') -> dict: 
     '''List articles by category'''
     url = 'https://seeking-alpha.p.rapidapi.com/articles/list-wall-street-breakfast'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def articles_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../articles/list or .../articles/list-trending or .../articles/list-wall-street-breakfast endpoints Default: 4349447')]) -> dict: 
+async def articles_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../articles/list or .../articles/list-trending or .../articles/list-wall-street-breakfast endpoints Default: 4349447')],
+                               format: Annotated[Literal['html', 'text'], Field(description='html : the upstream response as is | text : plain text of the content, one paragraph per line, sliced by section, offset and length')] = 'html',
+                               section: Annotated[Literal['all', 'prepared_remarks', 'qa'], Field(description='Part of a transcript to return in text format : all | prepared_remarks : before the Question-and-Answer Session | qa : from it on')] = 'all',
+                               offset: Annotated[int, Field(description='First character of the text to return in text format Default: 0')] = 0,
+                               length: Annotated[Union[int, None], Field(description='The most characters of text to return in text format, all when empty')] = None,
+                               select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                               compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                               fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get analysis detail by id'''
     url = 'https://seeking-alpha.p.rapidapi.com/articles/get-details'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(_format_content(await _get(url, payload, fresh=fresh), format, section, offset, length), select, compact)
 
 @mcp.tool()
-def articles_list(category: Annotated[str, Field(description='One of the following : etfs-and-funds|latest-articles|stock-ideas|editors-picks|stock-ideas::editors-picks|dividends|investing-strategy|dividends::reits|podcast|market-outlook')],
-                  until: Annotated[Union[int, float, None], Field(description='The value of meta/page/minmaxPublishOn/min json object returned right in this endpoint to load next page Default: 0')] = None,
-                  size: Annotated[Union[int, float, None], Field(description='The number of items per response Default: 20')] = None) -> dict: 
+async def articles_list(category: Annotated[str, Field(description='One of the following : etfs-and-funds|latest-articles|stock-ideas|editors-picks|stock-ideas::editors-picks|dividends|investing-strategy|dividends::reits|podcast|market-outlook')],
+                        until: Annotated[Union[int, float, None], Field(description='The value of meta/page/minmaxPublishOn/min json object returned right in this endpoint to load next page Default: 0')] = None,
+                        size: Annotated[Union[int, float, None], Field(description='The number of items per response Default: 20')] = None,
+                        select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                        compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                        fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''List articles by category'''
     url = 'https://seeking-alpha.p.rapidapi.com/articles/list'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'category': category,
         'until': until,
         'size': size,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def articles_list_trending() -> dict: 
+async def articles_list_trending(fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False,
+                                 select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                 compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none') -> dict: 
     '''List trending articles'''
     url = 'https://seeking-alpha.p.rapidapi.com/articles/list-trending'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def v2_list_by_symbol(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time')],
-                      until: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'since' parameter to filter data by date range Default: 0")] = None,
-                      since: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'until' parameter to filter data by date range Default: 0")] = None,
-                      size: Annotated[Union[int, float, None], Field(description='The number of items per response (max 40) Default: 20')] = None,
-                      number: Annotated[Union[int, float, None], Field(description='Page index for paging purpose Default: 1')] = None,
-                      category: Annotated[Union[str, None], Field(description='One of the following : dividend_news|earnings_news|m_n_a_news')] = None) -> dict: 
+async def v2_list_by_symbol(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time')],
+                            until: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'since' parameter to filter data by date range Default: 0")] = None,
+                            since: Annotated[Union[int, float, None], Field(description="Unix timestamp (Epoch timestamp), ex : 1636693199 Maybe use together with 'until' parameter to filter data by date range Default: 0")] = None,
+                            size: Annotated[Union[int, float, None], Field(description='The number of items per response (max 40) Default: 20')] = None,
+                            number: Annotated[Union[int, float, None], Field(description='Page index for paging purpose Default: 1')] = None,
+                            category: Annotated[Union[str, None], Field(description='One of the following : dividend_news|earnings_news|m_n_a_news')] = None,
+                            select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                            compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                            fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''List news by symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/news/v2/list-by-symbol'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
         'until': until,
@@ -678,142 +3638,155 @@ def v2_list_by_symbol(id: Annotated[str, Field(description='Symbol to query for
         'category': category,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def news_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../news/list or .../news/list-trending endpoint Default: 3577036')]) -> dict: 
+async def news_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../news/list or .../news/list-trending endpoint Default: 3577036')],
+                           select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                           compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                           fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get analysis detail by id'''
     url = 'https://seeking-alpha.p.rapidapi.com/news/get-details'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def news_list(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-              until: Annotated[Union[int, float, None], Field(description='The value of meta/page/minmaxPublishOn/min json object returned right in this endpoint to load next page Default: 0')] = None,
-              size: Annotated[Union[int, float, None], Field(description='The number of items per response Default: 20')] = None) -> dict: 
+async def news_list(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                    until: Annotated[Union[int, float, None], Field(description='The value of meta/page/minmaxPublishOn/min json object returned right in this endpoint to load next page Default: 0')] = None,
+                    size: Annotated[Union[int, float, None], Field(description='The number of items per response Default: 20')] = None,
+                    select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                    compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                    fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''List news of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/news/list'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
         'until': until,
         'size': size,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def news_list_trending() -> dict: 
+async def news_list_trending(fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False,
+                             select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                             compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none') -> dict: 
     '''List latest trending news'''
     url = 'https://seeking-alpha.p.rapidapi.com/news/list-trending'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def press_releases_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../press-releases/v2/list endpoint Default: 17867968')]) -> dict: 
+async def press_releases_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../press-releases/v2/list endpoint Default: 17867968')],
+                                     select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                     compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                     fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get press release detail by id'''
     url = 'https://seeking-alpha.p.rapidapi.com/press-releases/get-details'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def press_releases_list(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                        until: Annotated[Union[int, float, None], Field(description='The value of meta/page/minmaxPublishOn/min json object returned right in this endpoint to load next page Default: 0')] = None,
-                        size: Annotated[Union[int, float, None], Field(description='The number of items per response Default: 20')] = None) -> dict: 
+async def press_releases_list(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                              until: Annotated[Union[int, float, None], Field(description='The value of meta/page/minmaxPublishOn/min json object returned right in this endpoint to load next page Default: 0')] = None,
+                              size: Annotated[Union[int, float, None], Field(description='The number of items per response Default: 20')] = None,
+                              select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                              compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                              fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''List press releases of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/press-releases/list'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
         'until': until,
         'size': size,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def transcripts_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../transcripts/list endpoint Default: 4341792')]) -> dict: 
+async def transcripts_get_details(id: Annotated[Union[int, float], Field(description='The value of id returned in .../transcripts/list endpoint Default: 4341792')],
+                                  format: Annotated[Literal['html', 'text'], Field(description='html : the upstream response as is | text : plain text of the content, one paragraph per line, sliced by section, offset and length')] = 'html',
+                                  section: Annotated[Literal['all', 'prepared_remarks', 'qa'], Field(description='Part of a transcript to return in text format : all | prepared_remarks : before the Question-and-Answer Session | qa : from it on')] = 'all',
+                                  offset: Annotated[int, Field(description='First character of the text to return in text format Default: 0')] = 0,
+                                  length: Annotated[Union[int, None], Field(description='The most characters of text to return in text format, all when empty')] = None,
+                                  select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                  compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                  fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get transcript detail by id * This endpoint is deprecating. Use .../transcripts/v2/get-details instead'''
     url = 'https://seeking-alpha.p.rapidapi.com/transcripts/get-details'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(_format_content(await _get(url, payload, fresh=fresh), format, section, offset, length), select, compact)
 
 @mcp.tool()
-def transcripts_list(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
-                     until: Annotated[Union[int, float, None], Field(description='The value of meta/page/minmaxPublishOn/min json object returned right in this endpoint to load next page Default: 0')] = None,
-                     size: Annotated[Union[int, float, None], Field(description='The number of items per response Default: 20')] = None) -> dict: 
+async def transcripts_list(id: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                           until: Annotated[Union[int, float, None], Field(description='The value of meta/page/minmaxPublishOn/min json object returned right in this endpoint to load next page Default: 0')] = None,
+                           size: Annotated[Union[int, float, None], Field(description='The number of items per response Default: 20')] = None,
+                           select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                           compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                           fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''List transcripts of specific symbol'''
     url = 'https://seeking-alpha.p.rapidapi.com/transcripts/list'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
         'until': until,
         'size': size,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def comments_get_contents(id: Annotated[Union[int, float], Field(description='The value of id returned in .../articles/list or .../articles/list-trending or .../articles/list-wall-street-breakfast endpoints Default: 4469484')],
-                          comment_ids: Annotated[Union[int, float], Field(description='The value of id field returned in .../comments/v2/list endpoint. You may pass this parameter multiple times to get content of many comments at once. Ex : ...&comment_ids=90666350&comment_ids=90666780&... Default: 90666350')],
-                          sort: Annotated[Union[str, None], Field(description='Order by newest : -top_parent_id | Order by oldest : leave empty')] = None) -> dict: 
+async def comments_get_contents(id: Annotated[Union[int, float], Field(description='The value of id returned in .../articles/list or .../articles/list-trending or .../articles/list-wall-street-breakfast endpoints Default: 4469484')],
+                                comment_ids: Annotated[Union[int, float, List[int]], Field(description='The value of id field returned in .../comments/v2/list endpoint. Pass a list to get content of many comments at once, ex : [90666350, 90666780] Default: 90666350')],
+                                sort: Annotated[Union[str, None], Field(description='Order by newest : -top_parent_id | Order by oldest : leave empty')] = None,
+                                select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''This endpoint is used to get many comment's content at once by comment ids.'''
     url = 'https://seeking-alpha.p.rapidapi.com/comments/get-contents'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
         'comment_ids': comment_ids,
         'sort': sort,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def comments_get_sub_comments(id: Annotated[Union[int, float], Field(description='The value of id returned in .../articles/list or .../articles/list-trending or .../articles/list-wall-street-breakfast endpoints Default: 90949998')],
-                              sort: Annotated[Union[str, None], Field(description='Order by newest : -top_parent_id | Order by oldest : leave empty')] = None) -> dict: 
+async def comments_get_sub_comments(id: Annotated[Union[int, float], Field(description='The value of id returned in .../articles/list or .../articles/list-trending or .../articles/list-wall-street-breakfast endpoints Default: 90949998')],
+                                    sort: Annotated[Union[str, None], Field(description='Order by newest : -top_parent_id | Order by oldest : leave empty')] = None,
+                                    select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                    compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                    fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''This endpoint is used to get sub or nested comments of another comment'''
     url = 'https://seeking-alpha.p.rapidapi.com/comments/get-sub-comments'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
         'sort': sort,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def comments_list(id: Annotated[Union[int, float], Field(description='The value of id returned in .../articles/list or .../articles/list-trending or .../articles/list-wall-street-breakfast endpoints Default: 4405526')],
-                  from_id: Annotated[Union[int, float, None], Field(description='Leave empty to load the first page or get suitable value of the last comment id returned right in this endpoint with parentId being "null" to load the next page Default: 88004158')] = None,
-                  parent_count: Annotated[Union[int, float, None], Field(description='For paging purpose (max 20) Default: 20')] = None,
-                  sort: Annotated[Union[str, None], Field(description='Order by newest : -top_parent_id | Order by oldest : leave empty')] = None) -> dict: 
+async def comments_list(id: Annotated[Union[int, float], Field(description='The value of id returned in .../articles/list or .../articles/list-trending or .../articles/list-wall-street-breakfast endpoints Default: 4405526')],
+                        from_id: Annotated[Union[int, float, None], Field(description='Leave empty to load the first page or get suitable value of the last comment id returned right in this endpoint with parentId being "null" to load the next page Default: 88004158')] = None,
+                        parent_count: Annotated[Union[int, float, None], Field(description='For paging purpose (max 20) Default: 20')] = None,
+                        sort: Annotated[Union[str, None], Field(description='Order by newest : -top_parent_id | Order by oldest : leave empty')] = None,
+                        select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                        compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                        fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''List all comments relating to a post or article or news'''
     url = 'https://seeking-alpha.p.rapidapi.com/comments/list'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
         'from_id': from_id,
@@ -821,69 +3794,416 @@ def comments_list(id: Annotated[Union[int, float], Field(description='The value
         'sort': sort,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def screeners_list() -> dict: 
+async def screeners_list(fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False,
+                         select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                         compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none') -> dict: 
     '''List all screeners (Top Rated Stocks, Top Quant Dividend Stocks, Top Yield Monsters, etc...)'''
     url = 'https://seeking-alpha.p.rapidapi.com/screeners/list'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def screener_filters_list() -> dict: 
+async def screener_filters_list(fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False,
+                                select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none') -> dict: 
     '''List available filters to be used in .../screeners/get-results endpoint'''
     url = 'https://seeking-alpha.p.rapidapi.com/screener-filters/list'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def screeners_detail(id: Annotated[str, Field(description='The value of id field returned in .../screeners/list endpoint')]) -> dict: 
+async def screeners_detail(id: Annotated[str, Field(description='The value of id field returned in .../screeners/list endpoint')],
+                           select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                           compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                           fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
     '''Get more information of a screener'''
     url = 'https://seeking-alpha.p.rapidapi.com/screeners/detail'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
         'id': id,
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
 
 @mcp.tool()
-def screeners_get_results(data: Annotated[dict, Field(description='')] = None) -> dict: 
+async def screeners_get_results(data: Annotated[dict, Field(description='')] = None,
+                                select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none') -> dict: 
     '''Get results of symbols by applied filters relating to a screener'''
     url = 'https://seeking-alpha.p.rapidapi.com/screeners/get-results'
-    headers = {'Content-Type': 'application/json', 'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
-    response = requests.post(url, headers=headers, json=data)
-    return response.json()
+    return _project(await _post(url, data), select, compact)
 
 @mcp.tool()
-def accounts_get_access_token(data: Annotated[dict, Field(description='')] = None) -> dict: 
+async def accounts_get_access_token(data: Annotated[dict, Field(description='')] = None,
+                                    select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                    compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none') -> dict: 
     '''Get access token by using own account from SA. The token is used to pass via request header while calling other endpoints. *The API does not support login by Google, or Apple.'''
     url = 'https://seeking-alpha.p.rapidapi.com/accounts/get-access-token'
-    headers = {'Content-Type': 'application/json', 'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
-    response = requests.post(url, headers=headers, json=data)
-    return response.json()
+    return _project(await _post(url, data), select, compact)
 
 @mcp.tool()
-def accounts_get_info() -> dict: 
+async def accounts_get_info(select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                            compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none') -> dict: 
     '''Get account information with access token'''
     url = 'https://seeking-alpha.p.rapidapi.com/accounts/get-info'
-    headers = {'x-rapidapi-host': 'seeking-alpha.p.rapidapi.com', 'x-rapidapi-key': rapid_api_key}
     payload = {
     }
     payload = {k: v for k, v in payload.items() if v is not None}
-    response = requests.get(url, headers=headers, params=payload)
-    return response.json()
+    return _project(await _get(url, payload), select, compact)
+
+
+@mcp.tool()
+async def symbols_get_price_history(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                    start: Annotated[str, Field(description='The date to get historical prices from. The format is yyyy-MM-dd . Ex : 2022-02-01')],
+                                    end: Annotated[str, Field(description='The date to get historical prices to. The format is yyyy-MM-dd . Ex : 2023-03-09')],
+                                    show_by: Annotated[Literal['day', 'week', 'month'], Field(description='One of the following : day|week|month')] = 'day',
+                                    fresh: Annotated[bool, Field(description='Ignore locally stored bars and fetch the whole range again')] = False) -> dict: 
+    '''Get split-adjusted historical prices from the local bar store, fetching only date ranges it does not hold yet'''
+    return await load_bars(symbol, start, end, show_by, fresh)
+
+@mcp.tool()
+async def symbols_get_indicators(symbols: Annotated[str, Field(description='Symbols to compute indicators for. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                                 start: Annotated[str, Field(description='The date to compute from. The format is yyyy-MM-dd . Ex : 2022-02-01')],
+                                 end: Annotated[str, Field(description='The date to compute to. The format is yyyy-MM-dd . Ex : 2023-03-09')],
+                                 indicators: Annotated[Union[str, None], Field(description='One of the following : sma|ema|rsi|macd|bollinger|volatility|drawdown|returns. Separated by comma for multiple options. Default: all')] = None,
+                                 show_by: Annotated[Literal['day', 'week', 'month'], Field(description='One of the following : day|week|month')] = 'day',
+                                 window: Annotated[int, Field(description='Window of sma, ema, bollinger and volatility Default: 20')] = 20,
+                                 fast: Annotated[int, Field(description='Fast EMA span of macd Default: 12')] = 12,
+                                 slow: Annotated[int, Field(description='Slow EMA span of macd Default: 26')] = 26,
+                                 signal: Annotated[int, Field(description='Signal EMA span of macd Default: 9')] = 9,
+                                 rsi_period: Annotated[int, Field(description='Period of rsi Default: 14')] = 14,
+                                 bollinger_k: Annotated[float, Field(description='Width of bollinger bands in standard deviations Default: 2')] = 2.0,
+                                 output: Annotated[Literal['last', 'series'], Field(description='last : latest value of each indicator | series : full series with dates')] = 'last') -> dict: 
+    '''Compute technical indicators (SMA, EMA, RSI, MACD, Bollinger bands, volatility, drawdown, returns) for many symbols from historical prices'''
+    _require_numpy()
+    names = tuple(n.strip() for n in indicators.split(',')) if indicators else _INDICATORS
+    unknown = set(names) - set(_INDICATORS)
+    if unknown:
+        raise ValueError(f'Unknown indicators: {", ".join(sorted(unknown))}')
+    params = (names, window, fast, slow, signal, rsi_period, bollinger_k, show_by)
+    ttl = 86400 if end < date.today().isoformat() else 60
+    symbol_list = list(dict.fromkeys(s.strip().lower() for s in symbols.split(',') if s.strip()))
+    results = {}
+    pending = []
+    for symbol in symbol_list:
+        cached = indicator_cache.get((symbol, start, end, params, output))
+        if cached is not None:
+            results[symbol] = cached
+        else:
+            pending.append(symbol)
+    if pending:
+        histories = await asyncio.gather(*(load_bars(symbol, start, end, show_by) for symbol in pending))
+        # One matrix per trading calendar: on a shared date axis, a symbol missing other symbols' days
+        # would get NaN holes inside its windows.
+        calendars = {}
+        incomplete = {symbol for symbol, history in zip(pending, histories) if history['meta']['failed_ranges']}
+        for symbol, history in zip(pending, histories):
+            bars = [bar for bar in history['bars'] if bar['close'] is not None]
+            calendars.setdefault(tuple(bar['date'] for bar in bars), []).append((symbol, [bar['close'] for bar in bars]))
+        for dates, group in calendars.items():
+            close = np.array([closes for _, closes in group], dtype=np.float64).reshape(len(group), len(dates))
+            computed = compute_indicators(close, names, window, fast, slow, signal, rsi_period, bollinger_k,
+                                          {'day': 252, 'week': 52, 'month': 12}[show_by])
+            for row, (symbol, _) in enumerate(group):
+                if not dates:
+                    result = {}
+                elif output == 'last':
+                    result = {'date': dates[-1], **{name: _json_float(values[row, -1]) for name, values in computed.items()}}
+                else:
+                    result = {'date': list(dates), **{name: [_json_float(v) for v in values[row]] for name, values in computed.items()}}
+                if symbol not in incomplete:
+                    indicator_cache.set((symbol, start, end, params, output), result, ttl)
+                results[symbol] = result
+    return {'indicators': {symbol: results[symbol] for symbol in symbol_list}}
+
+@mcp.tool()
+async def list_paginated(endpoint: Annotated[Literal['v2_list', 'analysis_list', 'articles_list', 'v2_list_by_symbol', 'news_list', 'press_releases_list', 'transcripts_list', 'comments_list', 'symbols_get_quant_rating_histories'], Field(description='Name of the list tool to page through')],
+                         params: Annotated[dict, Field(description='Parameters of that tool, without its paging parameter (number, until or from_id). Ex : {"id": "aapl", "size": 40}')],
+                         max_items: Annotated[Union[int, None], Field(description='The maximum number of items to return Default: 100')] = 100,
+                         since: Annotated[Union[int, float, None], Field(description='Unix timestamp (Epoch timestamp), ex : 1636693199 . Stop once items are older than this')] = None,
+                         until: Annotated[Union[int, float, None], Field(description='Unix timestamp (Epoch timestamp), ex : 1636693199 . Skip items newer than this')] = None,
+                         select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                         compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                         fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
+    '''Load items from a list endpoint across as many pages as needed, up to max_items or back to a since date'''
+    path, scheme = _PAGINATION[endpoint]
+    url = 'https://seeking-alpha.p.rapidapi.com' + path
+    payload = {k: v for k, v in params.items() if v is not None and k != scheme}
+    if endpoint in ('v2_list', 'v2_list_by_symbol'):
+        # These endpoints filter by date range upstream as well.
+        payload.update({k: v for k, v in {'since': since, 'until': until}.items() if v is not None})
+    return _project(await _collect_pages(url, payload, scheme, 100 if max_items is None else max_items, since, until, fresh), select, compact)
+
+@mcp.tool()
+async def symbols_get_snapshot(symbols: Annotated[str, Field(description='Symbols to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                               endpoints: Annotated[Union[str, None], Field(description='One of the following : symbols_get_meta_data|symbols_get_summary|symbols_get_profile|symbols_get_metrics|symbols_get_valuation|v2_get_momentum|symbols_get_factor_grades. Separated by comma for multiple options. Default: symbols_get_meta_data,symbols_get_summary,symbols_get_metrics,symbols_get_valuation,v2_get_momentum,symbols_get_factor_grades')] = None,
+                               metrics_fields: Annotated[Union[str, None], Field(description='Fields of symbols_get_metrics. Separated by comma for multiple options. Ex : quant_rating,authors_rating_pro,sell_side_rating,marketcap,dividend_yield')] = 'quant_rating,authors_rating_pro,sell_side_rating,marketcap,dividend_yield',
+                               momentum_fields: Annotated[Union[str, None], Field(description='Fields of v2_get_momentum. Separated by comma for multiple options. Ex : chgp3m,chgp6m,chgp9m,chgp1y,low52,high52,movAvg10d')] = None,
+                               fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False,
+                               ctx: Context = None) -> dict: 
+    '''Get one merged record per symbol across several endpoints for a whole universe of symbols. Upstream calls are batched, run concurrently and each record is also sent as a log notification as soon as it is complete'''
+    names = tuple(n.strip() for n in endpoints.split(',') if n.strip()) if endpoints else tuple(n for n in _SNAPSHOT_ENDPOINTS if n != 'symbols_get_profile')
+    unknown = set(names) - set(_SNAPSHOT_ENDPOINTS)
+    if unknown:
+        raise ValueError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+    symbol_list = list(dict.fromkeys(s.strip().lower() for s in symbols.split(',') if s.strip()))
+    cached, calls = _plan_snapshot(symbol_list, names, {'symbols_get_metrics': metrics_fields, 'v2_get_momentum': momentum_fields}, fresh)
+    records = {symbol: {'symbol': symbol} for symbol in symbol_list}
+    pending = {symbol: len(names) for symbol in symbol_list}
+    failures = []
+    done = 0
+    semaphore = asyncio.Semaphore(_SNAPSHOT_CONCURRENCY)
+
+    async def complete(endpoint, responses):
+        for symbol, response in responses.items():
+            records[symbol][endpoint] = response
+            pending[symbol] -= 1
+            if not pending[symbol] and ctx is not None:
+                await ctx.log(symbol, logger_name='symbols_get_snapshot', extra=records[symbol])
+
+    async def run(endpoint, url, params, chunk):
+        nonlocal done
+        async with semaphore:
+            try:
+                responses = await _fetch_snapshot_call(url, params, chunk, fresh)
+            except Exception as exc:
+                failures.append({'endpoint': endpoint, 'symbols': chunk, 'error': str(exc) or type(exc).__name__})
+                responses = {symbol: None for symbol in chunk}
+        done += 1
+        await complete(endpoint, responses)
+        if ctx is not None:
+            await ctx.report_progress(done, len(calls), f'{done}/{len(calls)} upstream calls, {len(failures)} failed')
+
+    token = request_priority.set(_BULK_PRIORITY)
+    try:
+        for (endpoint, symbol), response in cached.items():
+            await complete(endpoint, {symbol: response})
+        await asyncio.gather(*(run(*call) for call in calls))
+    finally:
+        request_priority.reset(token)
+    return {'data': [records[symbol] for symbol in symbol_list], 'failures': failures,
+            'meta': {'symbols': len(symbol_list), 'calls': len(calls), 'cached': len(cached), 'failed': len(failures)}}
+
+@mcp.tool()
+async def symbols_resolve_ticker_ids(symbols: Annotated[str, Field(description='Symbols to resolve. Separating by comma to query multiple symbols at once, ex : aapl,tsla')]) -> dict: 
+    '''Get the ticker_ids of symbols from the local symbol index, looking up only the symbols it does not know yet'''
+    return {'ticker_ids': await resolve_ticker_ids(symbols.split(','))}
+
+@mcp.tool()
+async def symbols_get_earnings_by_symbol(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                                         period_type: Annotated[Union[str, None], Field(description='One of the followings : quarterly|annual')] = None,
+                                         relative_periods: Annotated[Union[str, None], Field(description='Valid range -23,...,-2,-1,0,1,2,..,23')] = None,
+                                         estimates_data_items: Annotated[Union[str, None], Field(description='One of the followings : eps_gaap_actual,eps_gaap_consensus_mean,eps_normalized_actual,eps_normalized_consensus_mean,revenue_actual,revenue_consensus_mean,eps_primary,revenue_consensus_low,revenue_consensus_high,revenue_num_of_estimates . Separated by comma for multiple options')] = None,
+                                         revisions_data_items: Annotated[Union[str, None], Field(description='One of the followings : eps_normalized_actual,eps_normalized_consensus_mean,revenue_consensus_mean . Separated by comma for multiple options')] = None,
+                                         group_by_month: Annotated[Union[bool, None], Field(description='true|false')] = None,
+                                         return_window: Annotated[Union[int, float, None], Field(description='Default: 0')] = None,
+                                         select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                         compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                         fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
+    '''Get information in Earnings tab of specific symbol, resolving symbols to ticker_ids locally'''
+    url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-earnings'
+    payload = {
+        'ticker_ids': await _ticker_ids_param(symbols),
+        'period_type': period_type,
+        'relative_periods': relative_periods,
+        'estimates_data_items': estimates_data_items,
+        'revisions_data_items': revisions_data_items,
+        'group_by_month': group_by_month,
+        'return_window': return_window,
+    }
+    payload = {k: v for k, v in payload.items() if v is not None}
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
+
+@mcp.tool()
+async def symbols_get_analyst_price_target_by_symbol(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                                                     return_window: Annotated[Union[int, float, None], Field(description='The return window Default: 1')] = None,
+                                                     group_by_month: Annotated[Union[bool, None], Field(description='Whether or not the data is grouped by month')] = None,
+                                                     select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                                     compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                                     fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
+    '''Get Wall Street analyst price target for specific symbol, resolving symbols to ticker_ids locally'''
+    url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-analyst-price-target'
+    payload = {
+        'ticker_ids': await _ticker_ids_param(symbols),
+        'return_window': return_window,
+        'group_by_month': group_by_month,
+    }
+    payload = {k: v for k, v in payload.items() if v is not None}
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
+
+@mcp.tool()
+async def symbols_get_analyst_recommendations_by_symbol(symbols: Annotated[str, Field(description='Symbol to query for data. Separating by comma to query multiple symbols at once, ex : aapl,tsla')],
+                                                        return_window: Annotated[Union[int, float, None], Field(description='The return window Default: 3')] = None,
+                                                        group_by_month: Annotated[Union[bool, None], Field(description='Whether or not the data is grouped by month')] = None,
+                                                        select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                                        compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                                        fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
+    '''Get Wall Street analyst recommendations for specific symbol, resolving symbols to ticker_ids locally'''
+    url = 'https://seeking-alpha.p.rapidapi.com/symbols/get-analyst-recommendations'
+    payload = {
+        'ticker_ids': await _ticker_ids_param(symbols),
+        'return_window': return_window,
+        'group_by_month': group_by_month,
+    }
+    payload = {k: v for k, v in payload.items() if v is not None}
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
+
+@mcp.tool()
+async def v2_get_options_by_symbol(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                   expiration_date: Annotated[Union[str, None], Field(description='The format is yyyy-MM-dd (2024-11-15), and the valid dates returned in .../symbols/get-option-expirations endpoint')] = None,
+                                   select: Annotated[Union[str, None], Field(description='Comma separated paths of the fields to keep, ex : data.id,data.attributes.close . A path goes into every item of a list, * matches any key and [n] picks the n-th item. Everything is kept when empty')] = None,
+                                   compact: Annotated[Literal['none', 'nulls', 'flat'], Field(description='none : as returned | nulls : drop null fields | flat : drop null fields, lift attributes next to id and type and inline the included items that data items refer to')] = 'none',
+                                   fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
+    '''Get optional prices, resolving the symbol to its ticker_id locally'''
+    url = 'https://seeking-alpha.p.rapidapi.com/symbols/v2/get-options'
+    payload = {
+        'ticker_id': await _ticker_ids_param(symbol),
+        'expiration_date': expiration_date,
+    }
+    payload = {k: v for k, v in payload.items() if v is not None}
+    return _project(await _get(url, payload, fresh=fresh), select, compact)
+
+@mcp.tool()
+async def documents_search(query: Annotated[str, Field(description='Words to search for in titles and bodies, ex : gross margin guidance')],
+                           symbols: Annotated[Union[str, None], Field(description='Only documents tagged with these symbols. Separating by comma for multiple symbols, ex : aapl,tsla')] = None,
+                           types: Annotated[Union[str, None], Field(description='One of the following : article|news|transcript|press_release|analysis. Separated by comma for multiple options')] = None,
+                           since: Annotated[Union[int, float, None], Field(description='Unix timestamp (Epoch timestamp), ex : 1636693199 . Only documents published at or after it')] = None,
+                           until: Annotated[Union[int, float, None], Field(description='Unix timestamp (Epoch timestamp), ex : 1636693199 . Only documents published at or before it')] = None,
+                           match: Annotated[Literal['any', 'all'], Field(description='any : documents with any of the words, best matches first | all : documents with every word')] = 'any',
+                           size: Annotated[int, Field(description='The number of items per response Default: 10')] = 10) -> dict: 
+    '''Search the articles, news, transcripts, press releases and analysis already fetched through the *_get_details tools, without calling upstream'''
+    if not document_index.available:
+        raise RuntimeError('Full-text search needs an SQLite build with FTS5')
+    type_list = [t.strip() for t in types.split(',') if t.strip()] if types else []
+    unknown = set(type_list) - set(_DOCUMENT_TYPES.values())
+    if unknown:
+        raise ValueError(f'Unknown types: {", ".join(sorted(unknown))}')
+    symbol_list = [s.strip().lower() for s in symbols.split(',') if s.strip()] if symbols else []
+    return {'data': await document_index.search(query, type_list, symbol_list, since, until, size, match)}
+
+@mcp.tool()
+async def symbols_get_option_chain(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                   expirations: Annotated[Union[str, None], Field(description='Expiration dates to load, the format is yyyy-MM-dd . Separated by comma for multiple options. Default: all listed')] = None,
+                                   min_days: Annotated[Union[int, None], Field(description='Skip expirations sooner than this many days')] = None,
+                                   max_days: Annotated[Union[int, None], Field(description='Skip expirations later than this many days')] = None,
+                                   spot: Annotated[Union[float, None], Field(description='Underlying price to compute implied volatility and Greeks with. Default: from the chain or the latest close')] = None,
+                                   rate: Annotated[float, Field(description='Annual risk-free rate, ex : 0.04')] = 0.04,
+                                   dividend_yield: Annotated[float, Field(description='Annual continuous dividend yield, ex : 0.005')] = 0.0,
+                                   fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
+    '''Get the option chains of many expirations at once as expiration x strike arrays of bid, ask, last, volume, open interest, implied volatility and Greeks for calls and puts'''
+    return await load_option_chain(symbol, [e.strip() for e in expirations.split(',') if e.strip()] if expirations else None,
+                                   min_days, max_days, spot, rate, dividend_yield, fresh)
+
+@mcp.tool()
+async def screeners_load_universe(symbols: Annotated[str, Field(description='Symbols of the universe to screen locally. Separating by comma, ex : aapl,tsla,msft')],
+                                  metrics_fields: Annotated[Union[str, None], Field(description='Fields of symbols_get_metrics to load. Separated by comma for multiple options. Ex : quant_rating,marketcap,dividend_yield')] = 'quant_rating,authors_rating_pro,sell_side_rating,marketcap,dividend_yield',
+                                  grades_fields: Annotated[Union[str, None], Field(description='Fields of symbols_get_metric_grades to load. Separated by comma for multiple options. Ex : value_category,growth_category,profitability_category,momentum_category,eps_revisions_category')] = None,
+                                  fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
+    '''Load metrics and metric grades of a universe of symbols into the local screener table in bulk'''
+    symbol_list = list(dict.fromkeys(s.strip().lower() for s in symbols.split(',') if s.strip()))
+    split = lambda fields: [f.strip() for f in (fields or '').split(',') if f.strip()]
+    failures = await load_screener_fields(symbol_list, split(metrics_fields), split(grades_fields), fresh)
+    return {'failures': failures, 'meta': screener_table.stats()}
+
+@mcp.tool()
+async def screeners_get_results_local(data: Annotated[dict, Field(description='Same body as screeners_get_results, ex : {"filter": {"quant_rating": {"gte": 3.5}, "value_category": {"in": ["A+", "A", "A-"]}}, "sort": "-marketcap", "page": 1, "per_page": 100}')],
+                                      symbols: Annotated[Union[str, None], Field(description='Universe to screen. Separating by comma, ex : aapl,tsla,msft . Default: every symbol loaded so far')] = None,
+                                      fallback: Annotated[bool, Field(description='Send screens that cannot be evaluated locally to screeners_get_results')] = True,
+                                      fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
+    '''Get screener results evaluated over the local table of metrics and grades, without an upstream call once the universe is loaded'''
+    result, reason = await screen_locally(data, symbols.split(',') if symbols else None, fresh)
+    if result is not None:
+        return result
+    if not fallback:
+        raise ValueError(f'Screen cannot be evaluated locally: {reason}')
+    screener_table.upstream += 1
+    return {'data': await _post('https://seeking-alpha.p.rapidapi.com/screeners/get-results', data),
+            'meta': {'source': 'upstream', 'reason': reason}}
+
+@mcp.tool()
+async def symbols_get_statements(symbol: Annotated[str, Field(description='Symbol to query for data, only one is allowed at a time.')],
+                                 period_type: Annotated[Literal['annual', 'quarterly', 'ttm'], Field(description='One of the following : annual|quarterly|ttm')] = 'annual',
+                                 items: Annotated[Union[str, None], Field(description='Line items to return, as the name field of the rows of symbols_get_financials. Separated by comma for multiple options. Ex : total_revenue,gross_profit,net_income . Default: all')] = None,
+                                 ratios: Annotated[Union[str, None], Field(description='One of the following : gross_margin|operating_margin|net_margin|current_ratio|debt_to_equity|return_on_equity|return_on_assets|asset_turnover|cash_conversion, or name=numerator/denominator over line items. Separated by comma for multiple options. Default: every built-in ratio the statements allow')] = None,
+                                 target_currency: Annotated[Union[str, None], Field(description='The currency code')] = None,
+                                 fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
+    '''Get income statement, balance sheet and cash flow statement at once as numeric line items per period, with YoY/QoQ changes and ratios'''
+    matrix = await load_statements(symbol, period_type, target_currency, fresh)
+    split = lambda text: [part.strip() for part in text.split(',') if part.strip()] if text else None
+    return statement_report(matrix, split(items), split(ratios))
+
+@mcp.tool()
+async def watchlist_subscribe(symbols: Annotated[str, Field(description='Symbols to watch. Separating by comma, ex : aapl,tsla,msft')],
+                              feeds: Annotated[Union[str, None], Field(description='One of the following : news|press_releases|earnings|trending . Separated by comma for multiple options. Default: news,press_releases,earnings')] = None,
+                              notify: Annotated[bool, Field(description='Also push new items to this session as log notifications from the watchlist logger')] = True,
+                              ctx: Context = None) -> dict: 
+    '''Start watching news, press releases, estimated earnings announcements and trending news of symbols on the server. New items are kept for watchlist_poll and optionally pushed as notifications'''
+    feed_list = [f.strip() for f in (feeds or 'news,press_releases,earnings').split(',') if f.strip()]
+    unknown = set(feed_list) - set(_WATCHLIST_FEEDS)
+    if unknown:
+        raise ValueError(f'Unknown feeds: {", ".join(sorted(unknown))}')
+    symbol_list = list(dict.fromkeys(s.strip().lower() for s in symbols.split(',') if s.strip()))
+    subscription = watchlist.subscribe(symbol_list, feed_list, ctx.session if notify and ctx is not None else None)
+    return watchlist.status(subscription)
+
+@mcp.tool()
+async def watchlist_poll(subscription: Annotated[str, Field(description='The value of subscription returned in watchlist_subscribe')],
+                         cursor: Annotated[Union[int, None], Field(description='The value of cursor returned by the previous call. Default: where the previous call stopped')] = None,
+                         size: Annotated[int, Field(description='The number of events per response')] = 100) -> dict: 
+    '''Get the items that appeared in watched feeds since a cursor, without an upstream call'''
+    return watchlist.read(subscription, cursor, size)
+
+@mcp.tool()
+async def watchlist_unsubscribe(subscription: Annotated[str, Field(description='The value of subscription returned in watchlist_subscribe')]) -> dict: 
+    '''Stop a watchlist subscription'''
+    return {'removed': watchlist.unsubscribe(subscription)}
+
+@mcp.tool()
+async def comments_get_thread(id: Annotated[Union[int, float], Field(description='The value of id returned in .../articles/list or .../articles/list-trending or .../articles/list-wall-street-breakfast endpoints Default: 4405526')],
+                              max_depth: Annotated[int, Field(description='Deepest reply level to load, 1 for top-level comments only')] = 10,
+                              max_comments: Annotated[int, Field(description='Stop after this many comments')] = 1000,
+                              sort: Annotated[Union[str, None], Field(description='Order by newest : -top_parent_id | Order by oldest : leave empty')] = None,
+                              format: Annotated[Literal['text', 'html'], Field(description='text : comment bodies as plain text | html : as returned')] = 'text',
+                              fresh: Annotated[bool, Field(description='Skip the response cache and fetch fresh data from upstream')] = False) -> dict: 
+    '''Get a whole comment thread as a tree of comments with their replies and contents, loading pages, sub comments and contents concurrently'''
+    return await load_comment_thread(int(id), max_depth, max_comments, sort, format, fresh)
+
+@mcp.tool()
+async def server_stats() -> dict: 
+    '''Get response cache, request coalescing, batching, API key usage and circuit breaker statistics of this server'''
+    return {
+        'cache': response_cache.stats(),
+        'disk_cache': disk_cache.stats() if disk_cache is not None else None,
+        'coalescing': upstream_calls.stats(),
+        'indicator_cache': indicator_cache.stats(),
+        'option_chain_cache': option_chain_cache.stats(),
+        'statement_cache': statement_cache.stats(),
+        'screener': screener_table.stats(),
+        'watchlist': watchlist.stats(),
+        'symbol_index': symbol_index.stats(),
+        'search_index': document_index.stats(),
+        'auto_complete': {'v2': v2_auto_complete_index.stats(), 'v1': auto_complete_index.stats()},
+        'batching': batcher.stats(),
+        'api_keys': key_pool.stats(),
+        'circuit_breaker': circuit_breaker.stats(),
+    }
+
+
+@mcp.resource('seeking-alpha://quota')
+def quota() -> dict: 
+    '''Remaining RapidAPI request quota, rate limit state and usage of each API key'''
+    return key_pool.stats()
+
+@mcp.resource('seeking-alpha://watchlist/{subscription}')
+def watchlist_status(subscription: str) -> dict: 
+    '''Sources of a watchlist subscription with their high-water marks, poll intervals and errors'''
+    return watchlist.status(subscription)
 
 
 
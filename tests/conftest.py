@@ -0,0 +1,41 @@
+import asyncio
+import contextlib
+import os
+import sys
+
+os.environ.setdefault('RAPID_API_KEYS', 'test-key')
+os.environ.setdefault('SA_RATE_LIMIT', '0')
+os.environ.setdefault('SA_BATCH_WINDOW_MS', '0')
+os.environ.setdefault('SA_RETRY_BACKOFF', '0.01')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web  # noqa: E402
+
+import server  # noqa: E402
+
+
+def run(coro):
+    '''Run a coroutine on a fresh loop with a fresh shared session.'''
+    async def main():
+        server._session = None
+        try:
+            return await coro
+        finally:
+            if server._session is not None:
+                await server._session.close()
+    return asyncio.run(main())
+
+
+@contextlib.asynccontextmanager
+async def upstream(handler):
+    '''Serve handler(request) on a local port and yield the base URL standing in for RapidAPI.'''
+    app = web.Application()
+    app.router.add_route('*', '/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    try:
+        yield f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,56 @@
+import time
+
+import server
+from conftest import run
+
+
+def _symbols(*names):
+    return [{'id': name.lower(), 'type': 'symbol', 'name': name, 'slug': name.lower(), 'content': f'{name} Inc'} for name in names]
+
+
+def test_answers_in_the_upstream_shape():
+    index = server.PrefixIndex(60)
+    index.add({'symbols': _symbols('AAPL', 'AAP', 'AAON'), 'people': [], 'meta': {'query': 'aa'}})
+    assert index.search('aa', ['symbols'], 3) == {'symbols': _symbols('AAON', 'AAP', 'AAPL'), 'meta': {'query': 'aa'}}
+    result = index.search('aap', ['symbols'], 2)
+    assert set(result) == {'symbols', 'meta'}
+    assert [item['name'] for item in result['symbols']] == ['AAP', 'AAPL']
+
+
+def test_falls_back_when_any_group_is_partial():
+    index = server.PrefixIndex(60)
+    index.add({'symbols': _symbols('AAPL', 'AAP'), 'people': [{'id': '1', 'name': 'Aaron', 'slug': 'aaron'}]})
+    assert index.search('aa', ['symbols'], 2) is not None
+    assert index.search('aa', ['symbols', 'people'], 2) is None
+    assert index.search('aa', ['symbols'], 3) is None
+    assert index.stats()['fallbacks'] == 2
+
+
+def test_learned_items_expire_but_seeds_do_not():
+    index = server.PrefixIndex(0.05)
+    index.add({'symbols': _symbols('MSFT')})
+    index.add({'symbols': _symbols('MSTR')}, seed=True)
+    assert [item['name'] for item in index.search('ms', ['symbols'], 2)['symbols']] == ['MSFT', 'MSTR']
+    time.sleep(0.06)
+    assert index.search('ms', ['symbols'], 2) is None
+    assert index.search('mst', ['symbols'], 1)['symbols'][0]['name'] == 'MSTR'
+    # Seeing an item upstream again renews it.
+    index.add({'symbols': _symbols('MSFT')})
+    assert index.search('ms', ['symbols'], 2) is not None
+
+
+def test_tool_goes_upstream_for_partial_answers(monkeypatch):
+    calls = []
+
+    async def fetch(url, params):
+        calls.append(params['query'])
+        return 200, {'symbols': _symbols('TSLA', 'TSM'), 'people': [], 'pages': []}
+
+    monkeypatch.setattr(server, '_fetch', fetch)
+    monkeypatch.setattr(server, 'v2_auto_complete_index', server.PrefixIndex(60))
+    first = run(server.v2_auto_complete.fn('ts', 'symbols', 2))
+    second = run(server.v2_auto_complete.fn('ts', 'symbols', 2))
+    assert calls == ['ts']
+    assert second == {'symbols': first['symbols']}
+    run(server.v2_auto_complete.fn('tsl', 'symbols', 2))
+    assert calls == ['ts', 'tsl']
@@ -0,0 +1,70 @@
+import server
+from conftest import run
+
+HISTORY = 'https://seeking-alpha.p.rapidapi.com/symbols/get-historical-prices'
+
+
+def _fake_upstream(calls, close):
+    async def fetch(url, params):
+        calls.append((server._endpoint(url), dict(params)))
+        if url.endswith('/get-splits'):
+            return 200, {'data': [{'id': '1', 'type': 'split', 'attributes': {'date': '2020-08-31', 'ratio': '4:1'}}]}
+        days = ['2020-08-24', '2020-08-25', '2020-08-26', '2020-08-27', '2020-08-28']
+        return 200, {'data': [{'id': day, 'type': 'historical_price',
+                               'attributes': {'as_of_date': day, 'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1000}}
+                              for day in days]}
+    return fetch
+
+
+def test_bars_stored_before_a_split_are_adjusted(monkeypatch):
+    calls = []
+    monkeypatch.setattr(server, '_fetch', _fake_upstream(calls, 400.0))
+
+    async def scenario():
+        first = await server.load_bars('splitco', '2020-08-24', '2020-08-28')
+        # Upstream already adjusts bars fetched after the split, so fresh rows are left alone.
+        assert [bar['close'] for bar in first['bars']] == [400.0] * 5
+        with server.bar_store._lock:
+            server.bar_store._db.execute("UPDATE bars SET fetched_on = '2020-08-01' WHERE symbol = 'splitco'")
+        second = await server.load_bars('splitco', '2020-08-24', '2020-08-28')
+        assert second['meta']['fetched_ranges'] == []
+        assert [bar['close'] for bar in second['bars']] == [100.0] * 5
+        assert [bar['volume'] for bar in second['bars']] == [4000.0] * 5
+
+    run(scenario())
+
+
+def test_gaps_are_fetched_from_upstream_not_the_response_cache(monkeypatch):
+    calls = []
+    monkeypatch.setattr(server, '_fetch', _fake_upstream(calls, 400.0))
+
+    async def scenario():
+        params = {'symbol': 'cachedco', 'start': '2020-08-24', 'end': '2020-08-28', 'show_by': 'day'}
+        await server._get(HISTORY, params)
+        await server.load_bars('cachedco', '2020-08-24', '2020-08-28')
+
+    run(scenario())
+    assert [endpoint for endpoint, _ in calls].count('/symbols/get-historical-prices') == 2
+
+
+def test_an_error_body_leaves_the_gap_to_be_fetched_again(monkeypatch):
+    calls = []
+    succeed = _fake_upstream(calls, 400.0)
+
+    async def fetch(url, params):
+        if len(calls) == 0:
+            calls.append((server._endpoint(url), dict(params)))
+            return 403, {'message': 'You are not subscribed to this API.'}
+        return await succeed(url, params)
+    monkeypatch.setattr(server, '_fetch', fetch)
+
+    async def scenario():
+        first = await server.load_bars('flakyco', '2020-08-24', '2020-08-28')
+        assert first['bars'] == []
+        assert first['meta']['fetched_ranges'] == []
+        assert first['meta']['failed_ranges'] == [('2020-08-24', '2020-08-28')]
+        second = await server.load_bars('flakyco', '2020-08-24', '2020-08-28')
+        assert second['meta']['fetched_ranges'] == [('2020-08-24', '2020-08-28')]
+        assert [bar['close'] for bar in second['bars']] == [400.0] * 5
+
+    run(scenario())
@@ -0,0 +1,126 @@
+import asyncio
+
+import server
+from conftest import run
+
+URL = 'https://seeking-alpha.p.rapidapi.com/symbols/get-summary'
+
+
+def _summary(symbols):
+    return {'data': [{'id': symbol, 'type': 'summary', 'attributes': {'close': float(len(symbol))}} for symbol in symbols]}
+
+
+def test_split_jsonapi_by_id():
+    data = _summary(['aapl', 'tsla'])
+    slices = server._split_batch(data, ['AAPL', 'tsla', 'msft'])
+    assert slices['AAPL']['data'] == [data['data'][0]]
+    assert slices['tsla']['data'] == [data['data'][1]]
+    assert slices['msft'] is None
+
+
+def test_split_jsonapi_through_included_ticker():
+    data = {'data': [{'id': '9001', 'type': 'metric', 'attributes': {'value': 1},
+                      'relationships': {'ticker': {'data': {'id': '146', 'type': 'ticker'}}}},
+                     {'id': '9002', 'type': 'metric', 'attributes': {'value': 2},
+                      'relationships': {'ticker': {'data': {'id': '1742', 'type': 'ticker'}}}}],
+            'included': [{'id': '146', 'type': 'ticker', 'attributes': {'name': 'AAPL', 'slug': 'aapl'}},
+                         {'id': '1742', 'type': 'ticker', 'attributes': {'name': 'TSLA', 'slug': 'tsla'}}]}
+    slices = server._split_batch(data, ['aapl', 'tsla'])
+    assert [item['id'] for item in slices['aapl']['data']] == ['9001']
+    assert [item['id'] for item in slices['tsla']['data']] == ['9002']
+    assert slices['aapl']['included'] == data['included']
+
+
+def test_split_body_keyed_by_ticker_id():
+    data = {'estimates': {'146': {'eps': 1}, '1742': {'eps': 2}}, 'meta': {'count': 2}}
+    slices = server._split_batch(data, ['146', '1742'])
+    assert slices['146'] == {'estimates': {'146': {'eps': 1}}, 'meta': {'count': 2}}
+    assert slices['1742']['estimates'] == {'1742': {'eps': 2}}
+
+
+def test_split_unknown_shape():
+    assert server._split_batch({'total': 3}, ['aapl', 'tsla']) == {}
+    assert server._split_batch([1, 2], ['aapl']) == {}
+
+
+def _batched(monkeypatch, respond):
+    calls = []
+
+    async def fetch(url, params):
+        calls.append(params['symbols'])
+        return respond(params['symbols'].split(','))
+
+    monkeypatch.setattr(server, '_fetch', fetch)
+    batcher = server.MicroBatcher(0.01)
+
+    async def scenario(symbols):
+        return await asyncio.gather(*(batcher.fetch(URL, {'symbols': symbol}) for symbol in symbols))
+
+    return calls, batcher, scenario
+
+
+def test_merged_calls_are_sliced_per_caller(monkeypatch):
+    calls, batcher, scenario = _batched(monkeypatch, lambda symbols: (200, _summary(symbols)))
+    results = run(scenario(['aapl', 'tsla']))
+    assert calls == ['aapl,tsla']
+    assert [data['data'][0]['id'] for _, data in results] == ['aapl', 'tsla']
+    assert batcher.fallbacks == 0
+
+
+def test_merged_error_falls_back_to_single_calls(monkeypatch):
+    def respond(symbols):
+        if 'nope' in symbols:
+            return 404, {'errors': [{'detail': 'not found'}]}
+        return 200, _summary(symbols)
+
+    calls, batcher, scenario = _batched(monkeypatch, respond)
+    (ok_status, ok), (bad_status, _) = run(scenario(['aapl', 'nope']))
+    assert calls[0] == 'aapl,nope' and sorted(calls[1:]) == ['aapl', 'nope']
+    assert (ok_status, ok['data'][0]['id']) == (200, 'aapl')
+    assert bad_status == 404
+    assert batcher.fallbacks == 2
+
+
+def test_merged_response_without_the_values_keeps_batching(monkeypatch):
+    calls, batcher, scenario = _batched(monkeypatch, lambda symbols: (200, {'data': []}))
+    run(scenario(['gone1', 'gone2']))
+    assert batcher.unsplittable == set()
+
+
+def test_single_value_batch_passes_errors_through(monkeypatch):
+    calls, batcher, scenario = _batched(monkeypatch, lambda symbols: (404, {'errors': []}))
+    assert run(scenario(['nope'])) == [(404, {'errors': []})]
+    assert calls == ['nope']
+
+
+def _snapshot(monkeypatch, respond):
+    calls = []
+
+    async def fetch(url, params):
+        calls.append(params['symbols'])
+        return respond(params['symbols'].split(','))
+
+    monkeypatch.setattr(server, '_fetch', fetch)
+    monkeypatch.setattr(server.batcher, 'unsplittable', set())
+    return calls
+
+
+def test_snapshot_error_falls_back_without_disabling_batching(monkeypatch):
+    calls = _snapshot(monkeypatch, lambda symbols: (403, {'message': 'bad symbol'}) if 'nope' in symbols else (200, _summary(symbols)))
+    responses = run(server._fetch_snapshot_call(URL, {'symbols': 'snapa,nope'}, ['snapa', 'nope'], fresh=True))
+    assert calls[0] == 'snapa,nope' and sorted(calls[1:]) == ['nope', 'snapa']
+    assert responses['snapa']['data'][0]['id'] == 'snapa'
+    assert responses['nope'] == {'message': 'bad symbol'}
+    assert server.batcher.unsplittable == set()
+
+
+def test_snapshot_with_no_symbols_found_keeps_batching(monkeypatch):
+    _snapshot(monkeypatch, lambda symbols: (200, {'data': []}))
+    run(server._fetch_snapshot_call(URL, {'symbols': 'gone1,gone2'}, ['gone1', 'gone2'], fresh=True))
+    assert server.batcher.unsplittable == set()
+
+
+def test_snapshot_of_unknown_shape_disables_batching(monkeypatch):
+    _snapshot(monkeypatch, lambda symbols: (200, {'total': len(symbols)}))
+    run(server._fetch_snapshot_call(URL, {'symbols': 'odd1,odd2'}, ['odd1', 'odd2'], fresh=True))
+    assert server.batcher.unsplittable == {'/symbols/get-summary'}
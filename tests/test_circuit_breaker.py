@@ -0,0 +1,128 @@
+import time
+
+import pytest
+from aiohttp import web
+
+import server
+from conftest import run, upstream
+
+
+def test_opens_after_threshold_and_admits_one_trial():
+    breaker = server.CircuitBreaker(2, 0.05)
+    assert breaker.before('/a') is False
+    breaker.failure('/a')
+    breaker.failure('/a')
+    with pytest.raises(server.CircuitOpenError):
+        breaker.before('/a')
+    time.sleep(0.06)
+    assert breaker.before('/a') is True
+    with pytest.raises(server.CircuitOpenError):
+        breaker.before('/a')
+
+
+def test_trial_outcomes():
+    breaker = server.CircuitBreaker(1, 0.05)
+    breaker.failure('/a')
+    time.sleep(0.06)
+    assert breaker.before('/a')
+    breaker.failure('/a')
+    with pytest.raises(server.CircuitOpenError):
+        breaker.before('/a')
+    time.sleep(0.06)
+    assert breaker.before('/a')
+    breaker.success('/a')
+    assert breaker.before('/a') is False
+    assert breaker.stats()['open'] == []
+
+
+def test_settled_trial_lets_the_next_call_try():
+    breaker = server.CircuitBreaker(1, 0.05)
+    breaker.failure('/a')
+    time.sleep(0.06)
+    assert breaker.before('/a')
+    breaker.settle('/a')
+    assert breaker.before('/a') is True
+
+
+def _open_and_cool(endpoint):
+    server.circuit_breaker._failures[endpoint] = server.circuit_breaker.threshold
+    server.circuit_breaker._open_until[endpoint] = time.monotonic() - 1
+    server.circuit_breaker._trial.discard(endpoint)
+
+
+def test_429_during_trial_does_not_leave_the_circuit_stuck():
+    statuses = [429, 200]
+
+    async def handler(request):
+        status = statuses.pop(0) if statuses else 200
+        return web.json_response({'status': status}, status=status)
+
+    async def scenario():
+        async with upstream(handler) as base:
+            url = base + '/breaker/trial-429'
+            endpoint = server._endpoint(url)
+            _open_and_cool(endpoint)
+            assert await server._request('GET', url) == (200, {'status': 200})
+            assert endpoint not in server.circuit_breaker._trial
+            assert endpoint not in server.circuit_breaker.stats()['open']
+
+    run(scenario())
+
+
+def test_exhausted_429s_during_trial_release_the_trial():
+    async def handler(request):
+        return web.json_response({}, status=429)
+
+    async def scenario():
+        async with upstream(handler) as base:
+            url = base + '/breaker/always-429'
+            endpoint = server._endpoint(url)
+            _open_and_cool(endpoint)
+            for _ in range(2):
+                with pytest.raises(server.UpstreamError) as raised:
+                    await server._request('GET', url)
+                assert not isinstance(raised.value, server.CircuitOpenError)
+            assert endpoint not in server.circuit_breaker._trial
+
+    run(scenario())
+
+
+def test_5xx_during_trial_reopens_without_retrying():
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        return web.json_response({}, status=503)
+
+    async def scenario():
+        async with upstream(handler) as base:
+            url = base + '/breaker/trial-503'
+            endpoint = server._endpoint(url)
+            _open_and_cool(endpoint)
+            with pytest.raises(server.UpstreamError):
+                await server._request('GET', url)
+            with pytest.raises(server.CircuitOpenError):
+                await server._request('GET', url)
+
+    run(scenario())
+    assert len(calls) == 1
+
+
+def test_retries_of_one_request_count_as_one_failure():
+    calls = []
+
+    async def handler(request):
+        calls.append(1)
+        return web.json_response({}, status=503)
+
+    async def scenario():
+        async with upstream(handler) as base:
+            url = base + '/breaker/retried-503'
+            endpoint = server._endpoint(url)
+            with pytest.raises(server.UpstreamError):
+                await server._request('GET', url)
+            assert server.circuit_breaker._failures[endpoint] == 1
+            assert endpoint not in server.circuit_breaker.stats()['open']
+
+    run(scenario())
+    assert len(calls) == server._RETRIES + 1
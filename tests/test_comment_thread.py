@@ -0,0 +1,73 @@
+import server
+from conftest import run
+
+
+def _comment(id, parent=None, content=None, replies=None, user='u1'):
+    attributes = {'parentId': parent, 'createdOn': f'2024-01-{id % 28 + 1:02d}', 'likesCount': id % 3}
+    if content is not None:
+        attributes['content'] = content
+    if replies is not None:
+        attributes['repliesCount'] = replies
+    return {'id': str(id), 'type': 'comment', 'attributes': attributes,
+            'relationships': {'user': {'data': {'id': user, 'type': 'user'}}}}
+
+
+USERS = [{'id': 'u1', 'type': 'user', 'attributes': {'nick': 'ann'}}, {'id': 'u2', 'type': 'user', 'attributes': {'nick': 'bob'}}]
+LIST_PAGES = {
+    # First page: two top-level comments and one reply that came inline.
+    None: {'data': [_comment(100, content='<p>Top &amp; first</p>', replies=1), _comment(99, content='second', replies=1),
+                    _comment(98, parent=99, content='inline reply', replies=0, user='u2')], 'included': USERS},
+    # Paged on from the last top-level id; this comment's content comes from get-contents.
+    '99': {'data': [_comment(90, replies=0)], 'included': USERS},
+}
+SUB_COMMENTS = {
+    '100': {'data': [_comment(101, parent=100, content='reply', replies=1, user='u2')], 'included': USERS},
+    '101': {'data': [_comment(102, parent=101, replies=0)], 'included': USERS},
+}
+CONTENTS = {'90': 'paged in', '102': 'deep'}
+
+
+def _serve(monkeypatch):
+    calls = []
+
+    async def fetch(url, params):
+        endpoint = server._endpoint(url)
+        calls.append((endpoint, params.get('from_id') or params.get('comment_ids') or params.get('id')))
+        if endpoint == '/comments/list':
+            return 200, LIST_PAGES.get(params.get('from_id'), {'data': []})
+        if endpoint == '/comments/get-sub-comments':
+            return 200, SUB_COMMENTS.get(params['id'], {'data': []})
+        ids = params['comment_ids'] if isinstance(params['comment_ids'], tuple) else (params['comment_ids'],)
+        return 200, {'data': [{'id': i, 'type': 'comment', 'attributes': {'content': CONTENTS[i]}} for i in ids]}
+
+    monkeypatch.setattr(server, '_fetch', fetch)
+    return calls
+
+
+def _shape(comments):
+    return [(c['id'], c['author'], c['content'], _shape(c.get('replies', []))) for c in comments]
+
+
+def test_thread_across_two_pages_with_nested_replies(monkeypatch):
+    calls = _serve(monkeypatch)
+    thread = run(server.load_comment_thread(7001, fresh=True))
+    assert _shape(thread['comments']) == [
+        ('100', 'ann', 'Top & first', [('101', 'bob', 'reply', [('102', 'ann', 'deep', [])])]),
+        ('99', 'ann', 'second', [('98', 'bob', 'inline reply', [])]),
+        ('90', 'ann', 'paged in', []),
+    ]
+    assert thread['failures'] == []
+    assert thread['meta']['comments'] == 6 and thread['meta']['truncated'] is False
+    # 99 already has its one reply, so only 100 and then 101 are asked for sub-comments.
+    assert sorted(id for endpoint, id in calls if endpoint == '/comments/get-sub-comments') == ['100', '101']
+    assert [id for endpoint, id in calls if endpoint == '/comments/get-contents'] == [('90', '102')]
+
+
+def test_depth_and_size_limits(monkeypatch):
+    _serve(monkeypatch)
+    shallow = run(server.load_comment_thread(7002, max_depth=2, fresh=True))
+    assert _shape(shallow['comments'])[0] == ('100', 'ann', 'Top & first', [('101', 'bob', 'reply', [])])
+    small = run(server.load_comment_thread(7003, max_comments=2, format='html', fresh=True))
+    assert [c['id'] for c in small['comments']] == ['100', '99']
+    assert small['comments'][0]['content'] == '<p>Top &amp; first</p>'
+    assert small['meta']['truncated'] is True
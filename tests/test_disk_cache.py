@@ -0,0 +1,49 @@
+import random
+import string
+from datetime import date, timedelta
+
+import server
+
+URL = 'https://seeking-alpha.p.rapidapi.com/symbols/get-historical-prices'
+
+
+def test_closed_history_needs_an_explicit_past_end():
+    yesterday = (date.today() - timedelta(days=2)).isoformat()
+    assert server._is_closed_history(URL, {'symbol': 'aapl', 'start': '2020-01-01', 'end': yesterday})
+    assert not server._is_closed_history(URL, {'symbol': 'aapl', 'start': '2020-01-01'})
+    assert not server._is_closed_history(URL, {'symbol': 'aapl', 'start': '2020-01-01', 'end': ''})
+    assert not server._is_closed_history(URL, {'symbol': 'aapl', 'start': '2020-01-01', 'end': '2999-01-01'})
+
+
+def test_history_is_not_immutable():
+    assert not server._is_immutable(URL, {'symbol': 'aapl', 'start': '2020-01-01', 'end': '2020-02-01'})
+    assert server._is_immutable('https://seeking-alpha.p.rapidapi.com/articles/get-details', {'id': '1'})
+
+
+def _total(cache):
+    with cache._lock:
+        return cache._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+
+def _body(i):
+    # Random text compresses poorly, so the budget below forces evictions.
+    rng = random.Random(i)
+    return {'n': i, 'body': ''.join(rng.choice(string.ascii_letters) for _ in range(300))}
+
+
+def test_running_size_total_follows_writes_replaces_and_evictions(tmp_path):
+    cache = server.DiskCache(str(tmp_path), 2000)
+    other = server.DiskCache(str(tmp_path), 2000)
+    for i in range(40):
+        (cache if i % 2 else other)._set(f'k{i % 25}', _body(i), 60)
+        assert cache.stats()['bytes'] == other.stats()['bytes'] == _total(cache) <= 2000
+    assert cache.stats()['entries'] < 25
+    assert cache._get('k14', False) == _body(39)
+
+
+def test_size_total_is_seeded_from_an_existing_table(tmp_path):
+    cache = server.DiskCache(str(tmp_path), 10 ** 6)
+    cache._set('a', {'x': 1}, None)
+    with cache._lock:
+        cache._db.execute('DROP TABLE meta')
+    assert server.DiskCache(str(tmp_path), 10 ** 6).stats()['bytes'] == _total(cache) > 0
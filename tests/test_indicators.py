@@ -0,0 +1,135 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+import server
+from conftest import run
+
+
+def _close(n=120, seed=1):
+    rng, price, close = random.Random(seed), 100.0, []
+    for _ in range(n):
+        price *= math.exp(rng.gauss(0, 0.02))
+        close.append(price)
+    return close
+
+
+def _sma(close, window):
+    return [sum(close[i - window + 1:i + 1]) / window if i >= window - 1 else None for i in range(len(close))]
+
+
+def _ema(close, alpha):
+    ema = [close[0]]
+    for value in close[1:]:
+        ema.append(ema[-1] + alpha * (value - ema[-1]))
+    return ema
+
+
+def _rsi(close, period):
+    # Wilder: simple averages of the first period changes, then smoothing with alpha 1 / period.
+    changes = [b - a for a, b in zip(close, close[1:])]
+    gain = sum(max(c, 0) for c in changes[:period]) / period
+    loss = sum(max(-c, 0) for c in changes[:period]) / period
+    rsi = [None] * period + [100 - 100 / (1 + gain / loss) if loss else 100.0 if gain else None]
+    for change in changes[period:]:
+        gain += (max(change, 0) - gain) / period
+        loss += (max(-change, 0) - loss) / period
+        rsi.append(100 - 100 / (1 + gain / loss) if loss else 100.0 if gain else None)
+    return rsi
+
+
+def _std(values):
+    mean = sum(values) / len(values)
+    return math.sqrt(sum((v - mean) ** 2 for v in values) / (len(values) - 1))
+
+
+def _assert_matches(actual, expected):
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        if want is None:
+            assert math.isnan(got)
+        else:
+            assert got == pytest.approx(want, rel=1e-9, abs=1e-9)
+
+
+def test_matches_reference_for_each_symbol():
+    closes = [_close(seed=1), _close(seed=2), _close(seed=3)]
+    out = server.compute_indicators(np.array(closes), window=20, fast=12, slow=26, signal=9, rsi_period=14)
+    for row, close in enumerate(closes):
+        _assert_matches(out['sma'][row], _sma(close, 20))
+        _assert_matches(out['ema'][row], _ema(close, 2 / 21))
+        _assert_matches(out['rsi'][row], _rsi(close, 14))
+
+        macd = [a - b for a, b in zip(_ema(close, 2 / 13), _ema(close, 2 / 27))]
+        signal = _ema(macd, 2 / 10)
+        _assert_matches(out['macd'][row], macd)
+        _assert_matches(out['macd_signal'][row], signal)
+        _assert_matches(out['macd_histogram'][row], [m - s for m, s in zip(macd, signal)])
+
+        std = [_std(close[i - 19:i + 1]) if i >= 19 else None for i in range(len(close))]
+        _assert_matches(out['bollinger_upper'][row], [m + 2 * s if s else None for m, s in zip(_sma(close, 20), std)])
+        _assert_matches(out['bollinger_lower'][row], [m - 2 * s if s else None for m, s in zip(_sma(close, 20), std)])
+
+        returns = [None] + [close[i] / close[i - 1] - 1 for i in range(1, len(close))]
+        _assert_matches(out['returns'][row], returns)
+        _assert_matches(out['cumulative_return'][row], [value / close[0] - 1 for value in close])
+        _assert_matches(out['drawdown'][row], [value / max(close[:i + 1]) - 1 for i, value in enumerate(close)])
+
+
+def test_leading_gaps_start_the_average_at_the_first_price():
+    close = _close(40)
+    padded = [math.nan] * 5 + close
+    out = server.compute_indicators(np.array([padded]), ('sma', 'ema', 'rsi'), window=10, rsi_period=14)
+    assert np.isnan(out['ema'][0][:5]).all()
+    _assert_matches(out['ema'][0][5:], _ema(close, 2 / 11))
+    _assert_matches(out['sma'][0][5:], _sma(close, 10))
+    _assert_matches(out['rsi'][0], [None] * 5 + _rsi(close, 14))
+
+
+def test_flat_prices_have_no_rsi():
+    out = server.compute_indicators(np.array([[50.0] * 30]), ('rsi',), rsi_period=14)
+    assert np.isnan(out['rsi'][0]).all()
+
+
+def test_prices_that_never_fall_have_an_rsi_of_100():
+    out = server.compute_indicators(np.array([[50.0 + i for i in range(30)]]), ('rsi',), rsi_period=14)
+    assert np.isnan(out['rsi'][0][:14]).all()
+    assert (out['rsi'][0][14:] == 100.0).all()
+
+
+A_DAYS = ['2020-08-24', '2020-08-25', '2020-08-26', '2020-08-27', '2020-08-28', '2020-08-31', '2020-09-01', '2020-09-02']
+# Closed on two of A's days, so on A's calendar it would have holes.
+B_DAYS = ['2020-08-24', '2020-08-26', '2020-08-27', '2020-08-31', '2020-09-02']
+
+
+def _fake_upstream(calls):
+    async def fetch(url, params):
+        calls.append(params.get('symbol'))
+        if url.endswith('/get-splits'):
+            return 200, {'data': []}
+        days = A_DAYS if params['symbol'] == 'a' else B_DAYS
+        return 200, {'data': [{'id': day, 'type': 'historical_price',
+                               'attributes': {'as_of_date': day, 'open': 1, 'high': 1, 'low': 1, 'close': 100.0 + i * (-1) ** i,
+                                              'volume': 1000}} for i, day in enumerate(days)]}
+    return fetch
+
+
+def _indicators(symbols):
+    return server.symbols_get_indicators.fn(symbols, '2020-08-24', '2020-09-02', 'sma,rsi,returns', window=3, rsi_period=2,
+                                            output='series')
+
+
+def test_symbols_on_different_calendars_match_their_own_results(monkeypatch):
+    monkeypatch.setattr(server, '_fetch', _fake_upstream([]))
+    monkeypatch.setattr(server, 'indicator_cache', server.TTLCache(16))
+    alone = run(_indicators('b'))['indicators']['b']
+    monkeypatch.setattr(server, 'indicator_cache', server.TTLCache(16))
+    together = run(_indicators('a,b'))['indicators']
+
+    assert together['b'] == alone
+    assert together['b']['date'] == B_DAYS
+    assert None not in together['b']['sma'][2:] and None not in together['b']['rsi'][2:]
+    assert together['a']['date'] == A_DAYS
+    assert None not in together['a']['returns'][1:]
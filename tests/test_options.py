@@ -0,0 +1,49 @@
+import math
+
+import numpy as np
+import pytest
+
+import server
+
+
+@pytest.mark.parametrize('data, expected', [
+    ({'expiration_dates': ['2024-11-15', '2024-11-22'], 'as_of_date': '2024-11-01', 'ticker_id': 146},
+     ['2024-11-15', '2024-11-22']),
+    ({'data': [{'id': '1', 'type': 'option', 'attributes': {'expiration_date': '2024-12-20', 'updated_at': '2024-11-01T10:00:00'}},
+               {'id': '2', 'type': 'option', 'attributes': {'expirationDate': '2025-01-17'}}],
+      'meta': {'as_of': '2024-11-01'}},
+     ['2024-12-20', '2025-01-17']),
+    ({'data': [{'id': '2024-11-15', 'type': 'option_expiration', 'attributes': {'created': '2024-01-02'}}]}, ['2024-11-15']),
+    (['2024-11-29', '2024-11-15'], ['2024-11-15', '2024-11-29']),
+    ({'data': {'attributes': {'expirations': [{'expiration_date': '2025-06-20'}], 'last_trade': '2024-11-01'}}}, ['2025-06-20']),
+    ({'meta': {'as_of': '2024-11-01'}}, []),
+])
+def test_option_expirations_reads_only_expiration_fields(data, expected):
+    assert server._option_expirations(data) == expected
+
+
+# Hull, Options, Futures and Other Derivatives: S=K=100, T=1, r=5%, sigma=20%.
+@pytest.mark.parametrize('price, is_call', [(10.4506, True), (5.5735, False)])
+def test_implied_volatility_of_textbook_prices(price, is_call):
+    iv = server.implied_volatility(price, 100.0, 100.0, 1.0, 0.05, 0.0, is_call)
+    assert float(iv) == pytest.approx(0.2, abs=1e-4)
+
+
+def test_implied_volatility_round_trip():
+    strikes = np.array([[60.0, 80.0, 100.0, 120.0, 150.0]])
+    t = np.array([[0.05], [0.5], [2.0]])
+    sigma = np.array([[0.15], [0.4], [0.9]])
+    for is_call in (True, False):
+        price = server._black_scholes(100.0, strikes, t, 0.03, 0.01, sigma, is_call)[0]
+        iv = server.implied_volatility(price, 100.0, strikes, t, 0.03, 0.01, is_call)
+        # Deep in or out of the money the price barely moves with sigma; only check where it does.
+        vega = server.option_greeks(100.0, strikes, t, 0.03, 0.01, np.broadcast_to(sigma, price.shape), is_call)['vega']
+        sensitive = vega > 1e-3
+        assert sensitive.sum() >= 8
+        np.testing.assert_allclose(iv[sensitive], np.broadcast_to(sigma, price.shape)[sensitive], atol=1e-4)
+
+
+def test_prices_outside_no_arbitrage_bounds_have_no_iv():
+    # A call can not be worth more than the spot, nor less than its discounted intrinsic value.
+    iv = server.implied_volatility(np.array([120.0, 0.5]), 100.0, np.array([100.0, 50.0]), 1.0, 0.05, 0.0, True)
+    assert all(math.isnan(v) for v in iv)
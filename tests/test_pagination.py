@@ -0,0 +1,61 @@
+import server
+from conftest import run
+
+BASE = 'https://seeking-alpha.p.rapidapi.com'
+
+
+def _serve(monkeypatch, pages):
+    '''Serve pages[cursor] by the paging parameter of each call (a query string, None on the first page).'''
+    calls = []
+
+    async def fetch(url, params):
+        cursor = next((params[k] for k in ('number', 'until', 'from_id') if k in params), None)
+        calls.append(cursor)
+        return 200, pages.get(cursor, {'data': []})
+
+    monkeypatch.setattr(server, '_fetch', fetch)
+    return calls
+
+
+def _items(ids, **attributes):
+    return [{'id': str(i), 'type': 'item', 'attributes': dict(attributes, publishOn=i)} for i in ids]
+
+
+def test_number_paging(monkeypatch):
+    calls = _serve(monkeypatch, {None: {'data': _items([30, 29])}, '2': {'data': _items([28, 27])}, '3': {'data': _items([26])}})
+    result = run(server._collect_pages(BASE + '/analysis/v2/list', {'id': 'num'}, 'number', 100, fresh=True))
+    assert [item['id'] for item in result['data']] == ['30', '29', '28', '27', '26']
+    assert result['meta'] == {'pages': 3, 'complete': True}
+    assert calls == [None, '2', '3', '4']
+
+
+def test_until_paging_follows_the_oldest_publish_time(monkeypatch):
+    def page(ids):
+        return {'data': _items(ids), 'meta': {'page': {'minmaxPublishOn': {'min': min(ids), 'max': max(ids)}}}}
+
+    calls = _serve(monkeypatch, {'500': page([500, 490]), '490': page([490, 480, 470]), '470': page([470, 460])})
+    result = run(server._collect_pages(BASE + '/news/list', {'category': 'until'}, 'until', 100, since=465, until=500, fresh=True))
+    # The item on both pages is kept once, and paging stops at the first page that crosses since.
+    assert [item['id'] for item in result['data']] == ['500', '490', '480', '470']
+    assert calls == ['500', '490', '470']
+
+
+def test_from_id_paging_continues_after_the_last_top_level_comment(monkeypatch):
+    first = {'data': [{'id': '9', 'type': 'comment', 'attributes': {'parentId': None}},
+                      {'id': '8', 'type': 'comment', 'attributes': {'parentId': None}},
+                      {'id': '7', 'type': 'comment', 'attributes': {'parentId': '8'}}]}
+    second = {'data': [{'id': '5', 'type': 'comment', 'attributes': {'parentId': None}}]}
+    calls = _serve(monkeypatch, {None: first, '8': second})
+    result = run(server._collect_pages(BASE + '/comments/list', {'id': 'fromid'}, 'from_id', 100, fresh=True))
+    assert [item['id'] for item in result['data']] == ['9', '8', '7', '5']
+    assert calls == [None, '8', '5']
+
+
+def test_max_items(monkeypatch):
+    calls = _serve(monkeypatch, {None: {'data': _items([3, 2])}, '2': {'data': _items([1])}})
+    result = run(server._collect_pages(BASE + '/analysis/v2/list', {'id': 'max'}, 'number', 3, fresh=True))
+    assert len(result['data']) == 3 and result['meta']['complete'] is False
+
+    calls.clear()
+    result = run(server.list_paginated.fn('v2_list', {'id': 'zero'}, max_items=0))
+    assert result['data'] == [] and calls == []
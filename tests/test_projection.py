@@ -0,0 +1,68 @@
+import pytest
+
+import server
+
+BODY = {
+    'data': [
+        {'id': '1', 'type': 'article', 'attributes': {'title': 'One', 'summary': None, 'score': 3},
+         'relationships': {'author': {'data': {'id': '7', 'type': 'author'}},
+                           'tags': {'data': [{'id': '21', 'type': 'tag'}, {'id': '22', 'type': 'tag'}]}}},
+        {'id': '2', 'type': 'article', 'attributes': {'title': 'Two', 'summary': 'short', 'score': 5},
+         'relationships': {'author': {'data': {'id': '8', 'type': 'author'}}, 'tags': {'data': []}}},
+    ],
+    'included': [
+        {'id': '7', 'type': 'author', 'attributes': {'nick': 'ann'}},
+        {'id': '21', 'type': 'tag', 'attributes': {'name': 'tech'}},
+    ],
+    'meta': {'page': {'total': 2}},
+}
+
+
+@pytest.mark.parametrize('select, expected', [
+    ('meta.page.total', {'meta': {'page': {'total': 2}}}),
+    ('$.meta.page', {'meta': {'page': {'total': 2}}}),
+    ('data.id', {'data': [{'id': '1'}, {'id': '2'}]}),
+    ('data[*].attributes.title', {'data': [{'attributes': {'title': 'One'}}, {'attributes': {'title': 'Two'}}]}),
+    ('data[1].id', {'data': [{'id': '2'}]}),
+    ('data[-1].id,data[0].id', {'data': [{'id': '2'}, {'id': '1'}]}),
+    ('included.*.attributes.nick', {'included': [{'attributes': {'nick': 'ann'}}, {'attributes': {}}]}),
+    ('meta.*.total', {'meta': {'page': {'total': 2}}}),
+    ('data.id,data', {'data': BODY['data']}),
+    ('data.attributes.missing', {'data': [{'attributes': {}}, {'attributes': {}}]}),
+    ('nothing.here', {}),
+    ('meta.page.total.deeper', {'meta': {'page': {}}}),
+])
+def test_select(select, expected):
+    assert server._project(BODY, select) == expected
+
+
+def test_select_does_not_touch_the_cached_response():
+    before = repr(BODY)
+    server._project(BODY, 'data.id', 'flat')
+    assert repr(BODY) == before
+
+
+@pytest.mark.parametrize('value, expected', [
+    ({'a': None, 'b': 1}, {'b': 1}),
+    ({'a': [None, {'b': None, 'c': 0}]}, {'a': [{'c': 0}]}),
+    ([None, False, ''], [False, '']),
+])
+def test_compact_nulls(value, expected):
+    assert server._project(value, compact='nulls') == expected
+
+
+def test_flat_lifts_attributes_and_inlines_included_items():
+    flat = server._project(BODY, compact='flat')
+    first, second = flat['data']
+    assert first == {'id': '1', 'type': 'article', 'title': 'One', 'score': 3,
+                     'author': {'id': '7', 'type': 'author', 'nick': 'ann'},
+                     'tags': [{'id': '21', 'type': 'tag', 'name': 'tech'}, {'id': '22', 'type': 'tag'}]}
+    # References missing from included stay as bare references.
+    assert second['author'] == {'id': '8', 'type': 'author'}
+    assert second['tags'] == []
+    assert 'included' not in flat and flat['meta'] == BODY['meta']
+
+
+def test_flat_single_resource():
+    body = {'data': {'id': '5', 'type': 'symbol', 'attributes': {'name': 'AAPL'}}}
+    assert server._project(body, compact='flat') == {'data': {'id': '5', 'type': 'symbol', 'name': 'AAPL'}}
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import server
+from conftest import run
+
+SYMBOLS = ['aaa', 'bbb', 'ccc', 'ddd']
+METRICS = {'aaa': {'pe': 10, 'sector': 'Tech'}, 'bbb': {'pe': 20, 'sector': 'Energy'},
+           'ccc': {'pe': '30.5', 'sector': 'Tech'}, 'ddd': {}}
+# 1 is A+, 13 is F.
+GRADES = {'aaa': {'growth': 1}, 'bbb': {'growth': 4}, 'ccc': {'growth': 13}, 'ddd': {}}
+
+
+def _table():
+    table = server.ScreenerTable(900)
+    table.stale(('metrics', 'pe'), SYMBOLS)
+    for symbol in SYMBOLS:
+        table.put(('metrics', ('pe', 'sector')), symbol, METRICS[symbol])
+        table.put(('grades', ('growth',)), symbol, GRADES[symbol])
+    return table
+
+
+@pytest.mark.parametrize('field, condition, expected', [
+    ('pe', {'gte': 20}, ['bbb', 'ccc']),
+    ('pe', {'lte': 20}, ['aaa', 'bbb']),
+    ('pe', {'gt': 20}, ['ccc']),
+    ('pe', {'lt': 20}, ['aaa']),
+    ('pe', {'eq': 20}, ['bbb']),
+    ('pe', {'gte': 15, 'lt': 30}, ['bbb']),
+    ('pe', {'gte': None}, ['aaa', 'bbb', 'ccc', 'ddd']),
+    ('pe', {'in': [10, '30.5']}, ['aaa', 'ccc']),
+    ('sector', {'in': ['Tech']}, ['aaa', 'ccc']),
+    ('sector', {'in': ['Tech'], 'exclude': True}, ['bbb', 'ddd']),
+    ('pe', {'gt': 15, 'exclude': True}, ['aaa', 'ddd']),
+    ('growth', {'in': ['A+', 'B+']}, ['aaa', 'bbb']),
+    ('growth', {'in': ['F'], 'exclude': True}, ['aaa', 'bbb', 'ddd']),
+])
+def test_filter_operators(field, condition, expected):
+    table = _table()
+    rows = table.rows(SYMBOLS)
+    assert [SYMBOLS[i] for i in np.flatnonzero(table.mask(field, condition, rows))] == expected
+
+
+def test_grade_letters():
+    table = _table()
+    assert [table.value(('grades', 'growth'), row) for row in table.rows(SYMBOLS)] == ['A+', 'B+', 'F', None]
+    assert table.value(('metrics', 'sector'), 0) == 'Tech'
+    assert table.value(('metrics', 'pe'), 2) == 30.5
+    assert server._is_grade_filter({'in': ['A', 'C-']})
+    assert not server._is_grade_filter({'in': ['Tech']})
+    assert not server._is_grade_filter({'in': []})
+
+
+def test_screen_locally_filters_sorts_and_pages(monkeypatch):
+    async def fetch(url, params):
+        return 200, {'data': []}
+    monkeypatch.setattr(server, '_fetch', fetch)
+    monkeypatch.setattr(server, 'screener_table', _table())
+    body = {'filter': {'pe': {'gte': 10}, 'growth': {'in': ['A+', 'B+', 'F']}}, 'sort': '-pe', 'per_page': 2, 'page': 1}
+    result, reason = run(server.screen_locally(body, SYMBOLS))
+    assert reason is None
+    assert [(r['symbol'], r['rank'], r['pe'], r['growth']) for r in result['data']] == [('ccc', 1, 30.5, 'F'), ('bbb', 2, 20.0, 'B+')]
+    assert result['meta']['count'] == 3
+
+    assert run(server.screen_locally({'filter': {'pe': {'between': [1, 2]}}}, SYMBOLS)) == (None, 'unsupported filter operators')
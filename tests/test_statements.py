@@ -0,0 +1,79 @@
+import math
+
+import pytest
+
+import server
+
+
+@pytest.mark.parametrize('cell, expected', [
+    ('1,234.5', 1234.5),
+    ('$12', 12.0),
+    ('(12.3)', -12.3),
+    ('(1.5B)', -1.5e9),
+    ('2.5M', 2.5e6),
+    ('4.5%', 4.5),
+    ('-7', -7.0),
+    (42, 42.0),
+    ('-', None),
+    ('NM', None),
+    ('', None),
+    (None, None),
+    (True, None),
+])
+def test_display_number(cell, expected):
+    value = server._display_number(cell)
+    assert math.isnan(value) if expected is None else value == expected
+
+
+def _row(name, label, cells):
+    return {'name': name, 'value': label, 'cells': [{'name': label, 'value': label}] +
+            [{'name': period, 'value': value} for period, value in cells]}
+
+
+INCOME = [{'title': 'Revenues', 'rows': [
+    _row('total_revenue', 'Total Revenues', [('Dec 2021', '1,000'), ('Dec 2022', '1,200'), ('Dec 2023', '900'), ('TTM', '950')]),
+    _row('net_income', 'Net Income', [('Dec 2021', '(50)'), ('Dec 2022', '100'), ('Dec 2023', '-'), ('TTM', '20')]),
+]}]
+# Reported in another order and missing 2021; its net income row repeats the income statement's.
+BALANCE = [{'title': 'Assets', 'rows': [
+    _row('total_assets', 'Total Assets', [('Dec 2023', '3,000'), ('Dec 2022', '2,000')]),
+    _row('net_income', 'Net Income', [('Dec 2022', '999')]),
+]}]
+
+
+def _matrix():
+    matrix = server._statement_matrix({'income-statement': INCOME, 'balance-sheet': BALANCE})
+    matrix.update(symbol='abc', period_type='annual', failed=[])
+    return matrix
+
+
+def test_periods_are_aligned_across_statements():
+    matrix = _matrix()
+    assert matrix['periods'] == ['Dec 2021', 'Dec 2022', 'Dec 2023', 'TTM']
+    assert [item['key'] for item in matrix['items']] == ['total_revenue', 'net_income', 'total_assets']
+    assert matrix['items'][1]['statement'] == 'income-statement'
+    assert list(matrix['dated']) == [True, True, True, False]
+    assets = matrix['values'][:, matrix['columns']['total_assets']]
+    assert math.isnan(assets[0]) and list(assets[1:3]) == [2000.0, 3000.0] and math.isnan(assets[3])
+
+
+def test_report_values_changes_and_ratios():
+    report = server.statement_report(_matrix(), ratios=['net_margin', 'return_on_assets', 'revenue_per_asset=total_revenue/total_assets'])
+    assert report['values']['net_income'] == [-50.0, 100.0, None, 20.0]
+    # Change over |previous|, so a loss turning into a profit reads as growth; missing and undated periods are None.
+    assert report['changes']['yoy']['net_income'] == [None, 3.0, None, None]
+    assert report['changes']['yoy']['total_revenue'] == [None, 0.2, -0.25, None]
+    assert report['ratios']['net_margin'] == [-0.05, 100 / 1200, None, 20 / 950]
+    assert report['ratios']['return_on_assets'] == [None, 0.05, None, None]
+    assert report['ratios']['revenue_per_asset'] == [None, 0.6, 0.3, None]
+    assert 'qoq' not in report['changes']
+
+
+def test_report_lists_ratios_it_cannot_compute():
+    report = server.statement_report(_matrix(), items=['total_revenue'], ratios=['net_margin', 'current_ratio'])
+    assert list(report['values']) == ['total_revenue']
+    assert report['meta']['unavailable_ratios'] == ['current_ratio']
+    with pytest.raises(ValueError):
+        server.statement_report(_matrix(), items=['ebitda'])
+    with pytest.raises(ValueError):
+        server.statement_report(_matrix(), ratios=['made_up'])
@@ -0,0 +1,51 @@
+import pytest
+
+import server
+
+TRANSCRIPT = '''<html><head><style>p { color: red; }</style><script>var x = "<p>not text</p>";</script></head>
+<body><h2>Prepared   Remarks</h2>
+<p>Operator: Good day &amp; welcome to the <b>Q3 2024</b> call.</p>
+<p>CEO: Revenue grew 12%&nbsp;year over year.<br>Margins held.</p>
+<noscript>enable javascript</noscript>
+<ul><li>Cloud</li><li>Devices</li></ul>
+<h2>Question-and-Answer Session</h2>
+<p>Analyst: What about guidance?</p>
+<p>CEO: We raised it.</p>
+</body></html>'''
+
+PREPARED = ('Prepared Remarks\n'
+            'Operator: Good day & welcome to the Q3 2024 call.\n'
+            'CEO: Revenue grew 12% year over year.\n'
+            'Margins held.\n'
+            'Cloud\n'
+            'Devices\n')
+QA = ('Question-and-Answer Session\n'
+      'Analyst: What about guidance?\n'
+      'CEO: We raised it.\n')
+
+
+@pytest.mark.parametrize('chunk_size', [7, 64, 16384])
+def test_sections(chunk_size):
+    assert server.extract_text(TRANSCRIPT, chunk_size=chunk_size) == (PREPARED + QA, False)
+    assert server.extract_text(TRANSCRIPT, 'prepared_remarks', chunk_size=chunk_size) == (PREPARED, False)
+    assert server.extract_text(TRANSCRIPT, 'qa', chunk_size=chunk_size) == (QA, False)
+
+
+@pytest.mark.parametrize('chunk_size', [7, 16384])
+def test_offset_and_length_window(chunk_size):
+    text = PREPARED + QA
+    assert server.extract_text(TRANSCRIPT, offset=10, length=25, chunk_size=chunk_size) == (text[10:35], True)
+    assert server.extract_text(TRANSCRIPT, offset=len(text) - 5, length=100, chunk_size=chunk_size) == (text[-5:], False)
+
+
+def test_trailing_text_without_a_closing_tag_is_flushed():
+    assert server.extract_text('<p>first</p>last words', chunk_size=4) == ('first\nlast words\n', False)
+    assert server.extract_text('<p>first</p>last words &amp', length=100) == ('first\nlast words &\n', False)
+
+
+def test_format_content_keeps_the_cached_response():
+    data = {'data': {'id': '1', 'attributes': {'content': TRANSCRIPT, 'title': 'Call'}}}
+    formatted = server._format_content(data, 'text', 'qa')
+    assert formatted['data']['attributes'] == {'content': QA, 'title': 'Call'}
+    assert formatted['meta']['content'] == {'format': 'text', 'section': 'qa', 'offset': 0, 'length': len(QA), 'more': False}
+    assert data['data']['attributes']['content'] == TRANSCRIPT